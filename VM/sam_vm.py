@@ -1,3 +1,4 @@
+import json
 import struct
 from sam_isa import execute_instruction_isa # Importa a função do novo arquivo
 
@@ -11,6 +12,7 @@ class SAMVM:
         self.fbr = 0
         self.halt = 0
         self.labels = {}
+        self.call_counts = {} # Chamadas (JSR) por rótulo: perfil usado por --inline-profile
 
         # Definir a convenção V_top e V_below
         self.V_top = lambda: self.stack[self.sp - 1] if self.sp > 0 else None
@@ -52,6 +54,8 @@ class SAMVM:
             # Avança o PC antes de executar a instrução para jumps
             initial_pc = self.pc
             self.pc += 1
+            if opcode == "JSR":
+                self.call_counts[operand] = self.call_counts.get(operand, 0) + 1
 
             # Debugging: Imprime a instrução atual e o estado dos registradores
             print(f"\nPC: {initial_pc}, SP: {self.sp}, FBR: {self.fbr}, HALT: {self.halt}")
@@ -81,6 +85,14 @@ class SAMVM:
         else:
             print("\nFim da execução do programa SAM.")
 
+    def save_call_counts(self, filename):
+        """
+        Grava em JSON as chamadas feitas a cada função na última execução,
+        no formato lido pela opção --inline-profile do compilador.
+        """
+        with open(filename, 'w') as f:
+            json.dump(self.call_counts, f, indent=2, sort_keys=True)
+
     def push(self, value):
         self.stack.append(value)
         self.sp += 1
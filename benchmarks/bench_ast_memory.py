@@ -0,0 +1,75 @@
+"""
+Mede a memória ocupada pela AST (incluindo os Tokens referenciados por ela)
+em bytes por nó, para um programa sintético grande.
+
+Uso: python benchmarks/bench_ast_memory.py [num_funcoes]
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from nodes import Node
+from parser import Parser
+from tokenization import Tokenizer
+
+
+def generate_program(num_functions):
+    parts = []
+    for i in range(num_functions):
+        parts.append(f"""
+func f{i}(int a, int b) {{
+    int x = a + b * {i} - (a - 1) * 2;
+    float y = 0.5;
+    while (x > 0 and y < 100.0) {{
+        x = x - 1;
+        y = y + 1.5;
+        if (x == 7 or not (x != 3)) {{ print("x", x); }} else {{ f{i}(x, 2); }}
+    }}
+}}
+""")
+    parts.append("func main() { int z = 1; print(z); }\n")
+    return "".join(parts)
+
+
+def count_nodes(root):
+    count = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, Node):
+            count += 1
+            for name in getattr(type(node), "__dataclass_fields__", {}):
+                stack.append(getattr(node, name))
+    return count
+
+
+def main():
+    num_functions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    source = generate_program(num_functions)
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tokens = Tokenizer(source).tokenizer()
+    ast = Parser(tokens).parse()
+    del tokens
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    nodes = count_nodes(ast)
+    total = after - before
+    print(f"Nós: {nodes:,}")
+    print(f"Memória retida pela AST: {total / (1 << 20):.1f} MiB")
+    print(f"Bytes por nó (incluindo Tokens): {total / nodes:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Mede a latência de edição-compilação da recompilação incremental
+(incremental.IncrementalCompiler) em um programa grande, comparada à
+compilação completa, inclusive partindo dos trechos gravados em disco por
+outra execução.
+
+Uso: python benchmarks/bench_incremental.py [número_de_linhas]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from driver import compile_program
+from incremental import IncrementalCompiler
+from parser import Parser
+from tokenization import Tokenizer
+
+LINES_PER_FUNCTION = 10
+
+
+def generate_source(num_lines):
+    """Gera um programa de ~num_lines linhas; cada função chama a seguinte."""
+    num_functions = max(2, num_lines // LINES_PER_FUNCTION)
+    template = (
+        "func f{i}(int a, float b) {{\n"
+        "    $ função {i}\n"
+        "    int x = a * {i} + 42;\n"
+        "    float y = b * 2.0;\n"
+        "    while (x >= 0 and y != 1.5) {{\n"
+        "        x -= 1;\n"
+        "        y = y + 0.5;\n"
+        "    }}\n"
+        "    {call}\n"
+        "}}\n"
+    )
+    parts = []
+    for i in range(num_functions):
+        call = f"f{i + 1}(a, b);" if i + 1 < num_functions else "print(a);"
+        parts.append(template.format(i=i, call=call))
+    parts.append("func main() { f0(1, 1.0); }\n")
+    return "".join(parts), num_functions
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def full_compile(content):
+    return compile_program(Parser(Tokenizer(content).tokenizer()).parse(), workers=1)
+
+
+def main():
+    num_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    content, num_functions = generate_source(num_lines)
+    print(f"Programa: {content.count(chr(10)):,} linhas, {num_functions:,} funções")
+
+    t_full, _ = timed(lambda: full_compile(content))
+    print(f"{'compilação completa':>32}: {t_full * 1000:8.1f} ms")
+
+    compiler = IncrementalCompiler()
+    t, _ = timed(lambda: compiler.compile(content))
+    print(f"{'incremental (cache vazio)':>32}: {t * 1000:8.1f} ms  {compiler.stats}")
+
+    t, _ = timed(lambda: compiler.compile(content))
+    print(f"{'incremental (sem mudanças)':>32}: {t * 1000:8.1f} ms  {compiler.stats}")
+
+    middle = num_functions // 2
+    edits = [
+        ("corpo de uma função",
+         content.replace(f"int x = a * {middle} + 42;", f"int x = a * {middle} + 43;")),
+        ("assinatura de uma função",
+         content.replace(f"func f{middle}(int a, float b)", f"func f{middle}(int a, float b, int c)")
+                .replace(f"f{middle}(a, b);", f"f{middle}(a, b, 0);")),
+    ]
+    for description, edited in edits:
+        compiler.compile(content)
+        t, code = timed(lambda: compiler.compile(edited))
+        assert code == full_compile(edited), "A compilação incremental divergiu da completa."
+        print(f"{'edição: ' + description:>32}: {t * 1000:8.1f} ms  {compiler.stats}")
+
+    # Nova execução: os trechos vêm do cache em disco (leitura incluída no tempo)
+    description, edited = edits[0]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        compiler.compile(content)
+        compiler.save("bench", cache_dir)
+
+        def from_disk():
+            loaded = IncrementalCompiler.load("bench", cache_dir)
+            return loaded, loaded.compile(edited)
+
+        t, (loaded, code) = timed(from_disk)
+        assert code == full_compile(edited), "A compilação a partir do disco divergiu da completa."
+        print(f"{'do disco + ' + description:>32}: {t * 1000:8.1f} ms  {loaded.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Mede o efeito da expansão em linha (inliner.Inliner) sobre um programa com
+muitas chamadas a funções pequenas: instruções executadas pela SAMVM, tempo
+de execução e tamanho do código, com -O com e sem inlining. O inlining é
+desligado com um perfil vazio (nenhuma função chamada).
+
+Uso: python benchmarks/bench_inlining.py [iterações]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "VM"))
+
+from driver import OptimizationReport, compile_program
+from parser import Parser
+from sam_vm import SAMVM
+from tokenization import Tokenizer
+
+
+def generate_source(iterations):
+    """Laço em main chamando funções pequenas, uma delas por meio de outra."""
+    return (
+        "func show(int v) { print(v); }\n"
+        "func scaled(int v, int k) { int t = v * k + 1; show(t); }\n"
+        "func pair(int a, int b) { scaled(a, 2); scaled(b, 3); }\n"
+        "func main() {\n"
+        "    int i = 0;\n"
+        f"    while (i < {iterations}) {{\n"
+        "        pair(i, i + 1);\n"
+        "        show(i);\n"
+        "        i = i + 1;\n"
+        "    }\n"
+        "}\n"
+    )
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def run_vm(sam_code):
+    """Executa o código na SAMVM: (instruções executadas, saída do programa)."""
+    with tempfile.NamedTemporaryFile("w", suffix=".sam", delete=False) as f:
+        f.write(sam_code)
+    vm = SAMVM()
+    trace = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(trace):
+            vm.load_program(f.name)
+            vm.run()
+    finally:
+        os.unlink(f.name)
+    lines = trace.getvalue().splitlines()
+    steps = sum(1 for line in lines if line.startswith("Executando"))
+    return steps, [line for line in lines if line.startswith("OUTPUT")]
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    source = generate_source(iterations)
+    print(f"Iterações: {iterations:,}")
+
+    results = {}
+    for label, profile in (("sem inlining", {}), ("com inlining", None)):
+        report = OptimizationReport()
+        ast = Parser(Tokenizer(source).tokenizer()).parse()
+        t_compile, code = timed(lambda: compile_program(ast, workers=1, optimize=True,
+                                                        report=report, profile=profile))
+        t_run, (steps, output) = timed(lambda: run_vm(code))
+        results[label] = output
+        expanded = sum(report.inlined.values())
+        print(f"{label:>13}: {len(code.splitlines()):5,} instruções no código, {steps:9,} executadas, "
+              f"compilação {t_compile * 1000:6.1f} ms, execução {t_run:6.2f} s, "
+              f"{expanded} chamada(s) expandida(s)")
+    assert results["sem inlining"] == results["com inlining"], "O inlining alterou a saída do programa."
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Compara a geração direta sobre a AST (CodeGenerator) com a geração passando
+pela IR de três endereços (ir_builder, ir.verify_function, ir_codegen), sem e
+com -O: tempo de compilação, tamanho do código e instruções executadas pela
+SAMVM em um programa com laços, condições com and/or e chamadas. A saída das
+duas gerações deve ser a mesma.
+
+Uso: python benchmarks/bench_ir.py [iterações]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "VM"))
+
+from driver import compile_program
+from parser import Parser
+from sam_vm import SAMVM
+from tokenization import Tokenizer
+
+
+def generate_source(iterations):
+    return (
+        "func classify(int v, int lo, int hi) {\n"
+        "    bool inside = v >= lo and v <= hi;\n"
+        "    if (inside or v == 0) { print(v * 2 + lo); } else { print(0 - v); }\n"
+        "}\n"
+        "func main() {\n"
+        "    int total = 0;\n"
+        f"    for (int i = 0; i < {iterations}; i = i + 1) {{\n"
+        "        int k = i * 3 - 5;\n"
+        "        classify(k, 2, 40);\n"
+        "        if (not (k > 10 and k < 20)) { total = total + k; }\n"
+        "    }\n"
+        "    print(total);\n"
+        "}\n"
+    )
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def run_vm(sam_code):
+    """Executa o código na SAMVM: (instruções executadas, saída do programa)."""
+    with tempfile.NamedTemporaryFile("w", suffix=".sam", delete=False) as f:
+        f.write(sam_code)
+    vm = SAMVM()
+    trace = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(trace):
+            vm.load_program(f.name)
+            vm.run()
+    finally:
+        os.unlink(f.name)
+    lines = trace.getvalue().splitlines()
+    steps = sum(1 for line in lines if line.startswith("Executando"))
+    return steps, [line for line in lines if line.startswith("OUTPUT")]
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    source = generate_source(iterations)
+    print(f"Iterações: {iterations:,}")
+
+    for optimize in (False, True):
+        outputs = []
+        for label, ir in (("AST", False), ("IR", True)):
+            ast = Parser(Tokenizer(source).tokenizer()).parse()
+            t_compile, code = timed(lambda: compile_program(ast, workers=1, optimize=optimize, ir=ir))
+            steps, output = run_vm(code)
+            outputs.append(output)
+            mode = "com -O" if optimize else "sem -O"
+            print(f"{mode} {label:>3}: compilação {t_compile * 1000:7.1f} ms, "
+                  f"{len(code.splitlines()):4} linhas de SAM, {steps:9,} instruções executadas")
+        assert outputs[0] == outputs[1], "A geração pela IR alterou a saída."
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Compara a compilação completa com a compilação preguiçosa (Parser.parse(lazy=True)
+seguido de driver.reachable_program) em um programa com uma grande biblioteca
+de funções auxiliares, das quais `main` usa apenas algumas.
+
+Uso: python benchmarks/bench_lazy_parsing.py [funções_na_biblioteca] [funções_usadas]
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from driver import compile_program, reachable_program
+from parser import Parser
+from tokenization import Tokenizer
+
+
+def generate_source(num_helpers, num_used):
+    """Biblioteca de `num_helpers` funções; `main` chama as `num_used` primeiras (cada uma chama a próxima)."""
+    template = (
+        "func helper{i}(int a, float b) {{\n"
+        "    int x = a * {i} + 42;\n"
+        "    float y = b * 2.0;\n"
+        "    while (x >= 0 and y != 1.5) {{ x -= 1; y = y + 0.5; }}\n"
+        "    if (x <= 1) {{ print(\"fim\", x); }} else {{ {call} }}\n"
+        "}}\n"
+    )
+    parts = []
+    for i in range(num_helpers):
+        call = f"helper{i + 1}(a, b);" if i + 1 < num_used else "print(a);"
+        parts.append(template.format(i=i, call=call))
+    parts.append("func main() { helper0(1, 1.0); }\n")
+    return "".join(parts)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def compile_eager(tokens):
+    return compile_program(Parser(tokens).parse(), workers=1)
+
+
+def compile_lazy(tokens):
+    parser = Parser(tokens)
+    program = reachable_program(parser.parse(lazy=True), parser)
+    return compile_program(program, workers=1)
+
+
+def main():
+    num_helpers = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    num_used = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    tokens = Tokenizer(generate_source(num_helpers, num_used)).tokenizer()
+    print(f"Biblioteca: {num_helpers:,} funções, {num_used} usadas, {len(tokens):,} tokens")
+
+    t_eager, eager = timed(lambda: compile_eager(tokens))
+    t_lazy, lazy = timed(lambda: compile_lazy(tokens))
+    print(f"{'completa':>12}: {t_eager * 1000:8.1f} ms, {len(eager.splitlines()):,} instruções")
+    print(f"{'preguiçosa':>12}: {t_lazy * 1000:8.1f} ms, {len(lazy.splitlines()):,} instruções "
+          f"(speedup {t_eager / t_lazy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
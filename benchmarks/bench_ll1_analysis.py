@@ -0,0 +1,49 @@
+"""
+Mede como a análise LL(1) de teste_ll1/is_ll1.py (First, Follow e Predict por
+ponto fixo sobre bitsets) escala com o tamanho da gramática.
+
+As gramáticas geradas imitam uma cadeia de níveis de precedência de
+expressões: L_i → L_{i+1} T_i, T_i → op_i L_{i+1} T_i | ε, com o último nível
+fechando em id ou ( L_0 ). São 3 produções e 1 terminal novo por nível.
+
+Uso: python benchmarks/bench_ll1_analysis.py [niveis ...]
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "teste_ll1"))
+
+from grammar import Grammar
+from is_ll1 import analyze, is_ll1
+
+
+def generate_grammar(levels):
+    G = Grammar("L0")
+    for i in range(levels):
+        G.add_production(f"L{i}", [f"L{i + 1}", f"T{i}"])
+        G.add_production(f"T{i}", [f"op{i}", f"L{i + 1}", f"T{i}"])
+        G.add_production(f"T{i}", [])
+    G.add_production(f"L{levels}", ["id"])
+    G.add_production(f"L{levels}", ["lparen", "L0", "rparen"])
+    return G
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [250, 500, 1000, 2000, 4000]
+    print(f"{'produções':>10} {'terminais':>10} {'análise (ms)':>14} {'is_ll1 em cache (ms)':>22}")
+    for levels in sizes:
+        G = generate_grammar(levels)
+        start = time.perf_counter()
+        analysis = analyze(G)
+        t_analysis = time.perf_counter() - start
+        start = time.perf_counter()
+        assert is_ll1(G)
+        t_check = time.perf_counter() - start
+        print(f"{len(G.productions()):>10} {len(analysis.terminals):>10} {t_analysis * 1000:>14.1f} {t_check * 1000:>22.1f}")
+
+
+if __name__ == "__main__":
+    main()
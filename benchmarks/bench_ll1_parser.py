@@ -0,0 +1,71 @@
+"""
+Compara a vazão do parser LL(1) gerado por tabela (teste_ll1/ll1_parser.py)
+com o parser descendente recursivo escrito à mão (src/parser.py).
+
+Uso: python benchmarks/bench_ll1_parser.py [num_funcoes]
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "teste_ll1"))
+
+from builder import construir_gramatica_cfg
+from ll1_parser import LL1Parser, build_parse_table
+from parser import Parser
+from tokenization import Tokenizer
+
+
+def generate_program(num_functions):
+    """Gera um programa aceito tanto pela gramática LL(1) quanto pelo Parser."""
+    parts = []
+    for i in range(num_functions):
+        parts.append(f"""
+func f{i}(int a, int b) {{
+    int x = a + b * {i} - (a - 1) * 2;
+    int y = 0;
+    while (x > 0 and y < 100) {{
+        x = x - 1;
+        y += x / 2;
+        if (y == 7 or not (x != 3)) {{ print("y", y); }} else {{ y = y + 1; }}
+    }}
+    do {{ y = y - 1; }} while (y > 0);
+    f{i}(x, y);
+}}
+""")
+    parts.append("func main() { int z = 1; print(z); }\n")
+    return "".join(parts)
+
+
+def bench(label, fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return label, best, result
+
+
+def main():
+    num_functions = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    tokens = Tokenizer(generate_program(num_functions)).tokenizer()
+
+    G = construir_gramatica_cfg()
+    label, t_build, table = bench("construção da tabela", lambda: build_parse_table(G), repeat=1)
+    print(f"{label}: {t_build * 1000:.1f} ms ({table.size_in_bytes()} bytes, {len(table.check)} células)")
+
+    ll1 = LL1Parser(table, G)
+    results = [
+        bench("Parser (descendente recursivo)", lambda: Parser(tokens).parse()),
+        bench("LL1Parser (tabela + pilha explícita)", lambda: ll1.parse(tokens)),
+    ]
+    for label, seconds, _ in results:
+        print(f"{label}: {seconds * 1000:.1f} ms, {len(tokens) / seconds:,.0f} tokens/s")
+    assert results[0][2] == results[1][2], "As ASTs produzidas diferem."
+
+
+if __name__ == "__main__":
+    main()
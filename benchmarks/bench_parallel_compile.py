@@ -0,0 +1,64 @@
+"""
+Mede a compilação por função (driver.compile_program) em relação à compilação
+serial, variando o número de processos.
+
+Uso: python benchmarks/bench_parallel_compile.py [número_de_funções]
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from driver import compile_program
+from parser import Parser
+from tokenization import Tokenizer
+
+
+def generate_source(num_functions):
+    """Gera um programa com `num_functions` funções que se chamam em sequência."""
+    template = (
+        "func f{i}(int a, float b) {{\n"
+        "    int x = a * {i} + 42;\n"
+        "    float y = b * 2.0;\n"
+        "    while (x >= 0 and y != 1.5) {{ x -= 1; y = y + 0.5; print(x, y); }}\n"
+        "    for (int k = 0; k < 3; k = k + 1) {{ if (k <= 1) {{ print(k); }} else {{ print(-k); }} }}\n"
+        "    {call}\n"
+        "}}\n"
+    )
+    parts = []
+    for i in range(num_functions):
+        call = f"f{i + 1}(a, b);" if i + 1 < num_functions else ""
+        parts.append(template.format(i=i, call=call))
+    parts.append("func main() { f0(1, 1.0); }\n")
+    return "".join(parts)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    num_functions = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    tokens = Tokenizer(generate_source(num_functions)).tokenizer()
+    print(f"Funções: {num_functions:,}, {os.cpu_count()} núcleos disponíveis")
+
+    ast = Parser(tokens).parse()
+    t_serial, expected = timed(lambda: compile_program(ast, workers=1))
+    print(f"{'serial':>10}: {t_serial:7.2f} s ({len(expected.splitlines()):,} instruções)")
+
+    workers = 2
+    max_workers = max(2, os.cpu_count() or 1)
+    while workers <= max_workers:
+        t, code = timed(lambda: compile_program(ast, workers=workers))
+        assert code == expected, "A compilação paralela divergiu da serial."
+        print(f"{workers:>3} proc.: {t:7.2f} s (speedup {t_serial / t:.2f}x)")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
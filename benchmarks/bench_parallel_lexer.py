@@ -0,0 +1,63 @@
+"""
+Mede o ganho da tokenização paralela (tokenization.tokenize_parallel) em
+relação ao Tokenizer serial, variando o número de processos.
+
+Uso: python benchmarks/bench_parallel_lexer.py [tamanho_em_MiB]
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from tokenization import Tokenizer, tokenize_parallel
+
+
+def generate_source(size_bytes):
+    """Gera código .tt sintético (com strings e comentários) até atingir size_bytes."""
+    template = (
+        "func f{i}(int a, float b) {{\n"
+        "    $ comentário com \"aspas\" e operadores += -=\n"
+        "    int x = a * {i} + 42;\n"
+        "    string s = \"texto $ que não é comentário\";\n"
+        "    while (x >= 0 and b != 1.5) {{ x -= 1; print(s, x); }}\n"
+        "}}\n"
+    )
+    parts = []
+    size = 0
+    i = 0
+    while size < size_bytes:
+        part = template.format(i=i)
+        parts.append(part)
+        size += len(part)
+        i += 1
+    return "".join(parts)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    size_mib = float(sys.argv[1]) if len(sys.argv) > 1 else 8
+    content = generate_source(int(size_mib * (1 << 20)))
+    print(f"Entrada: {len(content) / (1 << 20):.1f} MiB, {os.cpu_count()} núcleos disponíveis")
+
+    t_serial, expected = timed(lambda: Tokenizer(content).tokenizer())
+    print(f"{'serial':>10}: {t_serial:7.2f} s ({len(expected):,} tokens)")
+
+    workers = 2
+    max_workers = max(2, os.cpu_count() or 1)
+    while workers <= max_workers:
+        t, tokens = timed(lambda: tokenize_parallel(content, workers=workers, min_chunk_size=1 << 16))
+        assert tokens == expected, "A tokenização paralela divergiu da serial."
+        print(f"{workers:>3} proc.: {t:7.2f} s (speedup {t_serial / t:.2f}x)")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Mede a redução de força das variáveis de indução (strength_reduction):
+instruções executadas pela SAMVM em laços que usam `i * k` uma, duas e três
+vezes por iteração, compilados sem -O, com -O sem a redução dos laços e com -O
+completo. A redução só deve ser aplicada quando diminui o número de
+instruções executadas, e nunca pode alterar a saída.
+
+Uso: python benchmarks/bench_strength_reduction.py [iterações]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+from unittest import mock
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "VM"))
+
+from driver import compile_program
+from parser import Parser
+from sam_vm import SAMVM
+from strength_reduction import StrengthReducer
+from tokenization import Tokenizer
+
+TARGETS = ["s", "u", "w"]
+
+
+def generate_source(iterations, uses):
+    """Laço em que `i * k` aparece `uses` vezes por iteração."""
+    declarations = "".join(f"    int {name} = 0;\n" for name in TARGETS[:uses])
+    body = "".join(f"        {name} = {name} + i * k - {n};\n" for n, name in enumerate(TARGETS[:uses]))
+    prints = "".join(f"    print({name});\n" for name in TARGETS[:uses])
+    return (
+        "func f(int k) {\n"
+        f"{declarations}"
+        f"    for (int i = 0; i < {iterations}; i = i + 1) {{\n"
+        f"{body}"
+        "    }\n"
+        f"{prints}"
+        "}\n"
+        "func main() { f(3); }\n"
+    )
+
+
+def run_vm(sam_code):
+    """Executa o código na SAMVM: (instruções executadas, saída do programa)."""
+    with tempfile.NamedTemporaryFile("w", suffix=".sam", delete=False) as f:
+        f.write(sam_code)
+    vm = SAMVM()
+    trace = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(trace):
+            vm.load_program(f.name)
+            vm.run()
+    finally:
+        os.unlink(f.name)
+    lines = trace.getvalue().splitlines()
+    steps = sum(1 for line in lines if line.startswith("Executando"))
+    return steps, [line for line in lines if line.startswith("OUTPUT")]
+
+
+def compile_source(source, optimize, reduce_loops=True):
+    ast = Parser(Tokenizer(source).tokenizer()).parse()
+    if reduce_loops:
+        return compile_program(ast, workers=1, optimize=optimize)
+    with mock.patch.object(StrengthReducer, "_reduce_loop", lambda self, func, stmt, done: stmt):
+        return compile_program(ast, workers=1, optimize=optimize)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    print(f"Iterações: {iterations:,}")
+
+    for uses in (1, 2, 3):
+        source = generate_source(iterations, uses)
+        results = {}
+        for label, optimize, reduce_loops in (("sem -O", False, True),
+                                              ("-O sem redução", True, False),
+                                              ("-O", True, True)):
+            results[label] = run_vm(compile_source(source, optimize, reduce_loops))
+        outputs = {tuple(output) for _, output in results.values()}
+        assert len(outputs) == 1, "A redução de força alterou a saída."
+        steps = {label: steps for label, (steps, _) in results.items()}
+        assert steps["-O"] <= steps["-O sem redução"], "A redução de força aumentou as instruções executadas."
+        columns = "  ".join(f"{label}: {count:7,}" for label, count in steps.items())
+        print(f"{uses} uso(s) de i * k por iteração: {columns}")
+
+
+if __name__ == "__main__":
+    main()
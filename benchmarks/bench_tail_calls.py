@@ -0,0 +1,86 @@
+"""
+Mede a eliminação de chamadas recursivas de cauda (tail_calls): instruções
+executadas, profundidade máxima da pilha da SAMVM e tempo de execução de uma
+recursão de cauda, compilada sem e com -O.
+
+Uso: python benchmarks/bench_tail_calls.py [profundidade]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "VM"))
+
+from driver import compile_program
+from parser import Parser
+from sam_vm import SAMVM
+from tokenization import Tokenizer
+
+
+def generate_source(depth):
+    return (
+        "func sum(int n, int acc) {\n"
+        "    if (n == 0) { print(acc); } else { sum(n - 1, acc + n); }\n"
+        "}\n"
+        f"func main() {{ sum({depth}, 0); }}\n"
+    )
+
+
+class DepthVM(SAMVM):
+    """SAMVM que registra a maior altura da pilha."""
+
+    def __init__(self):
+        super().__init__()
+        self.max_sp = 0
+
+    def push(self, value):
+        super().push(value)
+        self.max_sp = max(self.max_sp, self.sp)
+
+
+def run_vm(sam_code):
+    """Executa o código: (instruções executadas, altura máxima da pilha, saída do programa)."""
+    with tempfile.NamedTemporaryFile("w", suffix=".sam", delete=False) as f:
+        f.write(sam_code)
+    vm = DepthVM()
+    trace = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(trace):
+            vm.load_program(f.name)
+            vm.run()
+    finally:
+        os.unlink(f.name)
+    lines = trace.getvalue().splitlines()
+    steps = sum(1 for line in lines if line.startswith("Executando"))
+    return steps, vm.max_sp, [line for line in lines if line.startswith("OUTPUT")]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    source = generate_source(depth)
+    print(f"Profundidade da recursão: {depth:,}")
+
+    outputs = {}
+    for label, optimize in (("sem -O", False), ("com -O", True)):
+        ast = Parser(Tokenizer(source).tokenizer()).parse()
+        code = compile_program(ast, workers=1, optimize=optimize)
+        t, (steps, max_sp, output) = timed(lambda: run_vm(code))
+        outputs[label] = output
+        print(f"{label:>7}: {steps:9,} instruções executadas, pilha máxima {max_sp:7,}, execução {t:6.2f} s")
+    assert outputs["sem -O"] == outputs["com -O"], "A eliminação das chamadas de cauda alterou a saída."
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Mede a vazão (nós visitados por segundo) das passagens que percorrem a AST:
+SemanticAnalyzer, CodeGenerator e ASTPrinter. Em seguida compila, pelo
+main.py e com cada conjunto de opções, um programa com cadeias longas de
+`+`, `and` e `or`, que não pode esbarrar no limite de recursão do Python.
+
+Uso: python benchmarks/bench_visitor.py [num_funcoes] [termos]
+"""
+
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from ast_printer import ASTPrinter
+from code_generator import CodeGenerator
+from nodes import Node
+from parser import Parser
+from semantic_analyzer import SemanticAnalyzer
+from tokenization import Tokenizer
+
+
+def generate_program(num_functions):
+    parts = []
+    for i in range(num_functions):
+        parts.append(f"""
+func f{i}(int a, int b) {{
+    int x = a + b * {i} - a * 2;
+    float y = 0.5;
+    while (x > 0 and y < 100.0) {{
+        x = x - 1;
+        y = y + 1.5;
+        print("x", x, y);
+    }}
+    do {{ x = x + a * b - {i} / 2; }} while (x < 10 or b != 3 and not false);
+}}
+""")
+    parts.append("func main() { int z = 1; print(z); }\n")
+    return "".join(parts)
+
+
+def generate_deep_program(terms):
+    """Programa cuja AST tem profundidade proporcional a `terms`."""
+    return (
+        "func main() {\n"
+        "    int a = 1;\n"
+        f"    int b = {' + '.join(['a'] * terms)};\n"
+        f"    if ({' and '.join(['a > 0'] * terms)}) {{ print(b); }}\n"
+        f"    bool c = {' or '.join(['a < 0'] * terms)};\n"
+        "    print(c);\n"
+        "}\n"
+    )
+
+
+def compile_deep_program(terms):
+    """Compila o programa profundo com main.py, com e sem cache, -O e --ir."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        source = os.path.join(work_dir, "deep.tt")
+        with open(source, "w") as f:
+            f.write(generate_deep_program(terms))
+        # Sem opções a compilação é incremental; a AST é profunda demais para o
+        # pickle, então a segunda execução encontra o cache sem a entrada
+        for options in ([], [], ["--no-cache"], ["-O"], ["--ir"]):
+            output = os.path.join(work_dir, "deep.sam")
+            start = time.perf_counter()
+            result = subprocess.run(
+                [sys.executable, os.path.join(ROOT, "src", "main.py"), source, "-o", output,
+                 "--cache-dir", os.path.join(work_dir, "cache"), *options],
+                capture_output=True, text=True,
+            )
+            seconds = time.perf_counter() - start
+            assert "Geração de código concluída" in result.stdout, (
+                f"main.py {' '.join(options)} falhou: {result.stdout[-500:]}{result.stderr[-500:]}")
+            label = " ".join(options) or "(padrão)"
+            print(f"{'main.py ' + label:>20}: {seconds * 1000:8.1f} ms")
+
+
+def count_nodes(root):
+    count = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, Node):
+            count += 1
+            for name in getattr(type(node), "__dataclass_fields__", {}):
+                stack.append(getattr(node, name))
+    return count
+
+
+def best_of(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def print_ast(ast):
+    with contextlib.redirect_stdout(io.StringIO()):
+        ASTPrinter().print(ast)
+
+
+def main():
+    num_functions = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    ast = Parser(Tokenizer(generate_program(num_functions)).tokenizer()).parse()
+    nodes = count_nodes(ast)
+    print(f"Nós: {nodes:,}")
+
+    passes = [
+        ("SemanticAnalyzer", lambda: SemanticAnalyzer().analyze(ast)),
+        ("CodeGenerator", lambda: CodeGenerator().generate(ast)),
+        ("ASTPrinter", lambda: print_ast(ast)),
+    ]
+    for label, fn in passes:
+        seconds = best_of(fn)
+        print(f"{label:>16}: {seconds * 1000:8.1f} ms, {nodes / seconds:>12,.0f} nós/s")
+
+    terms = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    print(f"\nCadeias de {terms:,} termos, compiladas pelo main.py:")
+    compile_deep_program(terms)
+
+
+if __name__ == "__main__":
+    main()
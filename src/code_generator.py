@@ -1,69 +1,91 @@
 
 from nodes import *
 from tokenization import TokenType
-from collections import defaultdict
-
-class CodeGenerator:
+from visitor import NodeVisitor
+
+# Tipo estático dos literais (os demais nós de expressão são anotados pela análise semântica)
+LITERAL_TYPES = {
+    NodeIntLiteral: TokenType.INT,
+    NodeFloatLiteral: TokenType.FLOAT,
+    NodeStringLiteral: TokenType.STRING,
+    NodeBoolLiteral: TokenType.BOOL,
+}
+
+# Operadores aritméticos: (instrução inteira, instrução float)
+ARITHMETIC_INSTRUCTIONS = {
+    TokenType.PLUS: ("ADD", "ADDF"),
+    TokenType.MINUS: ("SUB", "SUBF"),
+    TokenType.STAR: ("TIMES", "TIMESF"),
+    TokenType.SLASH: ("DIV", "DIVF"),
+}
+
+# Comparações emitidas como a comparação oposta seguida de NOT
+NEGATED_COMPARISONS = {
+    TokenType.GREATER_EQUAL: "LESS",
+    TokenType.LESS_EQUAL: "GREATER",
+    TokenType.NOT_EQUAL: "EQUAL",
+}
+
+# Atribuições compostas e o operador aritmético correspondente
+COMPOUND_ASSIGN_OPS = {
+    TokenType.PLUS_ASSIGN: TokenType.PLUS,
+    TokenType.MINUS_ASSIGN: TokenType.MINUS,
+    TokenType.STAR_ASSIGN: TokenType.STAR,
+    TokenType.SLASH_ASSIGN: TokenType.SLASH,
+}
+
+class CodeGenerator(NodeVisitor):
+    """
+    Gera código SAM a partir de uma AST já anotada pelo `SemanticAnalyzer`:
+    os deslocamentos das variáveis, o tamanho do quadro de cada função e o tipo
+    estático das expressões são lidos dos nós, sem nova resolução de nomes.
+
+    Cada função é gerada de forma independente (`generate_function`), com
+    rótulos prefixados pelo nome da função e numerados a partir de 1, e os
+    trechos são reunidos por `link`. Assim o código é o mesmo quer as funções
+    sejam geradas em sequência, quer em processos separados.
+    """
     def __init__(self):
         self.code = []
         self.label_count = 0
-        self.symbol_table_stack = [] # Pilha de escopos
+        self.label_prefix = ""
         self.loop_labels = []
-
-    def _push_scope(self):
-        self.symbol_table_stack.append({})
-    
-    def _pop_scope(self):
-        self.symbol_table_stack.pop()
-    
-    def _add_symbol(self, name, offset):
-        self.symbol_table_stack[-1][name] = offset
-    
-    def _get_symbol_offset(self, name):
-        for scope in reversed(self.symbol_table_stack):
-            if name in scope:
-                return scope[name]
-        return None
-
-    def _calculate_local_vars(self, node: Node) -> int:
-        count = 0
-        if isinstance(node, NodeBlock):
-            for stmt in node.statements:
-                if isinstance(stmt, NodeDeclaration):
-                    count += 1
-                elif isinstance(stmt, (NodeBlock, NodeWhile, NodeDoWhile, NodeIf)):
-                    count += self._calculate_local_vars(stmt.body)
-                elif isinstance(stmt, NodeFor):
-                    if stmt.initializer and isinstance(stmt.initializer, NodeDeclaration):
-                        count += 1
-                    count += self._calculate_local_vars(stmt.body)
-                
-                if hasattr(stmt, 'then_branch') and stmt.then_branch:
-                    count += self._calculate_local_vars(stmt.then_branch)
-                if hasattr(stmt, 'else_branch') and stmt.else_branch:
-                    count += self._calculate_local_vars(stmt.else_branch)
-        return count
+        self.body_start = 0 # Posição, em self.code, do início do corpo (após o prólogo)
+        self.body_label = None # Rótulo do início do corpo, criado na primeira chamada de cauda
 
     def generate(self, program_node: NodeProgram) -> str:
+        functions = [d for d in program_node.global_declarations if isinstance(d, NodeFunctionDecl)]
+        return self.link([(f.name.value, self.generate_function(f)) for f in functions])
+
+    def generate_function(self, node: NodeFunctionDecl) -> list[str]:
+        """Gera o código de uma função e retorna suas linhas."""
         self.code = []
         self.label_count = 0
-        self.symbol_table_stack = []
-        self.current_offset = 0
+        self.label_prefix = f"{node.name.value}."
         self.loop_labels = []
-
-        self._emit("JUMP", "main_entry")
-        
-        for decl in program_node.global_declarations:
-            if isinstance(decl, NodeFunctionDecl) and decl.name.value != "main":
-                self._visit_NodeFunctionDecl(decl)
-                
-        self._emit("main_entry:")
-        main_node = next(d for d in program_node.global_declarations if isinstance(d, NodeFunctionDecl) and d.name.value == "main")
-        self._visit_NodeFunctionDecl(main_node)
-        
-        self._emit("STOP")
-
-        return "\n".join(self.code)
+        self.body_label = None
+        self._visit(node)
+        return self.code
+
+    @staticmethod
+    def link(functions: list[tuple[str, list[str]]]) -> str:
+        """
+        Reúne o código das funções (pares nome, linhas, na ordem do programa):
+        as demais funções primeiro e `main` no ponto de entrada.
+        """
+        code = ["JUMP main_entry"]
+        main_code = None
+        for name, lines in functions:
+            if name == "main":
+                main_code = lines
+            else:
+                code.extend(lines)
+        if main_code is None:
+            raise Exception("Função 'main' não encontrada.")
+        code.append("main_entry:")
+        code.extend(main_code)
+        code.append("STOP")
+        return "\n".join(code)
 
     def _emit(self, instruction: str, operand=None):
         if operand is not None:
@@ -73,113 +95,149 @@ class CodeGenerator:
 
     def _new_label(self, prefix: str = "L"):
         self.label_count += 1
-        return f"{prefix}{self.label_count}"
+        return f"{self.label_prefix}{prefix}{self.label_count}"
+
+    def _emit_branch(self, condition: NodeExpr, label: str, jump_if: bool):
+        """
+        Gera o teste de uma condição booleana como fluxo de controle: desvia para
+        `label` se o valor da condição for `jump_if` e segue para a próxima
+        instrução caso contrário. `and`/`or` são avaliados em curto-circuito: o
+        segundo operando só é avaliado se o primeiro não decide o resultado.
+        Usado com `yield from` pelos métodos de visita.
+
+        A árvore de `and`/`or`/`not` é percorrida sobre uma pilha explícita de
+        testes (condição, rótulo, jump_if) e de rótulos a emitir, de modo que só
+        os operandos folha são pedidos a `_run`, e cadeias longas não esbarram
+        no limite de recursão.
+        """
+        pending = [(condition, label, jump_if)]
+        while pending:
+            item = pending.pop()
+            if type(item) is str:
+                self._emit(f"{item}:")
+                continue
+            condition, label, jump_if = item
+            while type(condition) is NodeGrouping:
+                condition = condition.expression
+            condition_type = type(condition)
+
+            if condition_type is NodeBoolLiteral:
+                if (condition.token.type == TokenType.TRUE) == jump_if:
+                    self._emit("JUMP", label)
+                continue
+
+            if condition_type is NodeUnaryOp and condition.op.type == TokenType.NOT:
+                pending.append((condition.operand, label, not jump_if))
+                continue
+
+            if condition_type is NodeBinOp:
+                op = condition.op.type
+                if op in (TokenType.AND, TokenType.OR):
+                    # 'and' desvia quando um operando é falso, 'or' quando um é verdadeiro
+                    # (empilhados em ordem inversa: o operando esquerdo sai primeiro)
+                    decisive = op == TokenType.OR
+                    if jump_if == decisive:
+                        pending.append((condition.right, label, jump_if))
+                        pending.append((condition.left, label, jump_if))
+                    else:
+                        skip_label = self._new_label("L_SKIP")
+                        pending.append(skip_label)
+                        pending.append((condition.right, label, jump_if))
+                        pending.append((condition.left, skip_label, decisive))
+                    continue
+                if op in NEGATED_COMPARISONS:
+                    yield condition.left
+                    yield condition.right
+                    self._emit(NEGATED_COMPARISONS[op])
+                    if not jump_if:
+                        self._emit("JUMPC", label)
+                    else:
+                        self._emit("NOT")
+                        self._emit("JUMPC", label)
+                    continue
+
+            yield condition
+            if not jump_if:
+                self._emit("NOT")
+            self._emit("JUMPC", label)
 
     def _get_type_info(self, node: Node) -> TokenType:
-        if isinstance(node, NodeIntLiteral):
-            return TokenType.INT
-        elif isinstance(node, NodeFloatLiteral):
-            return TokenType.FLOAT
-        elif isinstance(node, NodeStringLiteral):
-            return TokenType.STRING
-        elif isinstance(node, NodeBoolLiteral):
-            return TokenType.BOOL
-        elif isinstance(node, NodeVariable):
-            return TokenType.INT
-        elif isinstance(node, NodeBinOp):
-            return TokenType.INT
-        elif isinstance(node, NodeArrayAccess):
-            return TokenType.INT
-        return TokenType.INT
-
-    def _visit(self, node: Node):
-        method_name = f'_visit_{type(node).__name__}'
-        visitor_method = getattr(self, method_name, self._generic_visit)
-        return visitor_method(node)
-
-    def _generic_visit(self, node: Node):
-        for field, value in vars(node).items():
-            if isinstance(value, list):
-                for item in value:
-                    if isinstance(item, Node):
-                        self._visit(item)
-            elif isinstance(value, Node):
-                self._visit(value)
+        literal_type = LITERAL_TYPES.get(type(node))
+        if literal_type is not None:
+            return literal_type
+        return node.type
+
+    def _get_offset(self, symbol) -> int:
+        if symbol.offset is None:
+            raise Exception(f"Variável global '{symbol.name}' ainda não é suportada pelo gerador de código.")
+        return symbol.offset
+
+    def _emit_arithmetic(self, op: TokenType, result_type: TokenType):
+        int_instruction, float_instruction = ARITHMETIC_INSTRUCTIONS[op]
+        self._emit(float_instruction if result_type == TokenType.FLOAT else int_instruction)
+
+    def _emit_conversion(self, operand: NodeExpr, result_type: TokenType):
+        # Operandos inteiros de uma operação float são convertidos na pilha
+        if result_type == TokenType.FLOAT and self._get_type_info(operand) == TokenType.INT:
+            self._emit("ITOF")
 
     # --- Métodos de Visita para Nodos da AST ---
 
     def _visit_NodeFunctionDecl(self, node: NodeFunctionDecl):
+        # Quadro: parâmetros abaixo do endereço de retorno, FBR no FBR salvo
+        # pelo LINK e as variáveis locais logo acima (ver SemanticAnalyzer)
         func_name = node.name.value
-        
-        self._push_scope()
-        
-        param_offset = -len(node.params) # FBR+0 aponta para o último parâmetro
-        for i, param in enumerate(node.params):
-            self._add_symbol(param.identifier.value, param_offset + i)
-        
-        num_local_vars = self._calculate_local_vars(node.body)
-        
         if func_name != "main":
             self._emit(f"{func_name}:")
-            if num_local_vars > 0:
-                self._emit("ADDSP", num_local_vars)
-            self._emit("LINK")
-        else:
-            if num_local_vars > 0:
-                self._emit("ADDSP", num_local_vars)
+        self._emit("LINK")
+        if node.frame_size > 0:
+            self._emit("ADDSP", node.frame_size)
+        self.body_start = len(self.code)
 
-        self._visit(node.body)
+        yield node.body
         
-        if func_name != "main":
+        # Sem epílogo quando o fim do corpo é inalcançável (ver DeadCodeEliminator)
+        if func_name != "main" and node.returns:
+            if node.frame_size > 0:
+                self._emit("ADDSP", -node.frame_size)
             self._emit("POPFBR")
-            self._emit("POPSP")
             self._emit("JUMPIND")
-        
-        self._pop_scope()
 
     def _visit_NodeBlock(self, node: NodeBlock):
-        self._push_scope()
-        
-        current_local_offset = len(self.symbol_table_stack[-2])
         for statement in node.statements:
-            if isinstance(statement, NodeDeclaration):
-                self._add_symbol(statement.identifier.value, current_local_offset)
-                current_local_offset += 1
-            self._visit(statement)
-        
-        self._pop_scope()
+            yield statement
 
     def _visit_NodeDeclaration(self, node: NodeDeclaration):
-        var_name = node.identifier.value
-        offset = self._get_symbol_offset(var_name)
-        
         if node.initializer_expr:
-            self._visit(node.initializer_expr)
-            self._emit("STOREOFF", offset)
+            yield node.initializer_expr
+            self._emit("STOREOFF", self._get_offset(node.symbol))
 
     def _visit_NodeAssignment(self, node: NodeAssignment):
-        var_name = node.identifier.value
-        offset = self._get_symbol_offset(var_name)
-        if offset is None:
-            raise Exception(f"Variável '{var_name}' não encontrada na tabela de símbolos.")
+        if node.array_index_expr:
+            raise NotImplementedError("Atribuição a elemento de array ainda não implementada no gerador de código.")
+        offset = self._get_offset(node.symbol)
+        op = COMPOUND_ASSIGN_OPS.get(node.op.type)
         
-        self._visit(node.value)
+        if op is None:
+            yield node.value
+        else:
+            self._emit("PUSHOFF", offset)
+            yield node.value
+            self._emit_arithmetic(op, node.type)
         self._emit("STOREOFF", offset)
     
     def _visit_NodeIf(self, node: NodeIf):
         else_label = self._new_label("L_ELSE")
         end_label = self._new_label("L_ENDIF")
         
-        self._visit(node.condition)
-        self._emit("NOT")
-        self._emit("JUMPC", else_label)
+        yield from self._emit_branch(node.condition, else_label, False)
         
-        self._visit(node.then_branch)
+        yield node.then_branch
         self._emit("JUMP", end_label)
         
         self._emit(f"{else_label}:")
         if node.else_branch:
-            self._visit(node.else_branch)
+            yield node.else_branch
             
         self._emit(f"{end_label}:")
     
@@ -191,11 +249,9 @@ class CodeGenerator:
         
         self._emit(f"{start_label}:")
         
-        self._visit(node.condition)
-        self._emit("NOT")
-        self._emit("JUMPC", end_label)
+        yield from self._emit_branch(node.condition, end_label, False)
         
-        self._visit(node.body)
+        yield node.body
         self._emit("JUMP", start_label)
         
         self._emit(f"{end_label}:")
@@ -208,39 +264,23 @@ class CodeGenerator:
 
         self.loop_labels.append((increment_label, end_label))
         
-        self._push_scope()
-        
-        num_vars_in_for_scope = self._calculate_local_vars(node.body)
-        if node.initializer and isinstance(node.initializer, NodeDeclaration):
-            self._add_symbol(node.initializer.identifier.value, len(self.symbol_table_stack[-1]))
-            num_vars_in_for_scope += 1
-            self._emit("ADDSP", num_vars_in_for_scope)
-            self._visit(node.initializer)
-        else:
-            if num_vars_in_for_scope > 0:
-                self._emit("ADDSP", num_vars_in_for_scope)
-            if node.initializer:
-                self._visit(node.initializer)
+        if node.initializer:
+            yield node.initializer
 
         self._emit(f"{start_label}:")
         if node.condition:
-            self._visit(node.condition)
-            self._emit("NOT")
-            self._emit("JUMPC", end_label)
+            yield from self._emit_branch(node.condition, end_label, False)
 
-        self._visit(node.body)
+        yield node.body
         self._emit("JUMP", increment_label)
         
         self._emit(f"{increment_label}:")
         if node.increment:
-            self._visit(node.increment)
+            yield node.increment
         self._emit("JUMP", start_label)
 
         self._emit(f"{end_label}:")
-        if num_vars_in_for_scope > 0:
-            self._emit("ADDSP", -num_vars_in_for_scope)
         self.loop_labels.pop()
-        self._pop_scope()
 
     def _visit_NodeDoWhile(self, node: NodeDoWhile):
         start_label = self._new_label("L_DOWHILE_START")
@@ -249,18 +289,15 @@ class CodeGenerator:
         self.loop_labels.append((start_label, end_label))
         
         self._emit(f"{start_label}:")
-        self._visit(node.body)
-        self._visit(node.condition)
-        self._emit("NOT")
-        self._emit("JUMPC", end_label)
-        self._emit("JUMP", start_label)
+        yield node.body
+        yield from self._emit_branch(node.condition, start_label, True)
         
         self._emit(f"{end_label}:")
         self.loop_labels.pop()
     
     def _visit_NodePrint(self, node: NodePrint):
         for arg in node.args:
-            self._visit(arg)
+            yield arg
             arg_type = self._get_type_info(arg)
             if arg_type == TokenType.INT:
                 self._emit("WRITE")
@@ -270,21 +307,20 @@ class CodeGenerator:
                 self._emit("WRITESTR")
             elif arg_type == TokenType.BOOL:
                 self._emit("WRITE")
+            else:
+                self._emit("ADDSP", -1) # Chamada sem valor: descarta o espaço de retorno
 
     def _visit_NodeRead(self, node: NodeRead):
-        var_name = node.identifier.value
-        var_type = self._get_type_info(node.identifier)
+        var_type = node.symbol.type
         
-        if var_type == TokenType.INT:
+        if var_type in (TokenType.INT, TokenType.BOOL):
             self._emit("READ")
         elif var_type == TokenType.FLOAT:
             self._emit("READF")
         elif var_type == TokenType.STRING:
             self._emit("READSTR")
         
-        offset = self._get_symbol_offset(var_name)
-        if offset is not None:
-            self._emit("STOREOFF", offset)
+        self._emit("STOREOFF", self._get_offset(node.symbol))
 
     def _visit_NodeExit(self, node: NodeExit):
         self._emit("EXIT")
@@ -302,62 +338,93 @@ class CodeGenerator:
         self._emit("JUMP", start_label)
 
     def _visit_NodeExprStmt(self, node: NodeExprStmt):
-        self._visit(node.expression)
+        if type(node.expression) is NodeFunctionCall and node.expression.tail_call:
+            yield from self._emit_tail_call(node.expression)
+            return
+        yield node.expression
         if not isinstance(node.expression, NodeAssignment):
             self._emit("ADDSP", -1)
 
     def _visit_NodeBinOp(self, node: NodeBinOp):
-        self._visit(node.left)
-        self._visit(node.right)
+        if node.op.type in (TokenType.AND, TokenType.OR):
+            # Valor de 'and'/'or' em curto-circuito: 0 ou 1 conforme o desvio
+            decisive = node.op.type == TokenType.OR
+            decided_label = self._new_label("L_SC_DECIDED")
+            end_label = self._new_label("L_SC_END")
+            yield from self._emit_branch(node, decided_label, decisive)
+            self._emit("PUSHIMM", 0 if decisive else 1)
+            self._emit("JUMP", end_label)
+            self._emit(f"{decided_label}:")
+            self._emit("PUSHIMM", 1 if decisive else 0)
+            self._emit(f"{end_label}:")
+            return
+
+        yield node.left
+        self._emit_conversion(node.left, node.type)
+        yield node.right
+        self._emit_conversion(node.right, node.type)
         
         op = node.op.type
-        if op == TokenType.PLUS:
-            self._emit("ADD")
-        elif op == TokenType.MINUS:
-            self._emit("SUB")
-        elif op == TokenType.STAR:
-            self._emit("TIMES")
-        elif op == TokenType.SLASH:
-            self._emit("DIV")
+        if op in ARITHMETIC_INSTRUCTIONS:
+            self._emit_arithmetic(op, node.type)
         elif op == TokenType.GREATER:
             self._emit("GREATER")
         elif op == TokenType.LESS:
             self._emit("LESS")
+        elif op == TokenType.GREATER_EQUAL:
+            self._emit("LESS")
+            self._emit("NOT")
+        elif op == TokenType.LESS_EQUAL:
+            self._emit("GREATER")
+            self._emit("NOT")
         elif op == TokenType.EQUAL:
             self._emit("EQUAL")
         elif op == TokenType.NOT_EQUAL:
             self._emit("EQUAL")
             self._emit("NOT")
-        elif op == TokenType.AND:
-            self._emit("AND")
-        elif op == TokenType.OR:
-            self._emit("OR")
 
     def _visit_NodeUnaryOp(self, node: NodeUnaryOp):
-        self._visit(node.operand)
+        yield node.operand
         op = node.op.type
         if op == TokenType.MINUS:
-            self._emit("PUSHIMM", -1)
-            self._emit("TIMES")
+            if node.type == TokenType.FLOAT:
+                self._emit("PUSHIMMF", -1.0)
+                self._emit("TIMESF")
+            else:
+                self._emit("PUSHIMM", -1)
+                self._emit("TIMES")
         elif op == TokenType.NOT:
             self._emit("NOT")
 
     def _visit_NodeFunctionCall(self, node: NodeFunctionCall):
-        self._emit("PUSHIMM", 0) 
+        self._emit("PUSHIMM", 0) # Espaço para o valor de retorno
         
         for arg in node.args:
-            self._visit(arg)
+            yield arg
             
         self._emit("JSR", node.callee.value)
         
-        self._emit("ADDSP", -(len(node.args) + 1))
+        if node.args:
+            self._emit("ADDSP", -len(node.args)) # Desempilha os argumentos
         
+    def _emit_tail_call(self, node: NodeFunctionCall):
+        """
+        Chamada recursiva em posição de cauda (ver tail_calls): os argumentos,
+        todos avaliados antes, sobrescrevem os parâmetros e a execução volta ao
+        início do corpo, no mesmo quadro.
+        """
+        for arg in node.args:
+            yield arg
+        first_param_offset = -(len(node.args) + 1)
+        for i in reversed(range(len(node.args))):
+            self._emit("STOREOFF", first_param_offset + i)
+        if self.body_label is None:
+            self.body_label = self._new_label("L_BODY")
+            self.code.insert(self.body_start, f"{self.body_label}:")
+        self._emit("JUMP", self.body_label)
+
     def _visit_NodeVariable(self, node: NodeVariable):
-        var_name = node.token.value
-        offset = self._get_symbol_offset(var_name)
-        if offset is None:
-            raise Exception(f"Variável '{var_name}' não encontrada na tabela de símbolos.")
-        self._emit("PUSHOFF", offset)
+        self._emit("PUSHOFF", self._get_offset(node.symbol))
             
     def _visit_NodeIntLiteral(self, node: NodeIntLiteral):
         self._emit("PUSHIMM", node.token.value)
@@ -378,4 +445,4 @@ class CodeGenerator:
         raise NotImplementedError("Acesso a array ainda não implementado no gerador de código.")
 
     def _visit_NodeGrouping(self, node: NodeGrouping):
-        self._visit(node.expression)
\ No newline at end of file
+        yield node.expression
\ No newline at end of file
@@ -0,0 +1,254 @@
+"""
+Cache em disco das compilações, endereçado pelo conteúdo.
+
+A chave de uma entrada é o hash dos bytes do fonte, da versão do compilador (o
+hash dos próprios módulos em `src/`, de modo que qualquer mudança no compilador
+invalida o cache) e das opções de compilação. Cada entrada é um arquivo
+`<chave>.ttc` com um cabeçalho fixo seguido da AST e do código SAM serializados
+com `pickle` (ou, via `store_object`, de outro estado, como os trechos guardados
+pela compilação incremental). Tokens e símbolos são gravados pelo nome, e não
+pelo id da `NAME_TABLE` do processo que gravou, para que a AST lida seja
+válida em qualquer processo.
+
+As entradas usadas menos recentemente são removidas quando o tamanho total
+passa de `MAX_CACHE_BYTES`. Acertos e falhas são contados em um arquivo de
+estatísticas no próprio diretório.
+
+Uso: python src/compile_cache.py {info,prune,clear} [--cache-dir DIR] [--max-bytes N]
+"""
+
+import argparse
+import hashlib
+import io
+import marshal
+import os
+import pickle
+
+from symbol_table import Symbol
+from tokenization import NAME_TABLE, Token, make_token
+
+MAGIC = b"TTCC"
+FORMAT_VERSION = 1
+HEADER = MAGIC + bytes([FORMAT_VERSION])
+EXTENSION = ".ttc"
+STATS_FILE = "stats"
+MAX_CACHE_BYTES = 64 << 20  # 64 MiB
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.environ.get(
+    "TT_CACHE_DIR",
+    os.path.join(SRC_DIR, "..", ".compile_cache"),
+)
+
+_compiler_version = None
+
+
+def compiler_version() -> str:
+    """Hash dos módulos do compilador (calculado uma vez por processo)."""
+    global _compiler_version
+    if _compiler_version is None:
+        digest = hashlib.sha256()
+        for name in sorted(os.listdir(SRC_DIR)):
+            if name.endswith(".py"):
+                digest.update(name.encode())
+                with open(os.path.join(SRC_DIR, name), "rb") as f:
+                    digest.update(f.read())
+        _compiler_version = digest.hexdigest()
+    return _compiler_version
+
+
+def cache_key(source: bytes, options: dict | None = None) -> str:
+    digest = hashlib.sha256()
+    digest.update(HEADER)
+    digest.update(compiler_version().encode())
+    digest.update(repr(sorted((options or {}).items())).encode())
+    digest.update(source)
+    return digest.hexdigest()
+
+
+def _load_symbol(name, type, offset):
+    return Symbol(name_id=NAME_TABLE.intern(name), type=type, offset=offset)
+
+
+class _Pickler(pickle.Pickler):
+    """Grava Tokens e Symbols pelo nome, recriando-os no pool e na tabela de nomes ao ler."""
+
+    def reducer_override(self, obj):
+        if type(obj) is Token:
+            return make_token, (obj.type, obj.value)
+        if type(obj) is Symbol:
+            return _load_symbol, (obj.name, obj.type, obj.offset)
+        return NotImplemented
+
+
+def dumps(obj) -> bytes:
+    """Serializa `obj` com Tokens e Symbols gravados pelo nome (lido de volta com `pickle.loads`)."""
+    buffer = io.BytesIO()
+    _Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+    return buffer.getvalue()
+
+
+def _entry_path(cache_dir, key):
+    return os.path.join(cache_dir, key + EXTENSION)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _entries(cache_dir):
+    """Lista (caminho, tamanho, mtime) das entradas do cache."""
+    try:
+        names = [n for n in os.listdir(cache_dir) if n.endswith(EXTENSION)]
+    except OSError:
+        return []
+    entries = []
+    for name in names:
+        path = os.path.join(cache_dir, name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        entries.append((path, st.st_size, st.st_mtime))
+    return entries
+
+
+def read_stats(cache_dir=DEFAULT_CACHE_DIR) -> dict:
+    try:
+        with open(os.path.join(cache_dir, STATS_FILE), "rb") as f:
+            stats = marshal.loads(f.read())
+        if isinstance(stats, dict):
+            return stats
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    return {"hits": 0, "misses": 0}
+
+
+def _count(cache_dir, counter):
+    stats = read_stats(cache_dir)
+    stats[counter] = stats.get(counter, 0) + 1
+    path = os.path.join(cache_dir, STATS_FILE)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(marshal.dumps(stats))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # Contadores são informativos: falhar ao gravá-los não é um erro
+
+
+def load_object(key, cache_dir=DEFAULT_CACHE_DIR):
+    """Retorna o objeto gravado por `store_object` na entrada `key`, ou None se não houver entrada válida."""
+    path = _entry_path(cache_dir, key)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    try:
+        if not data.startswith(HEADER):
+            raise ValueError("cabeçalho inválido")
+        obj = pickle.loads(data[len(HEADER):])
+    except Exception:
+        _remove(path)  # Entrada de outra versão do formato ou corrompida
+        return None
+    try:
+        os.utime(path)  # Marca a entrada como usada recentemente
+    except OSError:
+        pass  # Entrada somente leitura: o acerto vale mesmo sem a marcação
+    return obj
+
+
+def store_object(key, obj, cache_dir=DEFAULT_CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    """
+    Grava `obj` na entrada `key` e remove as entradas menos usadas se o limite
+    for excedido. Se `obj` não puder ser serializado (ex: uma AST profunda
+    demais para o `pickle`, que é recursivo), nada é gravado e o cache fica
+    como estava: gravar no cache nunca deve fazer a compilação falhar.
+    """
+    try:
+        data = dumps(obj)
+    except (RecursionError, pickle.PicklingError):
+        return
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _entry_path(cache_dir, key)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER)
+        f.write(data)
+    os.replace(tmp_path, path)
+    evict(cache_dir, max_bytes)
+
+
+def load(key, cache_dir=DEFAULT_CACHE_DIR):
+    """Retorna (ast, código SAM) da entrada `key`, ou None se não houver entrada válida."""
+    entry = load_object(key, cache_dir)
+    _count(cache_dir, "misses" if entry is None else "hits")
+    return entry
+
+
+def store(key, ast, sam_code, cache_dir=DEFAULT_CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    """Grava a entrada `key` com a AST e o código SAM de uma compilação."""
+    store_object(key, (ast, sam_code), cache_dir, max_bytes)
+
+
+def evict(cache_dir=DEFAULT_CACHE_DIR, max_bytes=MAX_CACHE_BYTES) -> int:
+    """Remove as entradas usadas menos recentemente até o total caber em `max_bytes`."""
+    entries = sorted(_entries(cache_dir), key=lambda e: e[2], reverse=True)
+    total = 0
+    removed = 0
+    for path, size, _ in entries:
+        total += size
+        if total > max_bytes:
+            _remove(path)
+            removed += 1
+    return removed
+
+
+def clear(cache_dir=DEFAULT_CACHE_DIR) -> int:
+    entries = _entries(cache_dir)
+    for path, _, _ in entries:
+        _remove(path)
+    _remove(os.path.join(cache_dir, STATS_FILE))
+    return len(entries)
+
+
+def info(cache_dir=DEFAULT_CACHE_DIR) -> dict:
+    entries = _entries(cache_dir)
+    stats = read_stats(cache_dir)
+    lookups = stats.get("hits", 0) + stats.get("misses", 0)
+    return {
+        "dir": os.path.abspath(cache_dir),
+        "entries": len(entries),
+        "bytes": sum(size for _, size, _ in entries),
+        "hits": stats.get("hits", 0),
+        "misses": stats.get("misses", 0),
+        "hit_rate": stats.get("hits", 0) / lookups if lookups else 0.0,
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Inspeciona ou limpa o cache de compilação.")
+    arg_parser.add_argument("command", choices=["info", "prune", "clear"])
+    arg_parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    arg_parser.add_argument("--max-bytes", type=int, default=MAX_CACHE_BYTES,
+                            help="limite de tamanho usado por 'prune'")
+    args = arg_parser.parse_args()
+
+    if args.command == "prune":
+        print(f"{evict(args.cache_dir, args.max_bytes)} entradas removidas.")
+    elif args.command == "clear":
+        print(f"{clear(args.cache_dir)} entradas removidas.")
+    summary = info(args.cache_dir)
+    print(f"Diretório: {summary['dir']}")
+    print(f"Entradas:  {summary['entries']} ({summary['bytes'] / (1 << 20):.2f} MiB)")
+    print(f"Acertos:   {summary['hits']}  Falhas: {summary['misses']}  "
+          f"(taxa de acerto {summary['hit_rate']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""
+Dobramento e propagação de constantes sobre a AST anotada.
+
+Executado entre o `SemanticAnalyzer` e o `CodeGenerator`, função por função.
+Subárvores `NodeBinOp`/`NodeUnaryOp`/`NodeGrouping` com operandos constantes
+viram literais, e o valor constante de variáveis locais (int, float e bool) é
+propagado pelas atribuições em linha reta até a próxima redefinição ou junção
+de fluxo de controle: na saída de um `if` só sobrevivem os valores iguais nos
+dois ramos, e as variáveis atribuídas dentro de um laço são esquecidas na sua
+entrada.
+
+Os valores são calculados exatamente como a VM SAM os calcula (divisão inteira
+`int(a / b)`, conversão `ITOF` dos operandos inteiros de operações float,
+`>=` como `not <`, etc.). Operações que falhariam em tempo de execução (divisão
+por zero, estouro) não são dobradas, preservando o erro.
+"""
+
+from nodes import *
+from tokenization import TokenType, make_token
+from visitor import NodeVisitor, child_fields
+
+_NOT_CONSTANT = object()
+
+_TRACKED_TYPES = (TokenType.INT, TokenType.FLOAT, TokenType.BOOL)
+
+_COMPOUND_OPS = {
+    TokenType.PLUS_ASSIGN: TokenType.PLUS,
+    TokenType.MINUS_ASSIGN: TokenType.MINUS,
+    TokenType.STAR_ASSIGN: TokenType.STAR,
+    TokenType.SLASH_ASSIGN: TokenType.SLASH,
+}
+
+
+def constant_value(node: Node):
+    """Valor de um literal numérico ou booleano como a VM o representa, ou _NOT_CONSTANT."""
+    node_type = type(node)
+    if node_type is NodeIntLiteral:
+        return int(node.token.value)
+    if node_type is NodeFloatLiteral:
+        return float(node.token.value)
+    if node_type is NodeBoolLiteral:
+        return 1 if node.token.type == TokenType.TRUE else 0
+    return _NOT_CONSTANT
+
+
+def make_literal(value, value_type: TokenType) -> NodeExpr:
+    if value_type == TokenType.FLOAT:
+        return NodeFloatLiteral(make_token(TokenType.FLOAT_LIT, repr(float(value))))
+    if value_type == TokenType.BOOL:
+        return NodeBoolLiteral(make_token(TokenType.TRUE if value else TokenType.FALSE))
+    return NodeIntLiteral(make_token(TokenType.INT_LIT, str(value)))
+
+
+def evaluate_arithmetic(op: TokenType, a, b, result_type: TokenType):
+    """Operação aritmética como ADD/SUB/TIMES/DIV ou ADDF/.../DIVF (com ITOF) na VM."""
+    try:
+        if result_type == TokenType.FLOAT:
+            a, b = float(a), float(b)
+            if op == TokenType.PLUS:
+                return a + b
+            if op == TokenType.MINUS:
+                return a - b
+            if op == TokenType.STAR:
+                return a * b
+            if b == 0.0:
+                return _NOT_CONSTANT  # DIVF gera erro em tempo de execução
+            return a / b
+        if op == TokenType.PLUS:
+            return a + b
+        if op == TokenType.MINUS:
+            return a - b
+        if op == TokenType.STAR:
+            return a * b
+        if b == 0:
+            return _NOT_CONSTANT  # DIV gera erro em tempo de execução
+        return int(a / b)
+    except OverflowError:
+        return _NOT_CONSTANT
+
+
+def evaluate_binary(op: TokenType, a, b, result_type: TokenType):
+    """Valor de `a op b` com a sequência de instruções emitida pelo CodeGenerator."""
+    if op in (TokenType.PLUS, TokenType.MINUS, TokenType.STAR, TokenType.SLASH):
+        return evaluate_arithmetic(op, a, b, result_type)
+    if op == TokenType.GREATER:
+        return 1 if a > b else 0
+    if op == TokenType.LESS:
+        return 1 if a < b else 0
+    if op == TokenType.GREATER_EQUAL:  # LESS; NOT
+        return 0 if a < b else 1
+    if op == TokenType.LESS_EQUAL:  # GREATER; NOT
+        return 0 if a > b else 1
+    if op == TokenType.EQUAL:
+        return 1 if a == b else 0
+    if op == TokenType.NOT_EQUAL:  # EQUAL; NOT
+        return 0 if a == b else 1
+    if op == TokenType.AND:
+        return 1 if (a != 0 and b != 0) else 0
+    if op == TokenType.OR:
+        return 1 if (a != 0 or b != 0) else 0
+    return _NOT_CONSTANT
+
+
+def evaluate_unary(op: TokenType, a, result_type: TokenType):
+    if op == TokenType.MINUS:
+        if result_type == TokenType.FLOAT:
+            return float(a) * -1.0  # PUSHIMMF -1.0; TIMESF
+        return a * -1  # PUSHIMM -1; TIMES
+    if op == TokenType.NOT:
+        return 0 if a != 0 else 1
+    return _NOT_CONSTANT
+
+
+def assigned_symbols(*roots: Node) -> set[int]:
+    """Ids (id()) dos símbolos que podem ser escritos dentro das subárvores dadas."""
+    written = set()
+    pending = [root for root in roots if root is not None]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, (NodeAssignment, NodeDeclaration, NodeRead)) and node.symbol is not None:
+            written.add(id(node.symbol))
+        for name in child_fields(type(node)):
+            value = getattr(node, name)
+            if isinstance(value, list):
+                pending.extend(item for item in value if isinstance(item, Node))
+            elif isinstance(value, Node):
+                pending.append(value)
+    return written
+
+
+class ConstantFolder(NodeVisitor):
+    """
+    Os métodos de visita de expressões retornam o nó que deve substituir a
+    expressão visitada (o próprio nó ou um literal); os de comandos alteram os
+    filhos no lugar. `self.env` mapeia id(símbolo) -> valor constante conhecido
+    no ponto atual do programa.
+    """
+
+    def __init__(self):
+        self.env: dict[int, object] = {}
+        self.folded = 0  # Subexpressões substituídas por literais
+
+    def fold(self, program_node: NodeProgram):
+        for decl in program_node.global_declarations:
+            if isinstance(decl, NodeFunctionDecl):
+                self.fold_function(decl)
+
+    def fold_function(self, node: NodeFunctionDecl):
+        self.env = {}
+        self._visit(node.body)
+
+    def _literal(self, value, value_type: TokenType) -> NodeExpr:
+        self.folded += 1
+        return make_literal(value, value_type)
+
+    def _kill(self, symbols: set[int]):
+        for key in symbols:
+            self.env.pop(key, None)
+
+    def _track(self, symbol, value):
+        if symbol.type in _TRACKED_TYPES and value is not _NOT_CONSTANT:
+            self.env[id(symbol)] = value
+        else:
+            self.env.pop(id(symbol), None)
+
+    # --- Expressões ---
+
+    def _visit_non_node(self, node, *args):
+        return node
+
+    def _visit_NodeIntLiteral(self, node: NodeIntLiteral):
+        return node
+
+    def _visit_NodeFloatLiteral(self, node: NodeFloatLiteral):
+        return node
+
+    def _visit_NodeStringLiteral(self, node: NodeStringLiteral):
+        return node
+
+    def _visit_NodeBoolLiteral(self, node: NodeBoolLiteral):
+        return node
+
+    def _visit_NodeVariable(self, node: NodeVariable):
+        value = self.env.get(id(node.symbol), _NOT_CONSTANT)
+        if value is _NOT_CONSTANT:
+            return node
+        return self._literal(value, node.type)
+
+    def _visit_NodeGrouping(self, node: NodeGrouping):
+        # Os parênteses só importam para o parser: o nó é removido
+        return (yield node.expression)
+
+    def _visit_NodeUnaryOp(self, node: NodeUnaryOp):
+        node.operand = yield node.operand
+        operand = constant_value(node.operand)
+        if operand is not _NOT_CONSTANT:
+            value = evaluate_unary(node.op.type, operand, node.type)
+            if value is not _NOT_CONSTANT:
+                return self._literal(value, node.type)
+        return node
+
+    def _visit_NodeBinOp(self, node: NodeBinOp):
+        node.left = yield node.left
+        node.right = yield node.right
+        left = constant_value(node.left)
+        right = constant_value(node.right)
+        if left is not _NOT_CONSTANT and right is not _NOT_CONSTANT:
+            value = evaluate_binary(node.op.type, left, right, node.type)
+            if value is not _NOT_CONSTANT:
+                return self._literal(value, node.type)
+        return node
+
+    def _visit_NodeFunctionCall(self, node: NodeFunctionCall):
+        for i, arg in enumerate(node.args):
+            node.args[i] = yield arg
+        return node
+
+    def _visit_NodeArrayAccess(self, node: NodeArrayAccess):
+        node.index_expr = yield node.index_expr
+        return node
+
+    def _visit_NodeAssignment(self, node: NodeAssignment):
+        if node.array_index_expr:
+            node.array_index_expr = yield node.array_index_expr
+        node.value = yield node.value
+        symbol = node.symbol
+        if node.array_index_expr:
+            self.env.pop(id(symbol), None)
+            return node
+
+        value = constant_value(node.value)
+        op = _COMPOUND_OPS.get(node.op.type)
+        if op is not None:
+            current = self.env.get(id(symbol), _NOT_CONSTANT)
+            if current is not _NOT_CONSTANT and value is not _NOT_CONSTANT:
+                value = evaluate_arithmetic(op, current, value, node.type)
+                if value is not _NOT_CONSTANT:
+                    # x op= c com x conhecido vira uma atribuição simples do resultado
+                    node.op = make_token(TokenType.ASSIGN)
+                    node.value = self._literal(value, node.type)
+            else:
+                value = _NOT_CONSTANT
+        self._track(symbol, value)
+        return node
+
+    # --- Comandos ---
+
+    def _visit_NodeBlock(self, node: NodeBlock):
+        for statement in node.statements:
+            yield statement
+
+    def _visit_NodeDeclaration(self, node: NodeDeclaration):
+        if node.initializer_expr:
+            node.initializer_expr = yield node.initializer_expr
+        if node.initializer_expr is None or node.array_size is not None:
+            self.env.pop(id(node.symbol), None)
+        else:
+            self._track(node.symbol, constant_value(node.initializer_expr))
+
+    def _visit_NodeExprStmt(self, node: NodeExprStmt):
+        node.expression = yield node.expression
+
+    def _visit_NodePrint(self, node: NodePrint):
+        for i, arg in enumerate(node.args):
+            node.args[i] = yield arg
+
+    def _visit_NodeRead(self, node: NodeRead):
+        self.env.pop(id(node.symbol), None)
+
+    def _visit_NodeIf(self, node: NodeIf):
+        node.condition = yield node.condition
+        before = dict(self.env)
+        yield node.then_branch
+        after_then = self.env
+        self.env = before
+        if node.else_branch:
+            yield node.else_branch
+        # Junção: só permanecem os valores iguais nos dois caminhos
+        self.env = {key: value for key, value in self.env.items()
+                    if key in after_then and after_then[key] == value
+                    and type(after_then[key]) is type(value)}
+
+    def _visit_NodeWhile(self, node: NodeWhile):
+        self._kill(assigned_symbols(node.condition, node.body))
+        node.condition = yield node.condition
+        at_head = dict(self.env)
+        yield node.body
+        self.env = at_head
+
+    def _visit_NodeDoWhile(self, node: NodeDoWhile):
+        self._kill(assigned_symbols(node.body, node.condition))
+        at_head = dict(self.env)
+        yield node.body
+        self.env = dict(at_head)
+        node.condition = yield node.condition
+        self.env = at_head
+
+    def _visit_NodeFor(self, node: NodeFor):
+        if isinstance(node.initializer, NodeExpr):
+            node.initializer = yield node.initializer
+        elif node.initializer:
+            yield node.initializer  # Declaração: alterada no lugar
+        self._kill(assigned_symbols(node.condition, node.increment, node.body))
+        if node.condition:
+            node.condition = yield node.condition
+        at_head = dict(self.env)
+        yield node.body
+        self.env = dict(at_head)
+        if node.increment:
+            node.increment = yield node.increment
+        self.env = at_head
+
+    def _visit_NodeExit(self, node: NodeExit):
+        pass
+
+    def _visit_NodeBreak(self, node: NodeBreak):
+        pass
+
+    def _visit_NodeContinue(self, node: NodeContinue):
+        pass
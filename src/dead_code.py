@@ -0,0 +1,370 @@
+"""
+Eliminação de código morto sobre a AST anotada.
+
+Executada por função depois do `ConstantFolder` (cujas condições dobradas em
+`true`/`false` ela aproveita), remove:
+
+- comandos inalcançáveis: os que seguem, no mesmo bloco, um `exit`, `break`,
+  `continue`, uma chamada a uma função que nunca retorna ou um comando que
+  nunca termina (`while (true)` sem `break`, `if` cujos dois ramos saem);
+- ramos de condição constante: `if` vira o ramo escolhido, e `while`/`for`
+  com condição `false` desaparecem (o inicializador do `for` é mantido);
+- atribuições a variáveis locais que nunca são lidas na função. Se o valor
+  atribuído tem efeitos (chamada de função, divisão que pode falhar), ele
+  continua sendo avaliado.
+
+As funções que nunca retornam são inferidas antes da fase 2 por
+`noreturn_functions`, e o gerador omite o epílogo delas (`returns` falso).
+Cada remoção é registrada em `warnings`.
+"""
+
+from constant_folder import constant_value
+from nodes import *
+from tokenization import TokenType
+from visitor import NodeVisitor, child_fields, walk
+
+# Formas de um comando terminar: seguindo para o próximo comando, saindo do
+# laço mais interno ou voltando ao início dele. Nenhuma delas = 'exit'.
+NORMAL = 1
+BREAK = 2
+CONTINUE = 4
+
+
+def constant_condition(expr: NodeExpr):
+    """True/False para uma condição literal (entre parênteses ou não), senão None."""
+    while type(expr) is NodeGrouping:
+        expr = expr.expression
+    if type(expr) is NodeBoolLiteral:
+        return expr.token.type == TokenType.TRUE
+    return None
+
+
+def loop_jumps(body: NodeStmt, kinds: tuple[type, ...] = (NodeBreak, NodeContinue)) -> bool:
+    """True se o corpo tem um desvio de `kinds` (`break`, `continue`) que se refere ao próprio laço."""
+    pending = [body]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, kinds):
+            return True
+        if isinstance(node, (NodeWhile, NodeDoWhile, NodeFor)):
+            continue  # Os desvios internos pertencem ao laço aninhado
+        for name in child_fields(type(node)):
+            value = getattr(node, name)
+            if isinstance(value, list):
+                pending.extend(item for item in value if isinstance(item, NodeStmt))
+            elif isinstance(value, NodeStmt):
+                pending.append(value)
+    return False
+
+
+def _called_functions(body: NodeBlock) -> set[int]:
+    """Ids dos nomes das funções chamadas como comando (`f(...);`) no corpo."""
+    return {
+        node.expression.callee.name_id for node in walk(body)
+        if type(node) is NodeExprStmt and type(node.expression) is NodeFunctionCall
+    }
+
+
+def _read_symbols(body: NodeBlock) -> set[int]:
+    """
+    Ids (id()) dos símbolos lidos no corpo. A leitura de uma variável no valor
+    atribuído a ela mesma (`x = x + 1`) não conta: só serve à própria atribuição.
+    """
+    read = set()
+    pending = [(body, None)]
+    while pending:
+        node, target = pending.pop()
+        node_type = type(node)
+        if node_type in (NodeVariable, NodeArrayAccess):
+            if node.symbol is not None and id(node.symbol) != target:
+                read.add(id(node.symbol))
+        elif node_type is NodeAssignment and node.array_index_expr is None:
+            target = id(node.symbol)
+        for name in child_fields(node_type):
+            value = getattr(node, name)
+            if isinstance(value, list):
+                pending.extend((item, target) for item in value if isinstance(item, Node))
+            elif isinstance(value, Node):
+                pending.append((value, target))
+    return read
+
+
+def is_pure(expr: NodeExpr) -> bool:
+    """True se avaliar a expressão não tem efeito além de empilhar o valor (nem erro)."""
+    for node in walk(expr):
+        node_type = type(node)
+        if node_type in (NodeFunctionCall, NodeAssignment, NodeArrayAccess):
+            return False
+        if node_type is NodeBinOp and node.op.type == TokenType.SLASH:
+            divisor = constant_value(node.right)
+            if not isinstance(divisor, (int, float)) or divisor == 0:
+                return False
+    return True
+
+
+class Reachability(NodeVisitor):
+    """
+    Calcula como cada comando pode terminar. A visita de um comando retorna a
+    combinação de NORMAL, BREAK e CONTINUE; zero significa que o comando
+    nunca termina ou encerra o programa. Chamadas (como comando) às funções em
+    `noreturn` contam como `exit`.
+    """
+
+    def __init__(self, noreturn: set[int] | frozenset[int] = frozenset()):
+        self.noreturn = noreturn
+
+    def falls_through(self, stmt: NodeStmt) -> bool:
+        """True se a execução pode seguir para o comando após `stmt`."""
+        return bool(self._visit(stmt) & NORMAL)
+
+    def _simplify(self, stmt: NodeStmt) -> NodeStmt:
+        """Ponto de extensão: substitui um comando antes de visitá-lo."""
+        return stmt
+
+    def _visit_non_node(self, node, *args):
+        return NORMAL
+
+    def _generic_visit(self, node: Node, *args):
+        return NORMAL
+
+    def _visit_NodeExit(self, node: NodeExit):
+        return 0
+
+    def _visit_NodeBreak(self, node: NodeBreak):
+        return BREAK
+
+    def _visit_NodeContinue(self, node: NodeContinue):
+        return CONTINUE
+
+    def _visit_NodeExprStmt(self, node: NodeExprStmt):
+        expr = node.expression
+        if type(expr) is NodeFunctionCall and expr.callee.name_id in self.noreturn:
+            return 0
+        return NORMAL
+
+    def _visit_NodeBlock(self, node: NodeBlock):
+        outcome = 0
+        for stmt in node.statements:
+            result = yield stmt
+            outcome |= result & ~NORMAL
+            if not result & NORMAL:
+                return outcome
+        return outcome | NORMAL
+
+    def _visit_NodeIf(self, node: NodeIf):
+        condition = constant_condition(node.condition)
+        node.then_branch = self._simplify(node.then_branch)
+        then_outcome = yield node.then_branch
+        else_outcome = NORMAL
+        if node.else_branch:
+            node.else_branch = self._simplify(node.else_branch)
+            else_outcome = yield node.else_branch
+        if condition is True:
+            return then_outcome
+        if condition is False:
+            return else_outcome
+        return then_outcome | else_outcome
+
+    def _loop_outcome(self, condition, body_outcome: int) -> int:
+        # O laço só não termina se a condição é sempre verdadeira e não há 'break'
+        if condition is True and not body_outcome & BREAK:
+            return 0
+        return NORMAL
+
+    def _visit_NodeWhile(self, node: NodeWhile):
+        node.body = self._simplify(node.body)
+        body_outcome = yield node.body
+        return self._loop_outcome(constant_condition(node.condition), body_outcome)
+
+    def _visit_NodeFor(self, node: NodeFor):
+        node.body = self._simplify(node.body)
+        body_outcome = yield node.body
+        condition = True if node.condition is None else constant_condition(node.condition)
+        return self._loop_outcome(condition, body_outcome)
+
+    def _visit_NodeDoWhile(self, node: NodeDoWhile):
+        node.body = self._simplify(node.body)
+        body_outcome = yield node.body
+        if body_outcome & BREAK:
+            return NORMAL
+        if not body_outcome & (NORMAL | CONTINUE):
+            return 0  # A condição nunca é avaliada
+        return self._loop_outcome(constant_condition(node.condition), body_outcome)
+
+
+def noreturn_functions(functions: list[NodeFunctionDecl]) -> frozenset[int]:
+    """
+    Ids dos nomes das funções cujo corpo nunca chega ao fim: terminam em `exit`,
+    em um laço infinito ou em uma chamada a outra função desse conjunto. Análise
+    puramente sintática, feita antes da análise semântica das funções.
+    """
+    callers: dict[int, list[NodeFunctionDecl]] = {}
+    for func in functions:
+        if func.body is not None:
+            for callee_id in _called_functions(func.body):
+                callers.setdefault(callee_id, []).append(func)
+
+    noreturn: set[int] = set()
+    analysis = Reachability(noreturn)
+    pending = list(functions)
+    while pending:
+        func = pending.pop()
+        name_id = func.name.name_id
+        if name_id in noreturn or func.body is None:
+            continue
+        if not analysis.falls_through(func.body):
+            noreturn.add(name_id)
+            pending.extend(callers.get(name_id, ()))  # Podem ter deixado de retornar
+    return frozenset(noreturn)
+
+
+def _describe_exit(stmt: NodeStmt) -> str:
+    if type(stmt) is NodeExit:
+        return "'exit'"
+    if type(stmt) is NodeBreak:
+        return "'break'"
+    if type(stmt) is NodeContinue:
+        return "'continue'"
+    if type(stmt) is NodeExprStmt and type(stmt.expression) is NodeFunctionCall:
+        return f"chamada a '{stmt.expression.callee.value}', que não retorna"
+    return "comando que nunca termina"
+
+
+class DeadCodeEliminator(Reachability):
+    """Remove o código morto de uma função analisada (ver o docstring do módulo)."""
+
+    def __init__(self, noreturn: set[int] | frozenset[int] = frozenset()):
+        super().__init__(noreturn)
+        self.warnings: list[str] = []
+        self.function_name = ""
+
+    def eliminate_function(self, node: NodeFunctionDecl):
+        self.function_name = node.name.value
+        node.returns = self.falls_through(node.body)
+        self._remove_dead_stores(node)
+
+    def _warn(self, message: str):
+        self.warnings.append(f"Aviso ({self.function_name}): {message}.")
+
+    # --- Comandos inalcançáveis e condições constantes ---
+
+    def _simplify(self, stmt: NodeStmt) -> NodeStmt:
+        while True:
+            stmt_type = type(stmt)
+            if stmt_type is NodeIf:
+                condition = constant_condition(stmt.condition)
+                if condition is None:
+                    return stmt
+                if condition:
+                    if stmt.else_branch:
+                        self._warn("ramo 'else' de um 'if' com condição sempre verdadeira removido")
+                    stmt = stmt.then_branch
+                else:
+                    self._warn("ramo de um 'if' com condição sempre falsa removido")
+                    stmt = stmt.else_branch or NodeBlock(statements=[])
+            elif stmt_type is NodeWhile and constant_condition(stmt.condition) is False:
+                self._warn("laço 'while' com condição sempre falsa removido")
+                return NodeBlock(statements=[])
+            elif stmt_type is NodeFor and stmt.condition is not None \
+                    and constant_condition(stmt.condition) is False:
+                self._warn("laço 'for' com condição sempre falsa removido")
+                if stmt.initializer is None:
+                    return NodeBlock(statements=[])
+                if isinstance(stmt.initializer, NodeStmt):
+                    return stmt.initializer
+                return NodeExprStmt(expression=stmt.initializer)
+            elif stmt_type is NodeDoWhile and constant_condition(stmt.condition) is False \
+                    and not loop_jumps(stmt.body):
+                # O corpo roda exatamente uma vez
+                stmt = stmt.body
+            else:
+                return stmt
+
+    def _visit_NodeBlock(self, node: NodeBlock):
+        statements = node.statements
+        kept = []
+        outcome = NORMAL
+        for i, stmt in enumerate(statements):
+            stmt = self._simplify(stmt)
+            if type(stmt) is NodeBlock and not stmt.statements:
+                continue
+            kept.append(stmt)
+            result = yield stmt
+            outcome |= result & ~NORMAL
+            if not result & NORMAL:
+                outcome &= ~NORMAL
+                if i + 1 < len(statements):
+                    self._warn(f"{len(statements) - i - 1} comando(s) inalcançável(is) "
+                               f"após {_describe_exit(stmt)} removido(s)")
+                break
+        node.statements = kept
+        return outcome
+
+    # --- Atribuições a variáveis nunca lidas ---
+
+    def _remove_dead_stores(self, func: NodeFunctionDecl):
+        # Remover uma atribuição pode deixar outra variável sem leituras: repete
+        # até não haver mais o que remover
+        removed_names: dict[str, int] = {}
+        while True:
+            read = _read_symbols(func.body)
+            removed = self._prune_stores(func.body, read, removed_names)
+            if not removed:
+                break
+        if removed_names:
+            names = ", ".join(f"'{name}' ({count})" for name, count in sorted(removed_names.items()))
+            self._warn(f"atribuições a variáveis nunca lidas removidas: {names}")
+
+    def _prune_stores(self, body: NodeBlock, read: set[int], removed_names: dict[str, int]) -> int:
+        def is_dead(symbol) -> bool:
+            return symbol is not None and symbol.offset is not None and id(symbol) not in read
+
+        def record(symbol):
+            removed_names[symbol.name] = removed_names.get(symbol.name, 0) + 1
+
+        def prune(stmt: NodeStmt) -> list[NodeStmt]:
+            """Comandos que substituem `stmt` (ele mesmo, se nada muda)."""
+            if type(stmt) is NodeExprStmt and type(stmt.expression) is NodeAssignment:
+                assignment = stmt.expression
+                if assignment.array_index_expr is None and is_dead(assignment.symbol):
+                    record(assignment.symbol)
+                    if is_pure(assignment.value):
+                        return []
+                    return [NodeExprStmt(expression=assignment.value)]
+            elif type(stmt) is NodeDeclaration and stmt.initializer_expr is not None:
+                if stmt.array_size is None and is_dead(stmt.symbol):
+                    record(stmt.symbol)
+                    value = stmt.initializer_expr
+                    stmt.initializer_expr = None
+                    if not is_pure(value):
+                        return [stmt, NodeExprStmt(expression=value)]
+            return [stmt]
+
+        def prune_single(stmt: NodeStmt) -> NodeStmt:
+            replacement = prune(stmt)
+            return replacement[0] if len(replacement) == 1 else NodeBlock(statements=replacement)
+
+        before = sum(removed_names.values())
+        for node in walk(body):
+            node_type = type(node)
+            if node_type is NodeBlock:
+                node.statements = [new for stmt in node.statements for new in prune(stmt)]
+            elif node_type is NodeIf:
+                node.then_branch = prune_single(node.then_branch)
+                if node.else_branch:
+                    node.else_branch = prune_single(node.else_branch)
+            elif node_type in (NodeWhile, NodeDoWhile):
+                node.body = prune_single(node.body)
+            elif node_type is NodeFor:
+                node.body = prune_single(node.body)
+                for name in ("initializer", "increment"):
+                    expr = getattr(node, name)
+                    if type(expr) is NodeAssignment and expr.array_index_expr is None \
+                            and is_dead(expr.symbol) and is_pure(expr.value):
+                        record(expr.symbol)
+                        setattr(node, name, None)
+                    elif type(expr) is NodeDeclaration and expr.initializer_expr is not None \
+                            and is_dead(expr.symbol) and is_pure(expr.initializer_expr):
+                        record(expr.symbol)
+                        expr.initializer_expr = None
+        return sum(removed_names.values()) - before
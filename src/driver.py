@@ -0,0 +1,239 @@
+"""
+Driver de compilação em duas fases.
+
+Antes delas, `reachable_program` pode reduzir um programa lido em modo
+preguiçoso (`Parser.parse(lazy=True)`) às funções alcançáveis a partir de
+`main`: apenas essas têm o corpo analisado, verificado e gerado.
+
+Fase 1 (serial): `SemanticAnalyzer.declare_globals` monta a tabela global de
+funções e variáveis. Fase 2: cada função é analisada e gerada isoladamente,
+em um pool de processos quando há funções suficientes para compensar o custo
+de criá-los. Com `optimize`, as passagens de `optimize_function` rodam sobre a
+AST anotada entre a análise e a geração de cada função, e o código gerado passa
+pelo `PeepholeOptimizer`. Com `ir`, o código de cada função sai da
+representação intermediária de três endereços (`ir_builder`, verificada por
+`ir.verify_function` e traduzida por `ir_codegen`), e não do `CodeGenerator`
+direto sobre a AST. Os trechos são reunidos na ordem do programa por
+`CodeGenerator.link`, e como os rótulos são prefixados pelo nome da função o
+resultado é idêntico ao da compilação serial.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from code_generator import CodeGenerator
+from constant_folder import ConstantFolder
+from dead_code import DeadCodeEliminator, noreturn_functions
+from frame_layout import layout_frame
+from inliner import Inliner, inline_candidates, prepare_templates
+from ir import dump_function, verify_function
+from ir_builder import build_function
+from ir_codegen import IRCodeGenerator
+from loop_invariants import LoopInvariantMotion
+from nodes import NodeFunctionDecl, NodeProgram
+from parser import Parser
+from peephole import PeepholeOptimizer
+from semantic_analyzer import SemanticAnalyzer
+from strength_reduction import StrengthReducer
+from tail_calls import mark_tail_calls
+from tokenization import NAME_TABLE
+
+PARALLEL_MIN_FUNCTIONS = 64
+
+# Estado recebido por cada processo de trabalho: tabela global da fase 1 e funções
+_global_state = None
+_functions: list[NodeFunctionDecl] = []
+_context: "OptimizationContext | None" = None
+_ir = False
+_ir_listing = False
+
+
+@dataclass
+class OptimizationContext:
+    """Fatos sobre o programa inteiro usados pelas otimizações de cada função."""
+    noreturn: frozenset[int] = frozenset() # Funções que nunca retornam (ver noreturn_functions)
+    inline_templates: dict[int, NodeFunctionDecl] = field(default_factory=dict) # Ver inliner.prepare_templates
+
+
+@dataclass
+class OptimizationReport:
+    """Avisos das passagens sobre a AST, chamadas expandidas e reescritas de cada regra peephole."""
+    warnings: list[str] = field(default_factory=list)
+    inlined: dict[str, int] = field(default_factory=dict)
+    rewrites: dict[str, int] = field(default_factory=dict)
+
+    def merge(self, other: "OptimizationReport"):
+        self.warnings.extend(other.warnings)
+        for counts, other_counts in ((self.inlined, other.inlined), (self.rewrites, other.rewrites)):
+            for key, count in other_counts.items():
+                counts[key] = counts.get(key, 0) + count
+
+
+def optimize_function(node: NodeFunctionDecl, context: OptimizationContext,
+                      report: OptimizationReport | None = None):
+    """
+    Passagens de otimização sobre uma função já analisada: expansão em linha,
+    dobramento de constantes, eliminação de código morto, movimentação de
+    invariantes de laços, redução de força, marcação das chamadas recursivas de
+    cauda e, por último, o leiaute do quadro. Os avisos e as chamadas expandidas
+    são registrados em `report`, se fornecido.
+    """
+    inliner = Inliner(context.inline_templates)
+    inliner.inline_function(node)
+    ConstantFolder().fold_function(node)
+    eliminator = DeadCodeEliminator(context.noreturn)
+    eliminator.eliminate_function(node)
+    LoopInvariantMotion().hoist_function(node)
+    StrengthReducer().reduce_function(node)
+    mark_tail_calls(node)
+    layout_frame(node)
+    if report is not None:
+        report.merge(OptimizationReport(warnings=eliminator.warnings, inlined=inliner.inlined))
+
+
+def _generate_function(node: NodeFunctionDecl, generator: CodeGenerator, context: OptimizationContext | None,
+                       ir: bool = False, ir_listing: bool = False
+                       ) -> tuple[list[str], OptimizationReport | None, str | None]:
+    """
+    Otimiza (com `context`) e gera uma função já analisada: (código, relatório,
+    listagem da IR, se `ir_listing`). Com `ir` o código sai da IR, verificada
+    antes da tradução. O leiaute do quadro roda sempre, mesmo sem otimizações;
+    com elas, roda de novo no fim de `optimize_function`.
+    """
+    layout_frame(node)
+    report = None
+    if context is not None:
+        report = OptimizationReport()
+        optimize_function(node, context, report)
+    listing = None
+    if ir:
+        func = build_function(node)
+        verify_function(func)
+        if ir_listing:
+            listing = dump_function(func)
+        code = IRCodeGenerator().generate_function(func)
+    else:
+        code = generator.generate_function(node)
+    if report is not None:
+        peephole = PeepholeOptimizer()
+        code = peephole.optimize(code, local_prefix=f"{node.name.value}.")
+        report.rewrites = peephole.counts
+    return code, report, listing
+
+
+def _init_worker(names: list[str], global_state, functions: list[NodeFunctionDecl],
+                 context: OptimizationContext | None, ir: bool, ir_listing: bool):
+    # As funções são passadas uma única vez, na criação do processo (sem cópia
+    # alguma com 'fork'); as tarefas enviam apenas intervalos de índices.
+    # Com 'spawn' a tabela de nomes do processo começa vazia; com 'fork' ela já
+    # é igual à do processo principal e internar os nomes não a altera.
+    global _global_state, _functions, _context, _ir, _ir_listing
+    for name in names:
+        NAME_TABLE.intern(name)
+    _global_state = global_state
+    _functions = functions
+    _context = context
+    _ir = ir
+    _ir_listing = ir_listing
+
+
+def _compile_function(node: NodeFunctionDecl) -> tuple[list[str], OptimizationReport | None, str | None]:
+    """Analisa e gera uma função com um analisador sobre a tabela global."""
+    symbol_table, function_params = _global_state
+    try:
+        SemanticAnalyzer(symbol_table, function_params).analyze_function(node)
+    finally:
+        # Um erro no meio da função deixa escopos abertos na tabela compartilhada
+        while symbol_table.depth > 0:
+            symbol_table.pop_scope()
+    return _generate_function(node, CodeGenerator(), _context, _ir, _ir_listing)
+
+
+def _compile_range(bounds: tuple[int, int]) -> list[tuple[list[str], OptimizationReport | None, str | None]]:
+    """Executado nos processos de trabalho: compila as funções [início, fim)."""
+    start, stop = bounds
+    return [_compile_function(func) for func in _functions[start:stop]]
+
+
+def compile_program(program_node: NodeProgram, workers: int | None = None,
+                    min_functions: int = PARALLEL_MIN_FUNCTIONS, optimize: bool = False,
+                    report: OptimizationReport | None = None,
+                    profile: dict[str, int] | None = None, hot_threshold: int = 1,
+                    ir: bool = False, ir_listing: list[str] | None = None) -> str:
+    """
+    Analisa e gera o programa, retornando o código SAM. Com workers=1 ou menos
+    de `min_functions` funções tudo é feito no processo atual, e os nós da AST
+    ficam anotados; no modo paralelo as anotações ficam nas cópias dos processos
+    de trabalho. Erros semânticos são propagados na ordem das funções. Com
+    `optimize`, os avisos e as reescritas são acumulados em `report`, se
+    fornecido, e `profile`/`hot_threshold` restringem a expansão em linha às
+    funções mais chamadas (ver `inliner.inline_candidates`). Com `ir`, as
+    listagens da IR de cada função são acrescentadas a `ir_listing`, se fornecida.
+    """
+    analyzer = SemanticAnalyzer()
+    analyzer.declare_globals(program_node)
+    functions = [d for d in program_node.global_declarations if isinstance(d, NodeFunctionDecl)]
+    names = [f.name.value for f in functions]
+    context = None
+    if optimize:
+        candidates = inline_candidates(functions, profile=profile, hot_threshold=hot_threshold)
+        context = OptimizationContext(noreturn=noreturn_functions(functions),
+                                      inline_templates=prepare_templates(analyzer, candidates))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(functions) < min_functions:
+        generator = CodeGenerator()
+        compiled = []
+        for func in functions:
+            analyzer.analyze_function(func)
+            compiled.append(_generate_function(func, generator, context, ir, ir_listing is not None))
+    else:
+        # Intervalos contíguos, alguns por processo para equilibrar a carga
+        step = max(1, len(functions) // (workers * 4))
+        ranges = [(i, min(i + step, len(functions))) for i in range(0, len(functions), step)]
+        initargs = (NAME_TABLE.names(), analyzer.global_state(), functions, context, ir, ir_listing is not None)
+        compiled = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+            for results in pool.map(_compile_range, ranges):
+                compiled.extend(results)
+
+    if report is not None:
+        for _, function_report, _ in compiled:
+            if function_report is not None:
+                report.merge(function_report)
+    if ir_listing is not None:
+        ir_listing.extend(listing for _, _, listing in compiled if listing is not None)
+    return CodeGenerator.link([(name, code) for name, (code, _, _) in zip(names, compiled)])
+
+
+def reachable_program(program_node: NodeProgram, parser: Parser, entry: str = "main") -> NodeProgram:
+    """
+    Monta o grafo de chamadas a partir de `entry` sobre um programa lido com
+    `parser.parse(lazy=True)` e analisa apenas o corpo das funções alcançáveis.
+    Retorna o programa com as declarações globais e essas funções, na ordem
+    original. Funções inalcançáveis não são analisadas nem verificadas.
+    """
+    # Nome -> declarações (mais de uma só em programas inválidos, que a fase 1 rejeita)
+    functions: dict[int, list[NodeFunctionDecl]] = {}
+    for decl in program_node.global_declarations:
+        if isinstance(decl, NodeFunctionDecl):
+            functions.setdefault(decl.name.name_id, []).append(decl)
+    entry_ids = [name_id for name_id, decls in functions.items() if decls[0].name.value == entry]
+    if not entry_ids:
+        entry_ids = list(functions)  # Sem ponto de entrada: tudo é mantido
+    reached = set(entry_ids)
+    pending = [func for name_id in entry_ids for func in functions[name_id]]
+
+    while pending:
+        func = pending.pop()
+        for callee_id in parser.function_callees(func):
+            if callee_id in functions and callee_id not in reached:
+                reached.add(callee_id)
+                pending.extend(functions[callee_id])
+        parser.parse_function_body(func)
+
+    return NodeProgram(global_declarations=[
+        decl for decl in program_node.global_declarations
+        if not isinstance(decl, NodeFunctionDecl) or decl.name.name_id in reached
+    ])
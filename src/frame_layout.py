@@ -0,0 +1,78 @@
+"""
+Leiaute do quadro de uma função com reaproveitamento de posições.
+
+A análise semântica dá a cada declaração local uma posição nova no quadro
+(FBR+1, FBR+2, ...), e as passagens de otimização acrescentam as suas
+temporárias (variáveis das funções expandidas, invariantes, variáveis de
+indução) sempre no fim. `layout_frame` refaz essa numeração por escopo: cada
+bloco, ramo de `if`, corpo de laço e `for` (com a declaração do inicializador)
+começa na primeira posição livre do escopo que o contém e a devolve ao
+terminar. Escopos irmãos, que nunca estão vivos ao mesmo tempo, passam a
+dividir as mesmas posições, e o quadro fica com o tamanho do caminho mais
+profundo de declarações aninhadas. Roda em toda compilação, logo após a análise
+da função, e de novo depois das otimizações de -O.
+"""
+
+from nodes import *
+from visitor import walk
+
+_REFERENCES = (NodeVariable, NodeArrayAccess, NodeAssignment, NodeRead)
+
+
+def layout_frame(node: NodeFunctionDecl) -> bool:
+    """
+    Renumera as variáveis locais da função e ajusta `frame_size`; declarações
+    sem valor inicial de variáveis nunca usadas não ocupam posição. Retorna
+    False, sem alterar nada, se alguma variável local usada não tem declaração
+    no corpo.
+    """
+    referenced: set[int] = set()
+    locals_used: set[int] = set()  # Variáveis locais (não parâmetros) usadas
+    for child in walk(node.body):
+        if isinstance(child, _REFERENCES) and child.symbol is not None:
+            referenced.add(id(child.symbol))
+            if child.symbol.offset is not None and child.symbol.offset > 0:
+                locals_used.add(id(child.symbol))
+
+    offsets: dict[int, int] = {}  # id(símbolo) -> nova posição
+    symbols = []
+    frame_size = 0
+    next_offset = 0
+    # Itens inteiros marcam o fim de um escopo: a próxima posição livre volta a esse valor
+    pending: list = [node.body]
+    while pending:
+        item = pending.pop()
+        if type(item) is int:
+            next_offset = item
+            continue
+        item_type = type(item)
+        if item_type is NodeDeclaration:
+            if item.initializer_expr is None and id(item.symbol) not in referenced:
+                continue  # Sobra de uma variável cujas atribuições foram removidas: não ocupa posição
+            next_offset += 1
+            frame_size = max(frame_size, next_offset)
+            offsets[id(item.symbol)] = next_offset
+            symbols.append(item.symbol)
+        elif item_type is NodeBlock:
+            pending.append(next_offset)
+            pending.extend(reversed(item.statements))
+        elif item_type is NodeIf:
+            for branch in (item.else_branch, item.then_branch):
+                if branch is not None:
+                    pending.append(next_offset)
+                    pending.append(branch)
+        elif item_type in (NodeWhile, NodeDoWhile):
+            pending.append(next_offset)
+            pending.append(item.body)
+        elif item_type is NodeFor:
+            pending.append(next_offset)
+            pending.append(item.body)
+            if type(item.initializer) is NodeDeclaration:
+                pending.append(item.initializer)
+
+    if not locals_used <= offsets.keys():
+        return False
+    for symbol in symbols:
+        symbol.offset = offsets[id(symbol)]
+    node.frame_size = frame_size
+    return True
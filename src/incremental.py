@@ -0,0 +1,204 @@
+"""
+Recompilação incremental com granularidade de função.
+
+O fonte é dividido nas fronteiras das declarações `func` de nível superior
+(`split_top_level`). Cada trecho é identificado pelo hash do seu texto de
+tokens: sem comentários e com cada sequência de espaços reduzida a um. Para os
+trechos já vistos, `IncrementalCompiler` reaproveita a AST (sem nova análise
+léxica ou sintática) e, se as dependências globais da função não mudaram,
+também as anotações da análise semântica e o código SAM gerado. As dependências são as
+assinaturas das funções chamadas e os tipos das variáveis globais usadas.
+Apenas a fase 1 (tabela global, barata) e a ligação final rodam sempre.
+
+Os trechos podem ser gravados no cache de compilação (`save`) e lidos em outra
+execução (`load`), sob uma chave derivada do caminho do fonte (`state_key`).
+Como nas demais entradas do cache, nomes são gravados como texto, e não pelo id
+da `NAME_TABLE` do processo que gravou.
+"""
+
+import hashlib
+import os
+import pickle
+import re
+
+import compile_cache
+from code_generator import CodeGenerator
+from frame_layout import layout_frame
+from nodes import Node, NodeFunctionDecl, NodeProgram
+from parser import Parser
+from semantic_analyzer import SemanticAnalyzer
+from tokenization import NAME_TABLE, Tokenizer, TokenType
+from visitor import child_fields
+
+# Strings e comentários (que podem conter chaves ou 'func'), chaves e a palavra 'func'
+_STRUCTURE = re.compile(r'"[^"]*"?|\$[^\n]*|[{}]|\bfunc\b', re.IGNORECASE)
+
+# Texto de tokens: strings preservadas, comentários removidos, espaços reduzidos a um
+_NORMALIZE = re.compile(r'("[^"]*"?)|\$[^\n]*|\s+')
+
+
+def split_top_level(content: str) -> list[str]:
+    """
+    Divide o fonte em trechos: cada função de nível superior (de `func` até a
+    chave que fecha seu corpo) é um trecho, e o texto entre funções (declarações
+    globais, comentários) forma trechos próprios. Concatenar os trechos reproduz
+    `content`.
+    """
+    chunks = []
+    chunk_start = 0
+    depth = 0
+    in_function = False
+    for m in _STRUCTURE.finditer(content):
+        text = m.group()
+        if text == "{":
+            depth += 1
+        elif text == "}":
+            depth -= 1
+            if depth == 0 and in_function:
+                chunks.append(content[chunk_start:m.end()])
+                chunk_start = m.end()
+                in_function = False
+        elif depth == 0 and not in_function and text.lower() == "func":
+            if m.start() > chunk_start:
+                chunks.append(content[chunk_start:m.start()])
+            chunk_start = m.start()
+            in_function = True
+    if chunk_start < len(content):
+        chunks.append(content[chunk_start:])
+    return chunks
+
+
+def token_text(chunk: str) -> str:
+    return _NORMALIZE.sub(lambda m: m.group(1) or " ", chunk).strip()
+
+
+class CachedChunk:
+    """Resultados guardados para um trecho do fonte."""
+    __slots__ = ("declarations", "code", "dependencies")
+
+    def __init__(self, declarations: list[Node]):
+        self.declarations = declarations # AST do trecho (anotada se já compilada)
+        self.code: list[str] | None = None # SAM da função (apenas trechos 'func')
+        self.dependencies: dict[str, tuple] = {} # Nome global -> assinatura usada
+
+
+def _global_signature(analyzer: SemanticAnalyzer, name_id: int):
+    """Assinatura atual de um nome global: tipos dos parâmetros, ou o tipo da variável."""
+    symbol = analyzer.symbol_table.lookup(name_id)
+    if symbol is None:
+        return None
+    if symbol.type == TokenType.FUNC:
+        return ("func", tuple(analyzer.function_params[name_id]))
+    return ("var", symbol.type)
+
+
+def _global_dependencies(analyzer: SemanticAnalyzer, func: NodeFunctionDecl) -> dict[str, tuple]:
+    """Percorre a função anotada e coleta os nomes globais (funções e variáveis) que ela usa."""
+    dependencies = {}
+    pending = [func.body]
+    while pending:
+        node = pending.pop()
+        symbol = getattr(node, "symbol", None)
+        if symbol is not None and symbol.offset is None:
+            dependencies[symbol.name] = _global_signature(analyzer, symbol.name_id)
+        for name in child_fields(type(node)):
+            value = getattr(node, name)
+            if isinstance(value, list):
+                pending.extend(item for item in value if isinstance(item, Node))
+            elif isinstance(value, Node):
+                pending.append(value)
+    return dependencies
+
+
+def state_key(path: str) -> str:
+    """Chave do cache de compilação sob a qual ficam os trechos do fonte `path`."""
+    return compile_cache.cache_key(os.path.abspath(path).encode("utf-8"), options={"incremental": True})
+
+
+class IncrementalCompiler:
+    """
+    Compilador que guarda, entre chamadas de `compile`, os resultados de cada
+    trecho do fonte. Entradas de trechos que deixaram de existir são descartadas
+    a cada compilação. `stats` descreve o trabalho feito na última chamada, e
+    `program` é a AST do programa compilado por ela.
+    """
+
+    def __init__(self, chunks: dict[str, CachedChunk] | None = None):
+        self._chunks: dict[str, CachedChunk] = chunks or {}
+        self.stats = {}
+        self.program: NodeProgram | None = None
+
+    @classmethod
+    def load(cls, key: str, cache_dir: str = compile_cache.DEFAULT_CACHE_DIR) -> "IncrementalCompiler":
+        """Compilador com os trechos gravados por `save` sob `key` (vazio, se não houver)."""
+        state = compile_cache.load_object(key, cache_dir)
+        chunks = {}
+        if isinstance(state, dict):
+            for chunk_key, data in state.items():
+                try:
+                    chunks[chunk_key] = pickle.loads(data)
+                except Exception:
+                    pass  # Trecho corrompido: volta a ser analisado
+        return cls(chunks)
+
+    def save(self, key: str, cache_dir: str = compile_cache.DEFAULT_CACHE_DIR):
+        """
+        Grava os trechos da última compilação no cache, sob `key`. Cada trecho é
+        serializado à parte: um trecho que o `pickle` não consegue gravar (ex:
+        uma expressão profunda demais) fica de fora e volta a ser analisado na
+        próxima execução, sem impedir a gravação dos demais.
+        """
+        state = {}
+        for chunk_key, entry in self._chunks.items():
+            try:
+                state[chunk_key] = compile_cache.dumps(entry)
+            except (RecursionError, pickle.PicklingError):
+                pass
+        compile_cache.store_object(key, state, cache_dir)
+
+    def compile(self, content: str) -> str:
+        stats = self.stats = {"chunks": 0, "parsed": 0, "reused": 0, "recompiled": 0}
+        entries = []
+        cache = {}
+        for chunk in split_top_level(content):
+            text = token_text(chunk)
+            if not text:
+                continue
+            key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+            entry = cache.get(key) or self._chunks.get(key)
+            if entry is None:
+                program = Parser(Tokenizer(chunk).tokenizer()).parse()
+                entry = CachedChunk(program.global_declarations)
+                stats["parsed"] += 1
+            cache[key] = entry
+            entries.append(entry)
+        self._chunks = cache
+        stats["chunks"] = len(entries)
+
+        # Fase 1 sobre o programa inteiro (ASTs reaproveitadas e novas)
+        program = self.program = NodeProgram(global_declarations=[d for e in entries for d in e.declarations])
+        analyzer = SemanticAnalyzer()
+        analyzer.declare_globals(program)
+
+        # Fase 2 apenas para as funções novas ou cujas dependências mudaram
+        generator = CodeGenerator()
+        functions = []
+        for entry in entries:
+            for decl in entry.declarations:
+                if not isinstance(decl, NodeFunctionDecl):
+                    continue
+                if entry.code is not None and all(
+                    _global_signature(analyzer, NAME_TABLE.intern(name)) == signature
+                    for name, signature in entry.dependencies.items()
+                ):
+                    stats["reused"] += 1
+                else:
+                    entry.code = None # Só volta a ser válido se a análise passar
+                    analyzer.analyze_function(decl)
+                    layout_frame(decl)
+                    entry.dependencies = _global_dependencies(analyzer, decl)
+                    entry.code = generator.generate_function(decl)
+                    stats["recompiled"] += 1
+                functions.append((decl.name.value, entry.code))
+
+        return CodeGenerator.link(functions)
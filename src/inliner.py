@@ -0,0 +1,220 @@
+"""
+Expansão em linha (inlining) de funções pequenas e não recursivas.
+
+Como as funções da linguagem não retornam valor, toda chamada útil é um
+comando `f(args);`. O `Inliner` substitui esses comandos por um bloco com o
+corpo de `f`: cada parâmetro vira uma variável local inicializada com o
+argumento correspondente (avaliados na mesma ordem da chamada) e as variáveis
+de `f` ganham posições novas no quadro da função chamadora. Um `exit` no corpo
+expandido continua encerrando o programa.
+
+Candidatas (`inline_candidates`): funções com corpo de no máximo `max_size`
+nós que não fazem parte de um ciclo de chamadas entre candidatas. Com um
+perfil de execução (contagem de chamadas por função, ver `load_profile`), só
+as funções chamadas pelo menos `hot_threshold` vezes são candidatas. O
+crescimento de cada função chamadora é limitado a `budget` nós.
+
+Os modelos expandidos são cópias das candidatas já analisadas
+(`prepare_templates`), de modo que cada função chamadora pode ser otimizada
+isoladamente, inclusive nos processos do driver paralelo.
+"""
+
+import json
+
+from nodes import *
+from semantic_analyzer import SemanticAnalyzer, SemanticError
+from symbol_table import Symbol
+from visitor import replace_statements, walk
+
+INLINE_MAX_SIZE = 24  # Nós no corpo de uma função candidata
+INLINE_BUDGET = 120  # Nós acrescentados, no máximo, a cada função chamadora
+
+
+def function_size(func: NodeFunctionDecl) -> int:
+    return sum(1 for _ in walk(func.body))
+
+
+def _callees(func: NodeFunctionDecl) -> set[int]:
+    return {node.callee.name_id for node in walk(func.body) if type(node) is NodeFunctionCall}
+
+
+def load_profile(path: str) -> dict[str, int]:
+    """Lê um perfil JSON {"nome da função": chamadas}, como `SAMVM.call_counts` de uma execução."""
+    with open(path, "r") as f:
+        profile = json.load(f)
+    return {str(name): int(count) for name, count in profile.items()}
+
+
+def inline_candidates(functions: list[NodeFunctionDecl], max_size: int = INLINE_MAX_SIZE,
+                      profile: dict[str, int] | None = None,
+                      hot_threshold: int = 1) -> list[NodeFunctionDecl]:
+    """Funções que podem ser expandidas nas chamadas (ver o docstring do módulo)."""
+    small = {}
+    for func in functions:
+        name = func.name.value
+        if name == "main" or func.body is None:
+            continue
+        if profile is not None and profile.get(name, 0) < hot_threshold:
+            continue
+        if function_size(func) <= max_size:
+            small[func.name.name_id] = func
+    # Nomes declarados mais de uma vez: o programa é inválido e a fase 1 o rejeita
+    duplicated = [func.name.name_id for func in functions
+                  if func.name.name_id in small and small[func.name.name_id] is not func]
+    for name_id in duplicated:
+        small.pop(name_id, None)
+
+    graph = {name_id: _callees(func) & small.keys() for name_id, func in small.items()}
+    recursive = _recursive_functions(graph)
+    return [func for name_id, func in small.items() if name_id not in recursive]
+
+
+def _recursive_functions(graph: dict[int, set[int]]) -> set[int]:
+    """
+    Vértices de `graph` que alcançam a si mesmos: os que chamam a si próprios e
+    os das componentes fortemente conexas com mais de um vértice (algoritmo de
+    Tarjan com pilha explícita, linear no tamanho do grafo).
+    """
+    index: dict[int, int] = {}
+    lowlink: dict[int, int] = {}
+    stack: list[int] = []
+    on_stack: set[int] = set()
+    recursive = set()
+    for root in graph:
+        if root in index:
+            continue
+        work = [(root, iter(graph[root]))]
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            vertex, successors = work[-1]
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = lowlink[successor] = len(index)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(graph[successor])))
+                    break
+                if successor in on_stack:
+                    lowlink[vertex] = min(lowlink[vertex], index[successor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[vertex])
+                if lowlink[vertex] == index[vertex]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == vertex:
+                            break
+                    if len(component) > 1 or vertex in graph[vertex]:
+                        recursive.update(component)
+    return recursive
+
+
+def _clone(value, symbols: dict[int, Symbol] | None, offset_map: dict[int, int] | None):
+    """
+    Cópia de uma subárvore da AST. Tokens e símbolos globais são compartilhados;
+    com `offset_map`, cada símbolo local ganha uma cópia com a nova posição no
+    quadro (a mesma cópia para todas as ocorrências, registrada em `symbols`).
+    """
+    if isinstance(value, Node):
+        return type(value)(*(_clone(getattr(value, name), symbols, offset_map)
+                             for name in value.__slots__))
+    if isinstance(value, list):
+        return [_clone(item, symbols, offset_map) for item in value]
+    if type(value) is Symbol and offset_map is not None and value.offset is not None:
+        symbol = symbols.get(id(value))
+        if symbol is None:
+            symbol = symbols[id(value)] = Symbol(value.name_id, value.type, offset_map[value.offset])
+        return symbol
+    return value
+
+
+def prepare_templates(analyzer: SemanticAnalyzer,
+                      candidates: list[NodeFunctionDecl]) -> dict[int, NodeFunctionDecl]:
+    """
+    Cópias analisadas das candidatas (a fase 1 já deve ter rodado), por id do
+    nome. Uma candidata com erro semântico é deixada de fora: o erro é relatado
+    pela análise da própria função, na ordem do programa.
+    """
+    templates = {}
+    for func in candidates:
+        template = _clone(func, None, None)
+        try:
+            analyzer.analyze_function(template)
+        except SemanticError:
+            continue
+        finally:
+            while analyzer.symbol_table.depth > 0:
+                analyzer.symbol_table.pop_scope()
+        templates[func.name.name_id] = template
+    return templates
+
+
+class Inliner:
+    """Expande, em uma função analisada, as chamadas às funções de `templates`."""
+
+    def __init__(self, templates: dict[int, NodeFunctionDecl], budget: int = INLINE_BUDGET):
+        self.templates = templates
+        self.budget = budget
+        self.sizes: dict[int, int] = {}  # Tamanho dos modelos já usados nesta função
+        self.inlined: dict[str, int] = {}  # Chamadas expandidas por função chamada
+
+    def inline_function(self, node: NodeFunctionDecl):
+        if not self.templates:
+            return
+        remaining = self.budget
+
+        def expand(stmt: NodeStmt) -> NodeStmt:
+            # Os blocos expandidos também são percorridos: as chamadas aninhadas são expandidas
+            nonlocal remaining
+            expanded = self._expand(node, stmt, remaining)
+            if expanded is None:
+                return stmt
+            remaining -= self.sizes[stmt.expression.callee.name_id]
+            return expanded
+
+        replace_statements(node.body, expand)
+
+    def _expand(self, caller: NodeFunctionDecl, stmt: NodeStmt, remaining: int) -> NodeBlock | None:
+        """Bloco que substitui o comando `f(args);`, ou None se ele não deve ser expandido."""
+        if type(stmt) is not NodeExprStmt or type(stmt.expression) is not NodeFunctionCall:
+            return None
+        call = stmt.expression
+        template = self.templates.get(call.callee.name_id)
+        if template is None or template.name.name_id == caller.name.name_id:
+            return None
+        size = self.sizes.get(call.callee.name_id)
+        if size is None:
+            size = self.sizes[call.callee.name_id] = function_size(template)
+        if size > remaining:
+            return None
+
+        # Parâmetros e variáveis da função chamada passam a ocupar novas
+        # posições no fim do quadro da chamadora
+        num_params = len(template.params)
+        base = caller.frame_size
+        offset_map = {-(num_params + 1) + i: base + 1 + i for i in range(num_params)}
+        for offset in range(1, template.frame_size + 1):
+            offset_map[offset] = base + num_params + offset
+        caller.frame_size = base + num_params + template.frame_size
+
+        symbols: dict[int, Symbol] = {}
+        body = _clone(template.body, symbols, offset_map)
+        by_offset = {symbol.offset: symbol for symbol in symbols.values()}
+        statements = []
+        for i, (param, arg) in enumerate(zip(template.params, call.args)):
+            offset = base + 1 + i
+            symbol = by_offset.get(offset) or Symbol(param.identifier.name_id, param.param_type.type, offset)
+            statements.append(NodeDeclaration(var_type=param.param_type, identifier=param.identifier,
+                                              initializer_expr=arg, symbol=symbol))
+        statements.append(body)
+
+        name = call.callee.value
+        self.inlined[name] = self.inlined.get(name, 0) + 1
+        return NodeBlock(statements=statements)
@@ -0,0 +1,471 @@
+"""
+Representação intermediária (IR) de três endereços.
+
+Cada função vira um `IRFunction`: uma lista de blocos básicos cujo primeiro é
+a entrada. Um bloco é uma sequência de instruções sem desvios, terminada por
+exatamente um terminador (`Jump`, `Branch`, `TailCall`, `Return` ou `Exit`),
+que guarda referências aos blocos sucessores: essas são as arestas do grafo de
+fluxo de controle. Os predecessores são recalculados por
+`IRFunction.link_blocks`.
+
+As instruções operam sobre posições virtuais, no máximo três por instrução:
+
+    Var    variável do quadro (parâmetro ou local), pelo deslocamento do FBR
+    Temp   temporária, sem posição no quadro até a tradução para SAM
+    Const  valor imediato
+
+Uma temporária pode ser escrita em mais de um bloco (ex: o valor de um `and`),
+mas deve estar definida em todo caminho que chega a uma leitura: é uma das
+condições conferidas por `verify_function`. `dump_function` produz a listagem
+textual. A tradução a partir da AST anotada fica em `ir_builder` e a tradução
+para SAM em `ir_codegen`.
+"""
+
+from dataclasses import dataclass, field
+
+from tokenization import TokenType
+
+
+class IRError(Exception):
+    """IR malformada, detectada por `verify_function`."""
+
+
+# --- Operandos ---
+
+@dataclass(frozen=True, slots=True)
+class Var:
+    """Variável do quadro: parâmetros têm deslocamento negativo, locais positivo."""
+    offset: int
+    name: str = field(default="", compare=False)
+
+    def __str__(self):
+        return f"{self.name}@{self.offset}"
+
+
+@dataclass(frozen=True, slots=True)
+class Temp:
+    index: int
+
+    def __str__(self):
+        return f"%t{self.index}"
+
+
+@dataclass(frozen=True, slots=True)
+class Const:
+    value: int | float | str
+    type: TokenType
+
+    def __str__(self):
+        if self.type == TokenType.STRING:
+            return f'"{self.value}"'
+        if self.type == TokenType.BOOL:
+            return "true" if self.value else "false"
+        return str(self.value)
+
+
+Operand = Var | Temp | Const
+
+# Operações binárias e unárias (sufixo .f na listagem quando `type` é FLOAT)
+BINARY_OPS = {"add", "sub", "mul", "div", "lt", "gt", "le", "ge", "eq", "ne"}
+UNARY_OPS = {"neg", "not", "itof"}
+
+
+# --- Instruções ---
+
+@dataclass(slots=True)
+class Copy:
+    dest: Var | Temp
+    source: Operand
+
+    def uses(self):
+        return (self.source,)
+
+    def __str__(self):
+        return f"{self.dest} = {self.source}"
+
+
+@dataclass(slots=True)
+class Binary:
+    dest: Var | Temp
+    op: str
+    left: Operand
+    right: Operand
+    type: TokenType  # FLOAT: aritmética em ponto flutuante
+
+    def uses(self):
+        return (self.left, self.right)
+
+    def __str__(self):
+        suffix = ".f" if self.type == TokenType.FLOAT else ""
+        return f"{self.dest} = {self.op}{suffix} {self.left}, {self.right}"
+
+
+@dataclass(slots=True)
+class Unary:
+    dest: Var | Temp
+    op: str
+    operand: Operand
+    type: TokenType
+
+    def uses(self):
+        return (self.operand,)
+
+    def __str__(self):
+        suffix = ".f" if self.type == TokenType.FLOAT else ""
+        return f"{self.dest} = {self.op}{suffix} {self.operand}"
+
+
+@dataclass(slots=True)
+class Call:
+    dest: Var | Temp | None  # None: valor descartado
+    callee: str
+    args: list[Operand]
+
+    def uses(self):
+        return tuple(self.args)
+
+    def __str__(self):
+        call = f"call {self.callee}({', '.join(map(str, self.args))})"
+        return call if self.dest is None else f"{self.dest} = {call}"
+
+
+@dataclass(slots=True)
+class Print:
+    value: Operand
+    type: TokenType
+
+    def uses(self):
+        return (self.value,)
+
+    def __str__(self):
+        return f"print {self.value}"
+
+
+@dataclass(slots=True)
+class Read:
+    dest: Var
+    type: TokenType
+
+    def uses(self):
+        return ()
+
+    def __str__(self):
+        return f"{self.dest} = read"
+
+
+Instruction = Copy | Binary | Unary | Call | Print | Read
+
+
+# --- Terminadores ---
+
+@dataclass(slots=True)
+class Jump:
+    target: "BasicBlock"
+
+    def uses(self):
+        return ()
+
+    def successors(self):
+        return (self.target,)
+
+    def __str__(self):
+        return f"jump {self.target.name}"
+
+
+@dataclass(slots=True)
+class Branch:
+    condition: Operand
+    if_true: "BasicBlock"
+    if_false: "BasicBlock"
+
+    def uses(self):
+        return (self.condition,)
+
+    def successors(self):
+        return (self.if_true, self.if_false)
+
+    def __str__(self):
+        return f"branch {self.condition}, {self.if_true.name}, {self.if_false.name}"
+
+
+@dataclass(slots=True)
+class TailCall:
+    """Chamada recursiva de cauda: os argumentos substituem os parâmetros e a execução segue em `target`."""
+    args: list[Operand]
+    target: "BasicBlock"
+
+    def uses(self):
+        return tuple(self.args)
+
+    def successors(self):
+        return (self.target,)
+
+    def __str__(self):
+        return f"tailcall ({', '.join(map(str, self.args))}) -> {self.target.name}"
+
+
+@dataclass(slots=True)
+class Return:
+    def uses(self):
+        return ()
+
+    def successors(self):
+        return ()
+
+    def __str__(self):
+        return "return"
+
+
+@dataclass(slots=True)
+class Exit:
+    def uses(self):
+        return ()
+
+    def successors(self):
+        return ()
+
+    def __str__(self):
+        return "exit"
+
+
+Terminator = Jump | Branch | TailCall | Return | Exit
+
+INSTRUCTION_TYPES = (Copy, Binary, Unary, Call, Print, Read)
+TERMINATOR_TYPES = (Jump, Branch, TailCall, Return, Exit)
+
+
+# --- Blocos e funções ---
+
+@dataclass(eq=False, slots=True)
+class BasicBlock:
+    name: str
+    instructions: list = field(default_factory=list)
+    terminator: Terminator | None = None
+    predecessors: list["BasicBlock"] = field(default_factory=list)  # Ver IRFunction.link_blocks
+
+    @property
+    def successors(self) -> tuple["BasicBlock", ...]:
+        return self.terminator.successors() if self.terminator is not None else ()
+
+
+@dataclass(eq=False, slots=True)
+class IRFunction:
+    name: str
+    params: list[Var]
+    frame_size: int  # Variáveis locais do quadro (as temporárias não contam)
+    blocks: list[BasicBlock] = field(default_factory=list)
+    temp_count: int = 0
+
+    @property
+    def entry(self) -> BasicBlock:
+        return self.blocks[0]
+
+    def new_temp(self) -> Temp:
+        self.temp_count += 1
+        return Temp(self.temp_count)
+
+    def link_blocks(self):
+        """Recalcula os predecessores de cada bloco a partir dos terminadores."""
+        for block in self.blocks:
+            block.predecessors = []
+        for block in self.blocks:
+            for successor in block.successors:
+                if block not in successor.predecessors:
+                    successor.predecessors.append(block)
+
+    def remove_unreachable(self) -> int:
+        """Remove os blocos inalcançáveis a partir da entrada, mantendo a ordem dos demais; retorna quantos."""
+        reachable = set(map(id, reverse_postorder(self)))
+        before = len(self.blocks)
+        self.blocks = [block for block in self.blocks if id(block) in reachable]
+        self.link_blocks()
+        return before - len(self.blocks)
+
+
+def reverse_postorder(func: IRFunction) -> list[BasicBlock]:
+    """Blocos alcançáveis a partir da entrada em pós-ordem reversa (sem recursão)."""
+    order = []
+    visited = {id(func.entry)}
+    pending = [(func.entry, iter(func.entry.successors))]
+    while pending:
+        block, successors = pending[-1]
+        for successor in successors:
+            if id(successor) not in visited:
+                visited.add(id(successor))
+                pending.append((successor, iter(successor.successors)))
+                break
+        else:
+            pending.pop()
+            order.append(block)
+    order.reverse()
+    return order
+
+
+def defined_slot(instruction) -> Var | Temp | None:
+    """Posição escrita por uma instrução (None para print e chamadas sem destino)."""
+    return getattr(instruction, "dest", None)
+
+
+def live_temps(func: IRFunction) -> dict[str, frozenset[int]]:
+    """
+    Vivacidade das temporárias (fluxo de dados para trás, até o ponto fixo):
+    nome do bloco -> índices das temporárias lidas em algum caminho a partir da
+    saída do bloco antes de serem reescritas.
+    """
+    order = reverse_postorder(func)
+    upward: dict[str, set[int]] = {}  # Lidas no bloco antes de escritas nele
+    defined: dict[str, set[int]] = {}
+    for block in order:
+        reads, writes = set(), set()
+        for item in block.instructions + [block.terminator]:
+            for operand in item.uses():
+                if type(operand) is Temp and operand.index not in writes:
+                    reads.add(operand.index)
+            dest = defined_slot(item)
+            if type(dest) is Temp:
+                writes.add(dest.index)
+        upward[block.name], defined[block.name] = reads, writes
+
+    live_in = {block.name: frozenset() for block in order}
+    live_out = dict(live_in)
+    changed = True
+    while changed:
+        changed = False
+        for block in reversed(order):
+            out = frozenset().union(*(live_in[s.name] for s in block.successors))
+            live_out[block.name] = out
+            incoming = frozenset(upward[block.name] | (out - defined[block.name]))
+            if incoming != live_in[block.name]:
+                live_in[block.name] = incoming
+                changed = True
+    return live_out
+
+
+# --- Listagem ---
+
+def dump_function(func: IRFunction) -> str:
+    """Listagem textual da função: cabeçalho, e cada bloco com seus predecessores e instruções."""
+    params = ", ".join(map(str, func.params))
+    lines = [f"func {func.name}({params})  # quadro: {func.frame_size}, temporárias: {func.temp_count}"]
+    for block in func.blocks:
+        predecessors = ", ".join(p.name for p in block.predecessors) or "-"
+        lines.append(f"{block.name}:  # pred: {predecessors}")
+        lines.extend(f"    {instruction}" for instruction in block.instructions)
+        lines.append(f"    {block.terminator}")
+    return "\n".join(lines)
+
+
+# --- Verificação ---
+
+def verify_function(func: IRFunction):
+    """
+    Confere a estrutura da função e levanta IRError no primeiro problema:
+    todo bloco tem um terminador e só instruções comuns antes dele, os desvios
+    apontam para blocos da função, os predecessores batem com os terminadores,
+    as operações e as posições escritas são válidas, os deslocamentos estão
+    dentro do quadro e toda temporária lida está definida em todos os caminhos
+    que chegam à leitura.
+    """
+    if not func.blocks:
+        raise IRError(f"Função '{func.name}' sem blocos.")
+    blocks = {id(block) for block in func.blocks}
+    names = set()
+    param_offsets = {param.offset for param in func.params}
+
+    def operand_problem(operand) -> str | None:
+        if type(operand) is Var:
+            if operand.offset not in param_offsets and not 1 <= operand.offset <= func.frame_size:
+                return f"deslocamento {operand.offset} fora do quadro"
+        elif type(operand) is Temp:
+            if not 1 <= operand.index <= func.temp_count:
+                return f"temporária {operand} não foi criada pela função"
+        elif type(operand) is not Const:
+            return f"operando inválido {operand!r}"
+        return None
+
+    def item_problem(item) -> str | None:
+        item_type = type(item)
+        if item_type in TERMINATOR_TYPES:
+            if item_type is TailCall and (item.target is not func.entry or len(item.args) != len(func.params)):
+                return "chamada de cauda deve passar todos os parâmetros e voltar à entrada"
+            if any(id(successor) not in blocks for successor in item.successors()):
+                return "desvio para um bloco fora da função"
+        elif item_type is Binary and item.op not in BINARY_OPS or item_type is Unary and item.op not in UNARY_OPS:
+            return f"operação '{item.op}' desconhecida"
+        else:
+            dest = defined_slot(item)
+            if dest is None and item_type not in (Call, Print):
+                return "instrução sem destino"
+            if dest is not None:
+                if type(dest) not in (Var, Temp) or item_type is Read and type(dest) is not Var:
+                    return "destino inválido"
+                problem = operand_problem(dest)
+                if problem is not None:
+                    return problem
+        for operand in item.uses():
+            problem = operand_problem(operand)
+            if problem is not None:
+                return problem
+        return None
+
+    predecessors: dict[int, list[int]] = {id(block): [] for block in func.blocks}
+    for block in func.blocks:
+        if block.name in names:
+            raise IRError(f"Bloco '{block.name}' repetido em '{func.name}'.")
+        names.add(block.name)
+        if type(block.terminator) not in TERMINATOR_TYPES:
+            raise IRError(f"{func.name}/{block.name}: bloco sem terminador.")
+        for item in block.instructions:
+            if type(item) not in INSTRUCTION_TYPES:
+                raise IRError(f"{func.name}/{block.name}: '{item}': instrução inválida no meio do bloco.")
+        for item in block.instructions + [block.terminator]:
+            problem = item_problem(item)
+            if problem is not None:
+                raise IRError(f"{func.name}/{block.name}: '{item}': {problem}.")
+        for successor in block.successors:
+            if id(block) not in predecessors[id(successor)]:
+                predecessors[id(successor)].append(id(block))
+
+    for block in func.blocks:
+        if sorted(map(id, block.predecessors)) != sorted(predecessors[id(block)]):
+            raise IRError(f"{func.name}/{block.name}: predecessores desatualizados (ver link_blocks).")
+
+    _verify_definitions(func)
+
+
+def _verify_definitions(func: IRFunction):
+    """
+    Fluxo de dados para a frente: temporárias definidas com certeza na entrada
+    de cada bloco (interseção sobre os predecessores), até o ponto fixo.
+    """
+    order = reverse_postorder(func)
+    all_temps = frozenset(range(1, func.temp_count + 1))
+    defined_in = {id(block): all_temps for block in order}
+    defined_in[id(func.entry)] = frozenset()
+    defined_out = {}
+    changed = True
+    while changed:
+        changed = False
+        for block in order:
+            if block is not func.entry:
+                incoming = [defined_out[id(p)] for p in block.predecessors if id(p) in defined_out]
+                defined_in[id(block)] = frozenset.intersection(*incoming) if incoming else all_temps
+            defined = set(defined_in[id(block)])
+            for instruction in block.instructions:
+                dest = defined_slot(instruction)
+                if type(dest) is Temp:
+                    defined.add(dest.index)
+            out = frozenset(defined)
+            if defined_out.get(id(block)) != out:
+                defined_out[id(block)] = out
+                changed = True
+
+    for block in order:
+        defined = set(defined_in[id(block)])
+        for item in block.instructions + [block.terminator]:
+            for operand in item.uses():
+                if type(operand) is Temp and operand.index not in defined:
+                    raise IRError(f"{func.name}/{block.name}: '{item}' lê {operand} antes de defini-la.")
+            dest = defined_slot(item)
+            if type(dest) is Temp:
+                defined.add(dest.index)
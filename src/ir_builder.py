@@ -0,0 +1,363 @@
+"""
+Tradução da AST anotada para a IR de três endereços (ver `ir`).
+
+O `IRBuilder` percorre uma função já analisada (e, com -O, já otimizada) e
+produz um `IRFunction`: as expressões viram instruções sobre temporárias, e o
+fluxo de controle (`if`, laços, `break`/`continue`, `and`/`or` em curto-circuito,
+chamadas recursivas de cauda) vira blocos básicos ligados pelos terminadores.
+Os blocos ficam na ordem em que o `CodeGenerator` emitiria o código de cada
+comando; os que ficam inalcançáveis (ex: depois de um `break`) são removidos.
+"""
+
+from ir import *
+from nodes import *
+from tokenization import TokenType
+from visitor import NodeVisitor
+
+_BINARY_OPS = {
+    TokenType.PLUS: "add",
+    TokenType.MINUS: "sub",
+    TokenType.STAR: "mul",
+    TokenType.SLASH: "div",
+    TokenType.LESS: "lt",
+    TokenType.GREATER: "gt",
+    TokenType.LESS_EQUAL: "le",
+    TokenType.GREATER_EQUAL: "ge",
+    TokenType.EQUAL: "eq",
+    TokenType.NOT_EQUAL: "ne",
+}
+
+_COMPOUND_ASSIGN_OPS = {
+    TokenType.PLUS_ASSIGN: "add",
+    TokenType.MINUS_ASSIGN: "sub",
+    TokenType.STAR_ASSIGN: "mul",
+    TokenType.SLASH_ASSIGN: "div",
+}
+
+_LITERAL_TYPES = {
+    NodeIntLiteral: TokenType.INT,
+    NodeFloatLiteral: TokenType.FLOAT,
+    NodeStringLiteral: TokenType.STRING,
+    NodeBoolLiteral: TokenType.BOOL,
+}
+
+
+class IRBuilder(NodeVisitor):
+    """
+    Traduz uma função por vez (`build_function`). Os métodos de visita das
+    expressões retornam o operando com o valor da expressão; os dos comandos
+    acrescentam instruções ao bloco corrente e abrem novos blocos.
+    """
+
+    def __init__(self):
+        self.func: IRFunction | None = None
+        self.current: BasicBlock | None = None
+        self.loop_targets: list[tuple[BasicBlock, BasicBlock]] = []  # (continue, break) de cada laço
+        self.block_count = 0
+        self.joined: dict[int, list[Copy]] = {}  # Valor de 'and'/'or' -> cópias de 1 e de 0 que o definem
+
+    def build_function(self, node: NodeFunctionDecl) -> IRFunction:
+        count = len(node.params)
+        params = [Var(-(count + 1) + i, param.identifier.value) for i, param in enumerate(node.params)]
+        self.func = IRFunction(name=node.name.value, params=params, frame_size=node.frame_size)
+        self.loop_targets = []
+        self.block_count = 0
+        self.joined = {}
+        self.current = BasicBlock("")
+        self._place(BasicBlock(""))
+        self._visit(node.body)
+        if self.current.terminator is None:
+            self.current.terminator = Return()
+        self.func.remove_unreachable()
+        return self.func
+
+    # --- Blocos ---
+
+    def _place(self, block: BasicBlock):
+        """
+        Numera `block`, criado antes de sua posição ser conhecida, e passa a
+        gerar nele; o bloco corrente, se ainda aberto, segue para ele.
+        """
+        self.block_count += 1
+        block.name = f"B{self.block_count}"
+        self.func.blocks.append(block)
+        if self.current.terminator is None:
+            self.current.terminator = Jump(block)
+        self.current = block
+
+    def _terminate(self, terminator):
+        """
+        Encerra o bloco corrente. O que vier depois, até o próximo bloco
+        posicionado, vai para um bloco fora da função: é inalcançável.
+        """
+        self.current.terminator = terminator
+        self.current = BasicBlock("")
+
+    def _append(self, instruction):
+        self.current.instructions.append(instruction)
+
+    def _compute(self, make_instruction) -> Temp:
+        """Acrescenta `make_instruction(temp)` com uma temporária nova como destino e retorna a temporária."""
+        temp = self.func.new_temp()
+        self._append(make_instruction(temp))
+        return temp
+
+    def _store(self, dest: Var, value: Operand):
+        """
+        `dest = value`; se `value` acabou de ser calculado, as instruções que o
+        calculam passam a escrever em `dest`.
+        """
+        instructions = self.current.instructions
+        if type(value) is Temp and instructions and defined_slot(instructions[-1]) == value:
+            instructions[-1].dest = dest
+        elif type(value) is Temp and not instructions and value.index in self.joined:
+            for copy in self.joined.pop(value.index):
+                copy.dest = dest
+        else:
+            self._append(Copy(dest, value))
+
+    def _branch(self, condition: NodeExpr, if_true: BasicBlock, if_false: BasicBlock):
+        """
+        Encerra o bloco corrente com o teste de uma condição booleana; `and`/`or`
+        e `not` viram desvios, sem calcular o valor intermediário. Usado com
+        `yield from` pelos métodos de visita. Os testes pendentes e os blocos a
+        posicionar ficam em uma pilha explícita, e só os operandos folha são
+        pedidos a `_run`.
+        """
+        pending = [(condition, if_true, if_false)]
+        while pending:
+            item = pending.pop()
+            if type(item) is BasicBlock:
+                self._place(item)
+                continue
+            condition, if_true, if_false = item
+            while type(condition) is NodeGrouping:
+                condition = condition.expression
+            condition_type = type(condition)
+            if condition_type is NodeBoolLiteral:
+                self._terminate(Jump(if_true if condition.token.type == TokenType.TRUE else if_false))
+            elif condition_type is NodeUnaryOp and condition.op.type == TokenType.NOT:
+                pending.append((condition.operand, if_false, if_true))
+            elif condition_type is NodeBinOp and condition.op.type in (TokenType.AND, TokenType.OR):
+                # Empilhados em ordem inversa: teste da esquerda, bloco da direita, teste da direita
+                right = BasicBlock("")
+                pending.append((condition.right, if_true, if_false))
+                pending.append(right)
+                if condition.op.type == TokenType.AND:
+                    pending.append((condition.left, right, if_false))
+                else:
+                    pending.append((condition.left, if_true, right))
+            else:
+                value = yield condition
+                self._terminate(Branch(value, if_true, if_false))
+
+    # --- Comandos ---
+
+    def _visit_NodeBlock(self, node: NodeBlock):
+        for statement in node.statements:
+            yield statement
+
+    def _visit_NodeDeclaration(self, node: NodeDeclaration):
+        if node.initializer_expr:
+            value = yield node.initializer_expr
+            self._store(self._var(node.symbol), value)
+
+    def _visit_NodeExprStmt(self, node: NodeExprStmt):
+        expression = node.expression
+        if type(expression) is NodeFunctionCall:
+            args = []
+            for arg in expression.args:
+                args.append((yield arg))
+            if expression.tail_call:
+                self._terminate(TailCall(args, self.func.entry))
+            else:
+                self._append(Call(None, expression.callee.value, args))
+            return
+        yield expression
+
+    def _visit_NodeIf(self, node: NodeIf):
+        then_block = BasicBlock("")
+        else_block = BasicBlock("") if node.else_branch else None
+        end_block = BasicBlock("")
+        yield from self._branch(node.condition, then_block, else_block or end_block)
+        self._place(then_block)
+        yield node.then_branch
+        if else_block is not None:
+            self._terminate(Jump(end_block))
+            self._place(else_block)
+            yield node.else_branch
+        self._place(end_block)
+
+    def _visit_NodeWhile(self, node: NodeWhile):
+        test_block = BasicBlock("")
+        body_block = BasicBlock("")
+        end_block = BasicBlock("")
+        self._place(test_block)
+        yield from self._branch(node.condition, body_block, end_block)
+        self._place(body_block)
+        self.loop_targets.append((test_block, end_block))
+        yield node.body
+        self.loop_targets.pop()
+        self._terminate(Jump(test_block))
+        self._place(end_block)
+
+    def _visit_NodeFor(self, node: NodeFor):
+        test_block = BasicBlock("")
+        body_block = BasicBlock("")
+        increment_block = BasicBlock("")
+        end_block = BasicBlock("")
+        if node.initializer:
+            yield node.initializer
+        self._place(test_block)
+        if node.condition:
+            yield from self._branch(node.condition, body_block, end_block)
+        self._place(body_block)
+        self.loop_targets.append((increment_block, end_block))
+        yield node.body
+        self.loop_targets.pop()
+        self._place(increment_block)
+        if node.increment:
+            yield node.increment
+        self._terminate(Jump(test_block))
+        self._place(end_block)
+
+    def _visit_NodeDoWhile(self, node: NodeDoWhile):
+        body_block = BasicBlock("")
+        test_block = BasicBlock("")
+        end_block = BasicBlock("")
+        self._place(body_block)
+        self.loop_targets.append((test_block, end_block))
+        yield node.body
+        self.loop_targets.pop()
+        self._place(test_block)
+        yield from self._branch(node.condition, body_block, end_block)
+        self._place(end_block)
+
+    def _visit_NodeBreak(self, node: NodeBreak):
+        if not self.loop_targets:
+            raise Exception("Break fora de um loop.")
+        self._terminate(Jump(self.loop_targets[-1][1]))
+
+    def _visit_NodeContinue(self, node: NodeContinue):
+        if not self.loop_targets:
+            raise Exception("Continue fora de um loop.")
+        self._terminate(Jump(self.loop_targets[-1][0]))
+
+    def _visit_NodeExit(self, node: NodeExit):
+        self._terminate(Exit())
+
+    def _visit_NodePrint(self, node: NodePrint):
+        for arg in node.args:
+            arg_type = self._type_of(arg)
+            if arg_type is None:
+                # Chamada sem valor: só os efeitos (ver CodeGenerator._visit_NodePrint)
+                yield NodeExprStmt(expression=arg)
+                continue
+            value = yield arg
+            self._append(Print(value, arg_type))
+
+    def _visit_NodeRead(self, node: NodeRead):
+        self._append(Read(self._var(node.symbol), node.symbol.type))
+
+    # --- Expressões ---
+
+    def _visit_NodeIntLiteral(self, node: NodeIntLiteral):
+        return Const(int(node.token.value), TokenType.INT)
+
+    def _visit_NodeFloatLiteral(self, node: NodeFloatLiteral):
+        return Const(float(node.token.value), TokenType.FLOAT)
+
+    def _visit_NodeStringLiteral(self, node: NodeStringLiteral):
+        return Const(node.token.value, TokenType.STRING)
+
+    def _visit_NodeBoolLiteral(self, node: NodeBoolLiteral):
+        return Const(1 if node.token.type == TokenType.TRUE else 0, TokenType.BOOL)
+
+    def _visit_NodeVariable(self, node: NodeVariable):
+        return self._var(node.symbol)
+
+    def _visit_NodeGrouping(self, node: NodeGrouping):
+        return (yield node.expression)
+
+    def _visit_NodeArrayAccess(self, node: NodeArrayAccess):
+        raise NotImplementedError("Acesso a array ainda não implementado no gerador de código.")
+
+    def _visit_NodeAssignment(self, node: NodeAssignment):
+        if node.array_index_expr:
+            raise NotImplementedError("Atribuição a elemento de array ainda não implementada no gerador de código.")
+        dest = self._var(node.symbol)
+        value = yield node.value
+        op = _COMPOUND_ASSIGN_OPS.get(node.op.type)
+        if op is not None:
+            value = self._compute(lambda temp: Binary(temp, op, dest, value, node.type))
+        self._store(dest, value)
+        return dest
+
+    def _visit_NodeUnaryOp(self, node: NodeUnaryOp):
+        operand = node.operand
+        while type(operand) is NodeGrouping:
+            operand = operand.expression
+        if node.op.type == TokenType.NOT and type(operand) is NodeBinOp \
+                and operand.op.type in (TokenType.AND, TokenType.OR):
+            return (yield from self._condition_value(node, operand.op.type == TokenType.AND))
+        value = yield node.operand
+        op = "neg" if node.op.type == TokenType.MINUS else "not"
+        return self._compute(lambda temp: Unary(temp, op, value, node.type))
+
+    def _visit_NodeBinOp(self, node: NodeBinOp):
+        if node.op.type in (TokenType.AND, TokenType.OR):
+            return (yield from self._condition_value(node, node.op.type == TokenType.OR))
+        left = self._converted((yield node.left), node.left, node.type)
+        right = self._converted((yield node.right), node.right, node.type)
+        return self._compute(lambda temp: Binary(temp, _BINARY_OPS[node.op.type], left, right, node.type))
+
+    def _visit_NodeFunctionCall(self, node: NodeFunctionCall):
+        args = []
+        for arg in node.args:
+            args.append((yield arg))
+        return self._compute(lambda temp: Call(temp, node.callee.value, args))
+
+    def _condition_value(self, condition: NodeExpr, decisive: bool):
+        """
+        Valor de uma condição com `and`/`or` calculada por desvios: a mesma
+        temporária recebe 1 ou 0. O bloco que recebe o valor oposto a `decisive`
+        (o do operando que não decide, como no `CodeGenerator`) vem primeiro.
+        """
+        result = self.func.new_temp()
+        copies = {True: Copy(result, Const(1, TokenType.BOOL)), False: Copy(result, Const(0, TokenType.BOOL))}
+        blocks = {True: BasicBlock(""), False: BasicBlock("")}
+        end_block = BasicBlock("")
+        yield from self._branch(condition, blocks[True], blocks[False])
+        for value in (not decisive, decisive):
+            self._place(blocks[value])
+            self._append(copies[value])
+            self._terminate(Jump(end_block))
+        self._place(end_block)
+        self.joined[result.index] = list(copies.values())
+        return result
+
+    # --- Auxiliares ---
+
+    def _converted(self, value: Operand, operand: NodeExpr, result_type: TokenType) -> Operand:
+        # Operandos inteiros de uma operação float são convertidos (ITOF)
+        if result_type == TokenType.FLOAT and self._type_of(operand) == TokenType.INT:
+            return self._compute(lambda temp: Unary(temp, "itof", value, TokenType.FLOAT))
+        return value
+
+    @staticmethod
+    def _type_of(node: NodeExpr) -> TokenType | None:
+        literal_type = _LITERAL_TYPES.get(type(node))
+        if literal_type is not None:
+            return literal_type
+        return node.type
+
+    @staticmethod
+    def _var(symbol) -> Var:
+        if symbol.offset is None:
+            raise Exception(f"Variável global '{symbol.name}' ainda não é suportada pelo gerador de código.")
+        return Var(symbol.offset, symbol.name)
+
+
+def build_function(node: NodeFunctionDecl) -> IRFunction:
+    """IR de uma função já analisada."""
+    return IRBuilder().build_function(node)
@@ -0,0 +1,274 @@
+"""
+Tradução da IR de três endereços (ver `ir`) para código SAM.
+
+Cada instrução empilha seus operandos (PUSHOFF, PUSHIMM...), executa a
+operação e guarda o resultado com STOREOFF. As temporárias que precisam de
+posição recebem uma no quadro, logo acima das variáveis locais; temporárias que
+nunca estão vivas ao mesmo tempo dividem a mesma posição.
+
+A maioria das temporárias nem chega ao quadro. Uma temporária escrita uma só
+vez e lida uma só vez, no mesmo bloco, fica na pilha quando as instruções que
+calculam os operandos de uma instrução vêm imediatamente antes dela, na ordem
+dos operandos: a instrução e essas definições formam uma árvore de expressão,
+emitida como o `CodeGenerator` a emitiria (os demais operandos, variáveis,
+constantes e temporárias do quadro, são empilhados na sua vez, entre as
+subárvores). Como as subárvores só escrevem temporárias da pilha, e uma chamada
+não altera o quadro de quem chama, antecipar essas leituras não muda o valor lido.
+
+Os blocos são emitidos na ordem da lista, com rótulos `<função>.B<n>` apenas
+para os blocos que são destino de algum desvio emitido; o desvio para o bloco
+seguinte é omitido.
+"""
+
+from ir import *
+from tokenization import TokenType
+
+# Operação: (instrução inteira, instrução float, negar o resultado)
+_BINARY_INSTRUCTIONS = {
+    "add": ("ADD", "ADDF", False),
+    "sub": ("SUB", "SUBF", False),
+    "mul": ("TIMES", "TIMESF", False),
+    "div": ("DIV", "DIVF", False),
+    "lt": ("LESS", "LESS", False),
+    "gt": ("GREATER", "GREATER", False),
+    "le": ("GREATER", "GREATER", True),
+    "ge": ("LESS", "LESS", True),
+    "eq": ("EQUAL", "EQUAL", False),
+    "ne": ("EQUAL", "EQUAL", True),
+}
+
+_WRITE_INSTRUCTIONS = {
+    TokenType.INT: "WRITE",
+    TokenType.BOOL: "WRITE",
+    TokenType.FLOAT: "WRITEF",
+    TokenType.STRING: "WRITESTR",
+}
+
+_READ_INSTRUCTIONS = {
+    TokenType.INT: "READ",
+    TokenType.BOOL: "READ",
+    TokenType.FLOAT: "READF",
+    TokenType.STRING: "READSTR",
+}
+
+
+class IRCodeGenerator:
+    """Gera o código SAM de um `IRFunction` verificado (`generate_function`), no formato do `CodeGenerator`."""
+
+    def __init__(self):
+        self.code: list[str] = []
+        self.label_prefix = ""
+        self.slots: dict[int, int] = {}  # Índice da temporária -> deslocamento no quadro
+        self.on_stack: dict[int, object] = {}  # Temporária que fica na pilha -> instrução que a calcula
+        self.referenced: set[str] = set()  # Rótulos usados por algum desvio
+
+    def generate_function(self, func: IRFunction) -> list[str]:
+        self.code = []
+        self.label_prefix = f"{func.name}."
+        self.referenced = set()
+        self._plan(func)
+        frame_size = func.frame_size + len(set(self.slots.values()))
+
+        if func.name != "main":
+            self.code.append(f"{func.name}:")
+        self.code.append("LINK")
+        if frame_size > 0:
+            self.code.append(f"ADDSP {frame_size}")
+
+        for i, block in enumerate(func.blocks):
+            following = func.blocks[i + 1] if i + 1 < len(func.blocks) else None
+            self.code.append(f"{self._label(block)}:")
+            for item in block.instructions + [block.terminator]:
+                dest = defined_slot(item)
+                if type(dest) is not Temp or dest.index not in self.on_stack:
+                    self._emit_tree(func, item, following, frame_size)
+
+        return [line for line in self.code if not line.endswith(":") or line[:-1] in self.referenced
+                or line == f"{func.name}:"]
+
+    def _label(self, block: BasicBlock) -> str:
+        return f"{self.label_prefix}{block.name}"
+
+    def _jump(self, opcode: str, block: BasicBlock):
+        label = self._label(block)
+        self.referenced.add(label)
+        self.code.append(f"{opcode} {label}")
+
+    # --- Temporárias: pilha ou quadro ---
+
+    def _plan(self, func: IRFunction):
+        """Decide quais temporárias ficam na pilha e dá posições no quadro às demais."""
+        uses: dict[int, int] = {}
+        definitions: dict[int, int] = {}
+        for block in func.blocks:
+            for item in block.instructions + [block.terminator]:
+                for operand in item.uses():
+                    if type(operand) is Temp:
+                        uses[operand.index] = uses.get(operand.index, 0) + 1
+                dest = defined_slot(item)
+                if type(dest) is Temp:
+                    definitions[dest.index] = definitions.get(dest.index, 0) + 1
+
+        # Árvores: de trás para a frente, cada operando pode ser calculado pela
+        # instrução (e sua subárvore) imediatamente anterior à subárvore do seguinte
+        self.on_stack = {}
+        for block in func.blocks:
+            items = block.instructions + [block.terminator]
+            tree_start = list(range(len(items)))
+            for position, item in enumerate(items):
+                cursor = position - 1
+                for operand in reversed(item.uses()):
+                    if type(operand) is not Temp or cursor < 0 or defined_slot(items[cursor]) != operand:
+                        continue
+                    if uses[operand.index] == 1 and definitions[operand.index] == 1:
+                        self.on_stack[operand.index] = items[cursor]
+                        cursor = tree_start[cursor] - 1
+                tree_start[position] = cursor + 1
+
+        # Demais temporárias lidas: posições no quadro; duas temporárias vivas
+        # ao mesmo tempo (ver ir.live_temps) nunca dividem a mesma posição
+        interference: dict[int, set[int]] = {index: set() for index in uses if index not in self.on_stack}
+        self.slots = {}
+        if not interference:
+            return
+        live_out = live_temps(func)
+        for block in func.blocks:
+            live = {index for index in live_out[block.name] if index in interference}
+            for item in reversed(block.instructions + [block.terminator]):
+                dest = defined_slot(item)
+                if type(dest) is Temp and dest.index in interference:
+                    for other in live:
+                        if other != dest.index:
+                            interference[dest.index].add(other)
+                            interference[other].add(dest.index)
+                    live.discard(dest.index)
+                for operand in item.uses():
+                    if type(operand) is Temp and operand.index in interference:
+                        live.add(operand.index)
+        for index in sorted(interference):
+            taken = {self.slots[other] for other in interference[index] if other in self.slots}
+            offset = func.frame_size + 1
+            while offset in taken:
+                offset += 1
+            self.slots[index] = offset
+
+    # --- Emissão ---
+
+    def _emit_tree(self, func: IRFunction, root, following: BasicBlock | None, frame_size: int):
+        """Emite `root` e, antes de cada operando que fica na pilha, a subárvore que o calcula (sem recursão)."""
+        self._emit_prefix(root)
+        pending = [(root, iter(root.uses()))]
+        while pending:
+            item, operands = pending[-1]
+            for operand in operands:
+                child = self.on_stack.get(operand.index) if type(operand) is Temp else None
+                if child is not None:
+                    self._emit_prefix(child)
+                    pending.append((child, iter(child.uses())))
+                    break
+                self._push(operand)
+            else:
+                pending.pop()
+                if item is root and type(item) in TERMINATOR_TYPES:
+                    self._emit_terminator(func, item, following, frame_size)
+                else:
+                    self._emit_operation(item)
+
+    def _emit_prefix(self, item):
+        if type(item) is Call:
+            self.code.append("PUSHIMM 0")  # Espaço para o valor de retorno
+
+    def _push(self, operand: Operand):
+        operand_type = type(operand)
+        if operand_type is Temp:
+            self.code.append(f"PUSHOFF {self.slots[operand.index]}")
+        elif operand_type is Var:
+            self.code.append(f"PUSHOFF {operand.offset}")
+        elif operand.type == TokenType.FLOAT:
+            self.code.append(f"PUSHIMMF {operand.value}")
+        elif operand.type == TokenType.STRING:
+            self.code.append(f'PUSHIMMSTR "{operand.value}"')
+        else:
+            self.code.append(f"PUSHIMM {operand.value}")
+
+    def _store(self, dest: Var | Temp):
+        """Retira o valor do topo da pilha para `dest` (ou o deixa lá, se `dest` fica na pilha)."""
+        if type(dest) is Var:
+            self.code.append(f"STOREOFF {dest.offset}")
+        elif dest.index in self.on_stack:
+            pass
+        elif dest.index in self.slots:
+            self.code.append(f"STOREOFF {self.slots[dest.index]}")
+        else:
+            self.code.append("ADDSP -1")
+
+    def _emit_operation(self, instruction):
+        """A operação de uma instrução cujos operandos já estão na pilha, e o armazenamento do resultado."""
+        instruction_type = type(instruction)
+        if instruction_type is Binary:
+            int_instruction, float_instruction, negate = _BINARY_INSTRUCTIONS[instruction.op]
+            self.code.append(float_instruction if instruction.type == TokenType.FLOAT else int_instruction)
+            if negate:
+                self.code.append("NOT")
+        elif instruction_type is Unary:
+            if instruction.op == "neg":
+                if instruction.type == TokenType.FLOAT:
+                    self.code.extend(["PUSHIMMF -1.0", "TIMESF"])
+                else:
+                    self.code.extend(["PUSHIMM -1", "TIMES"])
+            elif instruction.op == "not":
+                self.code.append("NOT")
+            else:
+                self.code.append("ITOF")
+        elif instruction_type is Call:
+            self.code.append(f"JSR {instruction.callee}")
+            if instruction.args:
+                self.code.append(f"ADDSP {-len(instruction.args)}")
+            if instruction.dest is None:
+                self.code.append("ADDSP -1")
+                return
+        elif instruction_type is Print:
+            self.code.append(_WRITE_INSTRUCTIONS[instruction.type])
+            return
+        elif instruction_type is Read:
+            self.code.append(_READ_INSTRUCTIONS[instruction.type])
+        self._store(instruction.dest)
+
+    def _emit_terminator(self, func: IRFunction, terminator, following: BasicBlock | None, frame_size: int):
+        """O terminador de um bloco, com os operandos já na pilha."""
+        terminator_type = type(terminator)
+        if terminator_type is Jump:
+            if terminator.target is not following:
+                self._jump("JUMP", terminator.target)
+        elif terminator_type is Branch:
+            if_true, if_false = terminator.if_true, terminator.if_false
+            condition = terminator.condition
+            if self.code[-1] == "NOT" and type(condition) is Temp and condition.index in self.on_stack:
+                # Condição negada calculada logo antes: desvia pelo valor sem o NOT
+                self.code.pop()
+                if_true, if_false = if_false, if_true
+            if if_true is following:
+                self.code.append("NOT")
+                self._jump("JUMPC", if_false)
+            else:
+                self._jump("JUMPC", if_true)
+                if if_false is not following:
+                    self._jump("JUMP", if_false)
+        elif terminator_type is TailCall:
+            for param in reversed(func.params):
+                self.code.append(f"STOREOFF {param.offset}")
+            self._jump("JUMP", terminator.target)
+        elif terminator_type is Exit:
+            self.code.append("EXIT")
+        elif func.name == "main":
+            if following is not None:
+                self.code.append("STOP")
+        else:
+            if frame_size > 0:
+                self.code.append(f"ADDSP {-frame_size}")
+            self.code.extend(["POPFBR", "JUMPIND"])
+
+
+def generate_function(func: IRFunction) -> list[str]:
+    """Código SAM de uma função em IR."""
+    return IRCodeGenerator().generate_function(func)
@@ -0,0 +1,116 @@
+"""
+Movimentação de código invariante de laços (LICM) sobre a AST anotada.
+
+Executada por função depois do `DeadCodeEliminator`. Em cada `while`, `for`
+e `do-while`, as subexpressões que só leem variáveis locais não escritas em
+nenhum ponto do laço (inicializador do `for`, condição, corpo e incremento) são
+calculadas uma única vez, antes do laço, em uma variável temporária com uma
+posição nova no quadro da função; a expressão vira uma leitura da temporária.
+
+Só são movidas expressões sem efeitos e que não podem falhar (ver
+`dead_code.is_pure`): como a temporária é calculada mesmo que o corpo nunca
+execute, uma divisão por uma variável, por exemplo, fica onde está. Os laços
+são tratados de fora para dentro, de modo que uma expressão invariante em
+vários laços aninhados sai de todos eles de uma vez.
+"""
+
+from constant_folder import assigned_symbols
+from dead_code import is_pure
+from nodes import *
+from symbol_table import Symbol
+from tokenization import TokenType, make_token
+from visitor import child_fields, replace_statements, walk
+
+_HOISTED_TYPES = (TokenType.INT, TokenType.FLOAT, TokenType.BOOL)
+
+_LOOPS = (NodeWhile, NodeDoWhile, NodeFor)
+
+
+class LoopInvariantMotion:
+    """Move as expressões invariantes dos laços de uma função analisada (ver o docstring do módulo)."""
+
+    def __init__(self):
+        self.hoisted = 0  # Expressões movidas para antes de um laço
+
+    def hoist_function(self, node: NodeFunctionDecl):
+        done: set[int] = set()  # Laços já tratados (continuam na árvore após a substituição)
+        replace_statements(node.body, lambda stmt: self._hoist_loop(node, stmt, done))
+
+    def _hoist_loop(self, func: NodeFunctionDecl, stmt: NodeStmt, done: set[int]) -> NodeStmt:
+        """O próprio comando ou, se ele é um laço com invariantes, um bloco com as temporárias e o laço."""
+        if type(stmt) not in _LOOPS or id(stmt) in done:
+            return stmt
+        done.add(id(stmt))
+        variant = assigned_symbols(stmt)
+        names = ("condition", "increment", "body") if type(stmt) is NodeFor else ("condition", "body")
+        declarations = []
+        for name in names:
+            root = getattr(stmt, name)
+            if root is None:
+                continue
+            if self._is_invariant(root, variant):
+                # Condição inteira invariante (ex: `while (n > 0)` sem escrita em n)
+                setattr(stmt, name, self._hoist(func, root, declarations))
+            else:
+                self._replace_invariants(func, root, variant, declarations)
+        if not declarations:
+            return stmt
+        return NodeBlock(statements=declarations + [stmt])
+
+    def _replace_invariants(self, func: NodeFunctionDecl, root: Node, variant: set[int],
+                            declarations: list[NodeDeclaration]):
+        """Troca, sob `root`, cada subexpressão invariante maximal pela leitura de uma temporária."""
+        pending = [root]
+        while pending:
+            node = pending.pop()
+            for name in child_fields(type(node)):
+                value = getattr(node, name)
+                if isinstance(value, list):
+                    for i, item in enumerate(value):
+                        if self._is_invariant(item, variant):
+                            value[i] = self._hoist(func, item, declarations)
+                        elif isinstance(item, Node):
+                            pending.append(item)
+                elif self._is_invariant(value, variant):
+                    setattr(node, name, self._hoist(func, value, declarations))
+                elif isinstance(value, Node):
+                    pending.append(value)
+
+    @staticmethod
+    def _is_invariant(expr, variant: set[int]) -> bool:
+        """
+        True se vale a pena calcular `expr` antes do laço: uma operação sobre
+        variáveis locais não escritas no laço (e literais), sem efeitos nem erros.
+        """
+        if type(expr) not in (NodeBinOp, NodeUnaryOp) or expr.type not in _HOISTED_TYPES:
+            return False
+        reads = False
+        for node in walk(expr):
+            if type(node) is NodeVariable:
+                symbol = node.symbol
+                if symbol is None or symbol.offset is None or id(symbol) in variant:
+                    return False
+                reads = True
+        # Sem variáveis a expressão é constante: se o dobramento não a
+        # eliminou, ela falha em tempo de execução (ex: 1 / 0)
+        return reads and is_pure(expr)
+
+    def _hoist(self, func: NodeFunctionDecl, expr: NodeExpr, declarations: list[NodeDeclaration]) -> NodeVariable:
+        """Declara uma temporária com o valor de `expr` em `declarations` e retorna sua leitura."""
+        self.hoisted += 1
+        declarations.append(declare_temporary(func, expr, "$inv"))
+        return read_temporary(declarations[-1])
+
+
+def declare_temporary(func: NodeFunctionDecl, value: NodeExpr, prefix: str) -> NodeDeclaration:
+    """Declaração de uma temporária inicializada com `value`, em uma posição nova no quadro de `func`."""
+    func.frame_size += 1
+    # O nome começa por '$' (início de comentário na linguagem): não colide com variáveis do programa
+    identifier = make_token(TokenType.VARIABLE, f"{prefix}{func.frame_size}")
+    symbol = Symbol(name_id=identifier.name_id, type=value.type, offset=func.frame_size)
+    return NodeDeclaration(var_type=make_token(value.type), identifier=identifier,
+                           initializer_expr=value, symbol=symbol)
+
+
+def read_temporary(declaration: NodeDeclaration) -> NodeVariable:
+    return NodeVariable(token=declaration.identifier, symbol=declaration.symbol, type=declaration.symbol.type)
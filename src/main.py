@@ -1,65 +1,183 @@
 # main.py
 
+import argparse
 import os
-from tokenization import Tokenizer
+from tokenization import Tokenizer, tokenize_parallel
+from mmap_lexer import MappedTokenizer
 from parser import Parser
 from ast_printer import ASTPrinter
-from semantic_analyzer import SemanticAnalyzer, SemanticError
-from code_generator import CodeGenerator
-
-# --- Leitura do Arquivo ---
-try:
-    with open("C:\\development\\pessoal\\compilador\\code\\test.tt", "r") as file:
-        content = file.read()
-except FileNotFoundError:
-    print("Arquivo 'test.tt' não encontrado.")
-    content = ""
-
-# --- Processo de Compilação ---
-if content:
+from semantic_analyzer import SemanticError
+from driver import OptimizationReport, compile_program, reachable_program
+from incremental import IncrementalCompiler, state_key
+from inliner import load_profile
+import compile_cache
+
+DEFAULT_SOURCE = "C:\\development\\pessoal\\compilador\\code\\test.tt"
+DEFAULT_OUTPUT = "C:\\development\\pessoal\\compilador\\file\\output.sam"
+
+
+def parse_args():
+    arg_parser = argparse.ArgumentParser(description="Compilador da linguagem .tt para código SAM.")
+    arg_parser.add_argument("source", nargs="?", default=DEFAULT_SOURCE, help="arquivo fonte .tt")
+    arg_parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="arquivo .sam de saída")
+    arg_parser.add_argument("-j", "--jobs", type=int, default=1,
+                            help="processos usados na análise léxica e na compilação das funções (0 = todos os núcleos)")
+    arg_parser.add_argument("--mmap", action="store_true",
+                            help="mapeia o arquivo em memória e tokeniza os bytes sem copiá-los")
+    arg_parser.add_argument("--lazy", action="store_true",
+                            help="analisa e gera apenas as funções alcançáveis a partir de main")
+    arg_parser.add_argument("-O", "--optimize", action="store_true",
+                            help="aplica as otimizações (expansão em linha, constantes, código morto, peephole)")
+    arg_parser.add_argument("--inline-profile", metavar="ARQUIVO",
+                            help="perfil JSON de chamadas por função (SAMVM.save_call_counts de uma execução compilada sem -O): "
+                                 "com -O, só as funções chamadas ao menos --inline-threshold vezes são expandidas")
+    arg_parser.add_argument("--inline-threshold", type=int, default=1, metavar="N",
+                            help="chamadas mínimas no perfil para expandir uma função (padrão: 1)")
+    arg_parser.add_argument("--ir", action="store_true",
+                            help="gera o código passando pela representação intermediária de três endereços "
+                                 "(blocos básicos e grafo de fluxo de controle) e imprime sua listagem")
+    arg_parser.add_argument("--no-cache", action="store_true",
+                            help="não consulta nem grava o cache de compilação (nem os trechos da compilação incremental)")
+    arg_parser.add_argument("--cache-dir", default=compile_cache.DEFAULT_CACHE_DIR,
+                            help="diretório do cache de compilação")
+    return arg_parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    # --- Leitura do Arquivo ---
+    # Com --mmap o conteúdo não é lido para uma str: o lexer varre o mapeamento.
+    mapped = None
     try:
-        # Etapa 1: Análise Léxica
-        print("--- ANÁLISE LÉXICA ---")
-        tokenizer = Tokenizer(content)
-        tokens = tokenizer.tokenizer()
-        print("Análise léxica concluída. Tokens gerados.")
-
-        # Etapa 2: Análise Sintática
-        print("\n--- ANÁLISE SINTÁTICA ---")
-        parser = Parser(tokens)
-        ast = parser.parse()
-        print("Análise sintática concluída. AST gerada.")
-        
-        # Etapa 3: Análise Semântica
-        print("\n--- ANÁLISE SEMÂNTICA ---")
-        semantic_analyzer = SemanticAnalyzer()
-        semantic_analyzer.analyze(ast)
-        print("Análise semântica concluída com sucesso!")
-
-        # Etapa 4: Imprimir a AST (opcional, para visualização)
-        print("\n--- ÁRVORE DE SINTAXE ABSTRATA (AST) ---")
-        printer = ASTPrinter()
-        printer.print(ast)
-        print("------------------------------------------")
-
-        # Etapa 5: Geração de Código
-        print("\n--- GERAÇÃO DE CÓDIGO ---")
-        code_generator = CodeGenerator()
-        sam_code = code_generator.generate(ast)
-
-        output_filename = "C:\\development\\pessoal\\compilador\\file\\output.sam"
-        with open(output_filename, "w") as f:
-            f.write(sam_code)
-        
-        print(f"Geração de código concluída. Código SAM salvo em '{output_filename}'.")
-        print("--- CÓDIGO SAM GERADO ---")
-        print(sam_code)
-
-    except RuntimeError as e:
-        print(f"Erro léxico: {e}")
-    except SyntaxError as e:
-        print(f"Erro de sintaxe: {e}")
-    except SemanticError as e:
-        print(f"{e}")
-    except Exception as e:
-        print(f"Erro inesperado: {e}")
\ No newline at end of file
+        if args.mmap:
+            mapped = MappedTokenizer(args.source)
+            content = mapped.source
+        else:
+            with open(args.source, "r") as file:
+                content = file.read()
+    except FileNotFoundError:
+        print(f"Arquivo '{os.path.basename(args.source)}' não encontrado.")
+        content = ""
+
+    # --- Processo de Compilação ---
+    if content:
+        try:
+            profile = load_profile(args.inline_profile) if args.optimize and args.inline_profile else None
+
+            # Etapa 0: Cache de compilação, consultado antes da análise léxica.
+            # Opções que alteram o código gerado devem entrar na chave.
+            cached = None
+            if not args.no_cache:
+                source_bytes = content if args.mmap else content.encode("utf-8")
+                cache_key = compile_cache.cache_key(source_bytes, options={
+                    "lazy": args.lazy, "optimize": args.optimize,
+                    "inline_profile": sorted(profile.items()) if profile else None,
+                    "inline_threshold": args.inline_threshold, "ir": args.ir,
+                })
+                cached = compile_cache.load(cache_key, args.cache_dir)
+
+            if cached is not None:
+                ast, sam_code = cached
+                print("--- CACHE DE COMPILAÇÃO ---")
+                print(f"Compilação reaproveitada do cache ({cache_key[:12]}).")
+            else:
+                # Sem opções que mudem a geração, a compilação é incremental: os
+                # trechos do fonte gravados pela última execução que não mudaram
+                # são reaproveitados (ver `incremental`)
+                incremental = not (args.no_cache or args.optimize or args.ir or args.lazy
+                                   or args.mmap or args.jobs != 1)
+                if incremental:
+                    print("--- COMPILAÇÃO INCREMENTAL ---")
+                    state = state_key(args.source)
+                    compiler = IncrementalCompiler.load(state, args.cache_dir)
+                    sam_code = compiler.compile(content)
+                    ast = compiler.program
+                    stats = compiler.stats
+                    print(f"{stats['chunks']} trecho(s): {stats['parsed']} analisado(s) de novo, "
+                          f"{stats['reused']} função(ões) reaproveitada(s), {stats['recompiled']} recompilada(s).")
+                    try:
+                        compiler.save(state, args.cache_dir)
+                    except OSError:
+                        pass  # Cache indisponível (ex: diretório somente leitura): segue sem ele
+                else:
+                    # Etapa 1: Análise Léxica
+                    print("--- ANÁLISE LÉXICA ---")
+                    if args.mmap:
+                        tokens = mapped.tokenizer()
+                    elif args.jobs == 1:
+                        tokenizer = Tokenizer(content)
+                        tokens = tokenizer.tokenizer()
+                    else:
+                        tokens = tokenize_parallel(content, workers=args.jobs or None)
+                    print("Análise léxica concluída. Tokens gerados.")
+
+                    # Etapa 2: Análise Sintática
+                    print("\n--- ANÁLISE SINTÁTICA ---")
+                    parser = Parser(tokens)
+                    ast = parser.parse(lazy=args.lazy)
+                    if args.lazy:
+                        # Só os corpos das funções alcançáveis a partir de main são analisados
+                        ast = reachable_program(ast, parser)
+                    print("Análise sintática concluída. AST gerada.")
+
+                    # Etapa 3: Análise Semântica e Geração de Código (por função, em paralelo com -j)
+                    print("\n--- ANÁLISE SEMÂNTICA E GERAÇÃO DE CÓDIGO ---")
+                    report = OptimizationReport()
+                    ir_listing = []
+                    sam_code = compile_program(ast, workers=args.jobs or None, optimize=args.optimize,
+                                               report=report, profile=profile,
+                                               hot_threshold=args.inline_threshold,
+                                               ir=args.ir, ir_listing=ir_listing)
+                    print("Análise semântica concluída com sucesso!")
+                    if args.ir:
+                        print("\n--- REPRESENTAÇÃO INTERMEDIÁRIA ---")
+                        print("\n\n".join(ir_listing))
+                    if args.optimize:
+                        print("\n--- OTIMIZAÇÕES ---")
+                        for warning in report.warnings:
+                            print(warning)
+                        for name, count in sorted(report.inlined.items()):
+                            print(f"Inlining de '{name}': {count} chamada(s) expandida(s)")
+                        for rule, count in sorted(report.rewrites.items()):
+                            print(f"Peephole '{rule}': {count} reescrita(s)")
+
+                if not args.no_cache:
+                    try:
+                        compile_cache.store(cache_key, ast, sam_code, args.cache_dir)
+                    except OSError:
+                        pass  # Cache indisponível (ex: diretório somente leitura): segue sem ele
+
+            # Etapa 4: Imprimir a AST (opcional, para visualização)
+            print("\n--- ÁRVORE DE SINTAXE ABSTRATA (AST) ---")
+            printer = ASTPrinter()
+            printer.print(ast)
+            print("------------------------------------------")
+
+            # Etapa 5: Gravação do Código
+            output_filename = args.output
+            with open(output_filename, "w") as f:
+                f.write(sam_code)
+
+            print(f"Geração de código concluída. Código SAM salvo em '{output_filename}'.")
+            print("--- CÓDIGO SAM GERADO ---")
+            print(sam_code)
+
+        except RecursionError:
+            # Subclasse de RuntimeError: não é um erro léxico
+            print("Erro: programa aninhado demais para ser compilado.")
+        except RuntimeError as e:
+            print(f"Erro léxico: {e}")
+        except SyntaxError as e:
+            print(f"Erro de sintaxe: {e}")
+        except SemanticError as e:
+            print(f"{e}")
+        except Exception as e:
+            print(f"Erro inesperado: {e}")
+
+    if mapped is not None:
+        mapped.close()  # Tokens e chave do cache já não dependem do mapeamento
+
+
+if __name__ == "__main__":
+    main()
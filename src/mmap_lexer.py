@@ -0,0 +1,152 @@
+import mmap
+import re
+import sys
+from array import array
+
+from tokenization import OPERATORS, RESERVED_KEYWORDS, TOKEN_TYPES, Token, TokenType, make_token
+
+# Grupos do padrão mestre, na ordem em que aparecem na expressão regular.
+_SKIP, _IDENT, _NUMBER, _STRING, _UNTERMINATED, _OPERATOR = range(1, 7)
+
+_MASTER = re.compile(
+    rb"(\s+|\$[^\n]*)"                      # espaços e comentários
+    rb"|([A-Za-z_\x80-\xff][A-Za-z0-9_\x80-\xff]*)"  # identificadores e palavras reservadas
+    rb"|([0-9]+(?:\.[0-9]*)?)"              # literais inteiros e float
+    rb'|"([^"]*)"'                          # literais string
+    rb'|(")'                                # string não terminada
+    rb"|(==|>=|<=|!=|\+=|-=|\*=|/=|[-+*/=():,;{}\[\]<>])"  # operadores
+)
+
+_TYPE_INDEX = {t: i for i, t in enumerate(TOKEN_TYPES)}
+_KEYWORD_INDEX = {kw.encode(): _TYPE_INDEX[t] for kw, t in RESERVED_KEYWORDS.items()}
+_OPERATOR_INDEX = {op.encode(): _TYPE_INDEX[t] for op, t in OPERATORS.items()}
+_VARIABLE = _TYPE_INDEX[TokenType.VARIABLE]
+_INT_LIT = _TYPE_INDEX[TokenType.INT_LIT]
+_FLOAT_LIT = _TYPE_INDEX[TokenType.FLOAT_LIT]
+_STRING_LIT = _TYPE_INDEX[TokenType.STRING_LIT]
+
+
+class TokenIndex:
+    """
+    Tokens armazenados como vetores paralelos: tipo, início e fim de cada lexema
+    no buffer de origem, e o índice do valor na tabela de strings internadas
+    (-1 quando o token não tem valor). Implementa o protocolo de sequência, de
+    modo que pode ser passado diretamente ao `Parser`; os objetos `Token` são
+    obtidos sob demanda do pool compartilhado (`make_token`).
+    """
+
+    def __init__(self, source, offset_type: str):
+        self.source = source
+        self.kinds = array("B")
+        self.starts = array(offset_type)
+        self.ends = array(offset_type)
+        self.value_ids = array("i")
+        self.values: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __getitem__(self, i: int) -> Token:
+        value_id = self.value_ids[i]
+        return make_token(TOKEN_TYPES[self.kinds[i]], self.values[value_id] if value_id >= 0 else None)
+
+    def span(self, i: int) -> tuple[int, int]:
+        """Retorna o intervalo (início, fim) do lexema i no arquivo."""
+        return self.starts[i], self.ends[i]
+
+    def lexeme(self, i: int) -> bytes:
+        return bytes(self.source[self.starts[i]:self.ends[i]])
+
+    def tokens(self) -> list[Token]:
+        """Materializa todos os tokens (equivalente a `Tokenizer.tokenizer()`)."""
+        return [self[i] for i in range(len(self))]
+
+    def index_size_in_bytes(self) -> int:
+        arrays = (self.kinds, self.starts, self.ends, self.value_ids)
+        return sum(a.itemsize * len(a) for a in arrays)
+
+
+class MappedTokenizer:
+    """
+    Analisador léxico que mapeia o arquivo fonte em memória (mmap) e o varre
+    como bytes, sem copiar o conteúdo para uma `str`. Apenas identificadores e
+    literais viram strings, e cada valor distinto é internado uma única vez.
+    Produz os mesmos tokens que `Tokenizer`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self.source = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.source = b""  # Arquivos vazios não podem ser mapeados
+
+    def close(self):
+        if isinstance(self.source, mmap.mmap):
+            self.source.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def tokenizer(self) -> TokenIndex:
+        source = self.source
+        index = TokenIndex(source, "I" if len(source) < (1 << 32) else "Q")
+        kinds, starts, ends, value_ids = index.kinds, index.starts, index.ends, index.value_ids
+        values = index.values
+        interned: dict[tuple[int, bytes], int] = {}
+
+        def intern(kind: int, raw: bytes, text: str) -> int:
+            key = (kind, raw)
+            value_id = interned.get(key)
+            if value_id is None:
+                value_id = interned[key] = len(values)
+                values.append(sys.intern(text))
+            return value_id
+
+        pos = 0
+        end = len(source)
+        match = _MASTER.match
+        while pos < end:
+            m = match(source, pos)
+            if m is None:
+                char = bytes(source[pos:pos + 4]).decode("utf-8", errors="replace")[0]
+                raise RuntimeError("Unexpected character: " + char)
+            group = m.lastindex
+            start, pos = m.span()
+            if group == _SKIP:
+                continue
+            if group == _IDENT:
+                raw = m.group(_IDENT)
+                kind = _KEYWORD_INDEX.get(raw.lower())
+                if kind is not None:
+                    value_id = -1
+                else:
+                    kind = _VARIABLE
+                    value_id = intern(kind, raw, raw.decode("utf-8").lower())
+            elif group == _NUMBER:
+                raw = m.group(_NUMBER)
+                if b"." in raw:
+                    kind = _FLOAT_LIT
+                    value_id = intern(kind, raw, raw.decode("ascii") + "0")
+                else:
+                    kind = _INT_LIT
+                    value_id = intern(kind, raw, raw.decode("ascii"))
+            elif group == _STRING:
+                kind = _STRING_LIT
+                raw = m.group(_STRING)
+                value_id = intern(kind, raw, raw.decode("utf-8"))
+            elif group == _OPERATOR:
+                kind = _OPERATOR_INDEX[m.group(_OPERATOR)]
+                value_id = -1
+            else:
+                raise RuntimeError("String não terminada. Esperado '\"'.")
+            kinds.append(kind)
+            starts.append(start)
+            ends.append(pos)
+            value_ids.append(value_id)
+        return index
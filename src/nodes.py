@@ -1,142 +1,178 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Union, Optional
 from abc import ABC
-from tokenization import Token 
+from symbol_table import Symbol
+from tokenization import Token, TokenType
+
+def annotation(default=None):
+    """
+    Campo preenchido depois da construção do nó, em geral pela análise semântica
+    (símbolo resolvido, tipo estático, tamanho do quadro). Não é um filho do nó,
+    não participa de comparações e não aparece no repr.
+    """
+    return field(default=default, compare=False, repr=False, metadata={"annotation": True})
 
 class Node(ABC):
-    """Nó base para todos os nós da AST."""
-    pass
+    """
+    Nó base para todos os nós da AST.
+    Todos os nós usam __slots__ (sem __dict__ por instância) para reduzir a
+    memória ocupada por ASTs grandes.
+    """
+    __slots__ = ()
+
+    def __reduce__(self):
+        # Serializa (pickle, deepcopy) pelo construtor, com os campos na ordem
+        # de declaração: bem mais rápido que o __getstate__/__setstate__
+        # gerados pelo dataclass para classes com __slots__.
+        return type(self), tuple(getattr(self, name) for name in self.__slots__)
 
 class NodeStmt(Node):
     """Nó base para todas as declarações (statements)."""
-    pass
+    __slots__ = ()
 
 class NodeExpr(Node):
     """Nó base para todas as expressões."""
-    pass
+    __slots__ = ()
 
-@dataclass
+@dataclass(slots=True)
 class NodeIntLiteral(NodeExpr):
     token: Token
 
-@dataclass
+@dataclass(slots=True)
 class NodeFloatLiteral(NodeExpr):
     token: Token
 
-@dataclass
+@dataclass(slots=True)
 class NodeStringLiteral(NodeExpr):
     token: Token
 
-@dataclass
+@dataclass(slots=True)
 class NodeBoolLiteral(NodeExpr):
     token: Token
 
-@dataclass
+@dataclass(slots=True)
 class NodeVariable(NodeExpr):
     token: Token
+    symbol: Optional[Symbol] = annotation()
+    type: Optional[TokenType] = annotation()
 
-@dataclass
+@dataclass(slots=True)
 class NodeArrayAccess(NodeExpr):
     identifier: Token
     index_expr: NodeExpr
+    symbol: Optional[Symbol] = annotation()
+    type: Optional[TokenType] = annotation()
     
-@dataclass
+@dataclass(slots=True)
 class NodeBinOp(NodeExpr):
     left: NodeExpr
     op: Token
     right: NodeExpr
+    type: Optional[TokenType] = annotation()
 
-@dataclass
+@dataclass(slots=True)
 class NodeUnaryOp(NodeExpr):
     op: Token
     operand: NodeExpr
+    type: Optional[TokenType] = annotation()
 
-@dataclass
+@dataclass(slots=True)
 class NodeGrouping(NodeExpr):
     expression: NodeExpr
+    type: Optional[TokenType] = annotation()
 
-@dataclass
+@dataclass(slots=True)
 class NodeFunctionCall(NodeExpr):
     callee: Token
     args: List[NodeExpr]
+    symbol: Optional[Symbol] = annotation()
+    type: Optional[TokenType] = annotation()
+    tail_call: bool = annotation(False) # Chamada recursiva em posição de cauda (ver tail_calls)
 
-@dataclass
+@dataclass(slots=True)
 class NodeProgram(Node):
     global_declarations: List[Union['NodeFunctionDecl', 'NodeDeclaration']]
 
-@dataclass
+@dataclass(slots=True)
 class NodeBlock(NodeStmt):
     statements: List[NodeStmt]
 
-@dataclass
+@dataclass(slots=True)
 class NodeParam(Node):
     param_type: Token
     identifier: Token
 
-@dataclass
+@dataclass(slots=True)
 class NodeFunctionDecl(NodeStmt):
     name: Token
     params: List[NodeParam]
-    body: NodeBlock
+    body: Optional[NodeBlock] # None enquanto o corpo não foi analisado (Parser.parse(lazy=True))
+    frame_size: int = annotation(0) # Número de variáveis locais do quadro
+    body_span: Optional[tuple[int, int]] = annotation() # Tokens [início, fim) do corpo ainda não analisado
+    returns: bool = annotation(True) # False se o fim do corpo é inalcançável (ex: termina em 'exit')
 
-@dataclass
+@dataclass(slots=True)
 class NodeDeclaration(NodeStmt):
     var_type: Token
     identifier: Token
     array_size: Optional[NodeIntLiteral] = None
     initializer_expr: Optional[NodeExpr] = None
+    symbol: Optional[Symbol] = annotation()
 
-@dataclass
+@dataclass(slots=True)
 class NodeAssignment(NodeExpr):
     identifier: Token
     value: NodeExpr
     op: Token # '=', '+=', '-=', etc.
     array_index_expr: Optional[NodeExpr] = None # Para atribuição em array: id[expr] = ...
+    symbol: Optional[Symbol] = annotation()
+    type: Optional[TokenType] = annotation()
 
-@dataclass
+@dataclass(slots=True)
 class NodeIf(NodeStmt):
     condition: NodeExpr
     then_branch: NodeStmt
     else_branch: Optional[NodeStmt] = None
 
-@dataclass
+@dataclass(slots=True)
 class NodeWhile(NodeStmt):
     condition: NodeExpr
     body: NodeStmt
 
-@dataclass
+@dataclass(slots=True)
 class NodeDoWhile(NodeStmt):
     body: NodeStmt
     condition: NodeExpr
 
-@dataclass
+@dataclass(slots=True)
 class NodeFor(NodeStmt):
     initializer: Optional[Union[NodeAssignment, NodeExpr]]
     condition: Optional[NodeExpr]
     increment: Optional[Union[NodeAssignment, NodeExpr]]
     body: NodeStmt
 
-@dataclass
+@dataclass(slots=True)
 class NodePrint(NodeStmt):
     args: List[NodeExpr]
 
-@dataclass
+@dataclass(slots=True)
 class NodeRead(NodeStmt):
     identifier: Token
+    symbol: Optional[Symbol] = annotation()
 
-@dataclass
+@dataclass(slots=True)
 class NodeExit(NodeStmt):
     pass
 
-@dataclass
+@dataclass(slots=True)
 class NodeBreak(NodeStmt):
     pass
 
-@dataclass
+@dataclass(slots=True)
 class NodeContinue(NodeStmt):
     pass
 
-@dataclass
+@dataclass(slots=True)
 class NodeExprStmt(NodeStmt):
     """Wrapper para uma expressão usada como statement (ex: uma chamada de função)."""
     expression: NodeExpr
\ No newline at end of file
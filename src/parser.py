@@ -8,6 +8,7 @@ class Parser:
     def __init__(self, tokens: List[Token]):
         self.tokens = tokens
         self.pos = 0
+        self.lazy = False
 
     def _peek(self, offset: int = 0) -> Token:
         if self.pos + offset >= len(self.tokens):
@@ -37,12 +38,65 @@ class Parser:
             return self._advance()
         raise SyntaxError(f"Erro de sintaxe: {message}. Esperado '{t_type.name}', mas encontrou '{self._current().type.name}'.")
 
-    def parse(self) -> NodeProgram:
+    def parse(self, lazy: bool = False) -> NodeProgram:
+        """
+        Com lazy=True os corpos das funções não são analisados: o parser apenas
+        os percorre casando chaves e guarda o intervalo de tokens em `body_span`
+        (com `body` = None). `parse_function_body` completa uma função depois.
+        """
+        self.lazy = lazy
         declarations = []
         while not self._is_at_end():
             declarations.append(self._parse_global_declaration())
         return NodeProgram(global_declarations=declarations)
 
+    def parse_function_body(self, func: NodeFunctionDecl) -> NodeBlock:
+        """Analisa o corpo de uma função lida em modo preguiçoso."""
+        if func.body is None:
+            start, _ = func.body_span
+            saved_pos = self.pos
+            self.pos = start
+            try:
+                func.body = self._parse_block()
+            finally:
+                self.pos = saved_pos
+            func.body_span = None
+        return func.body
+
+    def function_callees(self, func: NodeFunctionDecl) -> set[int]:
+        """
+        Ids dos nomes chamados no corpo de uma função ainda não analisada: no
+        corpo, um identificador seguido de '(' só pode ser uma chamada.
+        """
+        start, end = func.body_span
+        tokens = self.tokens
+        callees = set()
+        for i in range(start, end - 1):
+            token = tokens[i]
+            if token.type is TokenType.VARIABLE and tokens[i + 1].type is TokenType.LPAREN:
+                callees.add(token.name_id)
+        return callees
+
+    def _skip_function_body(self) -> tuple[int, int]:
+        """
+        Avança sobre o corpo de uma função (logo após a '{') casando chaves e
+        retorna o intervalo [início, fim) dos seus tokens, incluindo a '}' final.
+        """
+        tokens = self.tokens
+        start = pos = self.pos
+        depth = 1
+        while pos < len(tokens):
+            token_type = tokens[pos].type
+            if token_type is TokenType.LBRACE:
+                depth += 1
+            elif token_type is TokenType.RBRACE:
+                depth -= 1
+                if depth == 0:
+                    self.pos = pos + 1
+                    return start, pos + 1
+            pos += 1
+        raise SyntaxError("Erro de sintaxe: Esperado '}' para fechar o corpo da função.")
+
     def _parse_global_declaration(self) -> Union[NodeFunctionDecl, NodeDeclaration]:
         if self._peek(0).type == TokenType.FUNC and self._peek(1).type == TokenType.VARIABLE:
             return self._parse_function_decl()
@@ -85,6 +139,8 @@ class Parser:
         params = self._parse_param_list()
         self._consume(TokenType.RPAREN, "Esperado ')' após a lista de parâmetros")
         self._consume(TokenType.LBRACE, "Esperado '{' antes do corpo da função")
+        if self.lazy:
+            return NodeFunctionDecl(name=name, params=params, body=None, body_span=self._skip_function_body())
         body = self._parse_block()
         return NodeFunctionDecl(name=name, params=params, body=body)
 
@@ -0,0 +1,321 @@
+"""
+Otimizador peephole sobre o código SAM de uma função.
+
+As regras ficam em `PEEPHOLE_RULES`: cada uma tem um nome, um padrão (uma
+janela de instruções consecutivas) e uma função que recebe as capturas do
+padrão e retorna as instruções que substituem a janela, ou None quando a
+regra não se aplica. Os elementos do padrão são escritos como as próprias
+instruções:
+
+    "ADDSP $n"   opcode fixo, operando capturado em `n`
+    "NOT"        opcode fixo, sem operando
+    "$op $x?"    qualquer instrução (não rótulo): opcode em `op`, operando
+                 opcional em `x` (None se ausente)
+    "$l:"        um rótulo, com o nome capturado em `l`
+
+A passagem percorre o código tentando as regras em cada posição e, após uma
+substituição, recua o suficiente para que janelas que passaram a existir
+sejam examinadas; o processo se repete até nenhuma regra se aplicar. Regras
+que precisam do código todo (destino de um desvio, rótulos não referenciados)
+consultam o `PeepholeContext` recebido junto com as capturas.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable
+
+# Instruções após as quais a execução nunca segue para a próxima linha
+UNCONDITIONAL = {"JUMP", "JUMPIND", "EXIT", "STOP"}
+
+# Instruções que apenas empilham um valor, sem outros efeitos
+PUSHES = {"PUSHIMM", "PUSHIMMF", "PUSHOFF"}
+
+# Comparações: sempre empilham 0 ou 1
+COMPARISONS = {"LESS", "GREATER", "EQUAL"}
+
+BRANCHES = {"JUMP", "JUMPC"}
+
+
+def split_instruction(line: str) -> tuple[str, str | None, bool]:
+    """(opcode ou nome do rótulo, operando, é rótulo)."""
+    if line.endswith(":"):
+        return line[:-1], None, True
+    opcode, _, operand = line.partition(" ")
+    return opcode, operand or None, False
+
+
+class PeepholeContext:
+    """
+    Informações sobre o código inteiro da função. Os destinos dos rótulos são
+    calculados no início de cada passagem: as reescritas preservam o efeito de
+    desviar para cada rótulo, então eles continuam válidos durante a passagem.
+    A contagem de referências é mantida exata a cada reescrita.
+    """
+
+    def __init__(self, code: list[str], local_prefix: str):
+        self.local_prefix = local_prefix
+        self.references: dict[str, int] = {}
+        self.labels: set[str] = set()
+        self._targets: dict[str, str] = {}
+        following = None
+        for line in reversed(code):
+            name, operand, is_label = split_instruction(line)
+            if is_label:
+                self.labels.add(name)
+                if following is not None:
+                    self._targets[name] = following
+            else:
+                following = line
+                if operand is not None and name in BRANCHES:
+                    self.references[operand] = self.references.get(operand, 0) + 1
+
+    def target(self, label: str) -> str | None:
+        """Primeira instrução (não rótulo) executada ao desviar para `label`."""
+        return self._targets.get(label)
+
+    def is_unused(self, label: str) -> bool:
+        # Apenas rótulos internos da função: os das funções são alvo de JSR
+        return label.startswith(self.local_prefix) and not self.references.get(label)
+
+    def update(self, removed: list[tuple], added: list[tuple]):
+        """Atualiza referências e rótulos existentes após uma reescrita."""
+        for instructions, delta in ((removed, -1), (added, 1)):
+            for name, operand, is_label in instructions:
+                if is_label:
+                    if delta > 0:
+                        self.labels.add(name)
+                    else:
+                        self.labels.discard(name)
+                elif operand is not None and name in BRANCHES:
+                    self.references[operand] = self.references.get(operand, 0) + delta
+
+
+@dataclass(frozen=True)
+class PeepholeRule:
+    name: str
+    pattern: tuple[str, ...]
+    rewrite: Callable[[dict, PeepholeContext], list[str] | None]
+
+
+def _merge_addsp(c, ctx):
+    n = int(c["a"]) + int(c["b"])
+    return [f"ADDSP {n}"] if n else []
+
+
+def _discard_push(c, ctx):
+    # Valor empilhado e descartado em seguida (ex: resultado de um comando de expressão)
+    if c["op"] not in PUSHES or int(c["n"]) >= 0:
+        return None
+    n = int(c["n"]) + 1
+    return [f"ADDSP {n}"] if n else []
+
+
+def _thread_jump(c, ctx):
+    # Desvio para um rótulo cuja primeira instrução é outro JUMP: segue a
+    # cadeia até o destino final (nada muda se ela formar um ciclo)
+    label = c["l"]
+    seen = {label}
+    while True:
+        target = ctx.target(label)
+        if target is None:
+            break
+        opcode, operand, _ = split_instruction(target)
+        if opcode != "JUMP":
+            break
+        if operand in seen:
+            return None
+        seen.add(operand)
+        label = operand
+    if label == c["l"] or label not in ctx.labels:
+        return None
+    return [f"{c['op']} {label}"]
+
+
+def _shift_amount(value: str) -> int | None:
+    """k se `value` é 2**k (k >= 0), senão None."""
+    n = int(value)
+    return n.bit_length() - 1 if n > 0 and n & (n - 1) == 0 else None
+
+
+def _times_power_of_two(c, ctx):
+    # Multiplicação inteira por 2**k: LSHIFT k, ou nada para k = 0
+    # (com o outro fator entre os dois, se ele é só um valor empilhado)
+    k = _shift_amount(c["n"])
+    if k is None or c.get("op", "PUSHIMM") not in PUSHES:
+        return None
+    pushed = [f"{c['op']} {c['x']}"] if "op" in c else []
+    return pushed + ([f"LSHIFT {k}"] if k else [])
+
+
+def _constant_branch(c, ctx):
+    return [f"JUMP {c['l']}"] if int(c["v"]) != 0 else []
+
+
+def _drop_after_unconditional(c, ctx):
+    return [f"{c['j']} {c['l']}" if c["l"] is not None else c["j"]] if c["j"] in UNCONDITIONAL else None
+
+
+def _double_not(c, ctx):
+    return [c["op"]] if c["op"] in COMPARISONS else None
+
+
+PEEPHOLE_RULES = [
+    PeepholeRule("addsp-zero", ("ADDSP 0",), lambda c, ctx: []),
+    PeepholeRule("addsp-merge", ("ADDSP $a", "ADDSP $b"), _merge_addsp),
+    PeepholeRule("push-discard", ("$op $x?", "ADDSP $n"), _discard_push),
+    PeepholeRule("jump-to-next", ("JUMP $l", "$l:"), lambda c, ctx: [f"{c['l']}:"]),
+    PeepholeRule("jump-thread", ("$op $l",),
+                 lambda c, ctx: _thread_jump(c, ctx) if c["op"] in BRANCHES else None),
+    PeepholeRule("branch-invert", ("NOT", "JUMPC $a", "JUMP $b", "$a:"),
+                 lambda c, ctx: [f"JUMPC {c['b']}", f"{c['a']}:"]),
+    PeepholeRule("not-not-branch", ("NOT", "NOT", "JUMPC $l"), lambda c, ctx: [f"JUMPC {c['l']}"]),
+    PeepholeRule("not-not-compare", ("$op", "NOT", "NOT"), _double_not),
+    PeepholeRule("constant-not", ("PUSHIMM $v", "NOT"),
+                 lambda c, ctx: [f"PUSHIMM {0 if int(c['v']) != 0 else 1}"]),
+    PeepholeRule("constant-branch", ("PUSHIMM $v", "JUMPC $l"), _constant_branch),
+    PeepholeRule("add-zero", ("PUSHIMM 0", "$op"),
+                 lambda c, ctx: [] if c["op"] in ("ADD", "SUB") else None),
+    PeepholeRule("times-power-of-two", ("PUSHIMM $n", "TIMES"), _times_power_of_two),
+    PeepholeRule("times-power-of-two", ("PUSHIMM $n", "$op $x", "TIMES"), _times_power_of_two),
+    PeepholeRule("unreachable", ("$j $l?", "$op $x?"), _drop_after_unconditional),
+    PeepholeRule("unused-label", ("$l:",), lambda c, ctx: [] if ctx.is_unused(c["l"]) else None),
+]
+
+
+def _compile_element(element: str) -> tuple:
+    """(é rótulo, opcode fixo ou None, variável do opcode, modo do operando, valor)."""
+    if element.endswith(":"):
+        return True, None, element[1:-1], _ABSENT, None
+    opcode, _, operand = element.partition(" ")
+    opcode_var = opcode[1:] if opcode.startswith("$") else None
+    opcode = None if opcode_var else opcode
+    if not operand:
+        return False, opcode, opcode_var, _ABSENT, None
+    if operand.startswith("$"):
+        optional = operand.endswith("?")
+        return False, opcode, opcode_var, _OPTIONAL if optional else _CAPTURE, operand[1:].rstrip("?")
+    return False, opcode, opcode_var, _LITERAL, operand
+
+
+# Modos do operando de um elemento do padrão
+_ABSENT, _LITERAL, _CAPTURE, _OPTIONAL = range(4)
+
+
+def _match(pattern: tuple, window: list[tuple]) -> dict | None:
+    """Capturas do padrão (já compilado) sobre a janela, ou None se não casar."""
+    captures = {}
+    for (label_element, opcode, opcode_var, mode, value), (name, operand, is_label) in zip(pattern, window):
+        if label_element != is_label:
+            return None
+        if label_element:
+            if not _bind(captures, opcode_var, name):
+                return None
+            continue
+        if opcode is not None:
+            if opcode != name:
+                return None
+        elif not _bind(captures, opcode_var, name):
+            return None
+        if mode == _ABSENT:
+            if operand is not None:
+                return None
+        elif mode == _LITERAL:
+            if operand != value:
+                return None
+        elif operand is None and mode == _CAPTURE:
+            return None
+        elif not _bind(captures, value, operand):
+            return None
+    return captures
+
+
+def _may_match(element: tuple, key: str | None) -> bool:
+    """Teste rápido de um elemento compilado contra o opcode (ou ':') de uma instrução."""
+    if key is None:
+        return False
+    label_element, opcode = element[0], element[1]
+    if label_element:
+        return key == ":"
+    return key != ":" and opcode in (None, key)
+
+
+def _bind(captures: dict, name: str, value) -> bool:
+    # Uma variável repetida no padrão exige o mesmo valor (ex: "JUMP $l", "$l:")
+    if name in captures:
+        return captures[name] == value
+    captures[name] = value
+    return True
+
+
+@lru_cache(maxsize=None)
+def _rule_table(rules: tuple[PeepholeRule, ...]) -> tuple[list, dict]:
+    """Padrões compilados e cache de candidatas, compartilhados pelos otimizadores com as mesmas regras."""
+    return [(rule, tuple(_compile_element(e) for e in rule.pattern)) for rule in rules], {}
+
+
+class PeepholeOptimizer:
+    """Aplica `rules` ao código de uma função até um ponto fixo; `counts` conta as reescritas por regra."""
+
+    def __init__(self, rules: list[PeepholeRule] = PEEPHOLE_RULES):
+        self.rules = rules
+        self.counts: dict[str, int] = {}
+        self._window = max(len(rule.pattern) for rule in rules)
+        self._compiled, self._candidates = _rule_table(tuple(rules))
+
+    def _rules_for(self, key: tuple) -> list:
+        """
+        Regras cujos dois primeiros elementos podem casar com as instruções de
+        `key` (opcode, ou ':' para um rótulo, e o mesmo para a instrução seguinte,
+        None no fim do código), na ordem da tabela.
+        """
+        candidates = self._candidates.get(key)
+        if candidates is None:
+            candidates = self._candidates[key] = [
+                (rule, pattern) for rule, pattern in self._compiled
+                if all(_may_match(element, k) for element, k in zip(pattern, key))
+            ]
+        return candidates
+
+    def optimize(self, code: list[str], local_prefix: str = "") -> list[str]:
+        """Retorna o código otimizado. `local_prefix` identifica os rótulos internos da função."""
+        code = list(code)
+        changed = True
+        while changed:
+            changed = False
+            context = PeepholeContext(code, local_prefix)
+            parsed = [split_instruction(line) for line in code]
+            i = 0
+            while i < len(code):
+                if self._apply_at(code, parsed, i, context):
+                    changed = True
+                    i = max(0, i - self._window + 1)
+                else:
+                    i += 1
+        return code
+
+    def _apply_at(self, code, parsed, i, context) -> bool:
+        name, _, is_label = parsed[i]
+        key = (":" if is_label else name,)
+        if i + 1 < len(parsed):
+            name, _, is_label = parsed[i + 1]
+            key += (":" if is_label else name,)
+        else:
+            key += (None,)
+        for rule, pattern in self._rules_for(key):
+            size = len(pattern)
+            window = parsed[i:i + size]
+            if len(window) < size:
+                continue
+            captures = _match(pattern, window)
+            if captures is None:
+                continue
+            replacement = rule.rewrite(captures, context)
+            if replacement is None:
+                continue
+            new_parsed = [split_instruction(line) for line in replacement]
+            context.update(window, new_parsed)
+            code[i:i + size] = replacement
+            parsed[i:i + size] = new_parsed
+            self.counts[rule.name] = self.counts.get(rule.name, 0) + 1
+            return True
+        return False
@@ -3,14 +3,23 @@
 from nodes import *
 from symbol_table import Symbol, SymbolTable
 from tokenization import TokenType
+from visitor import NodeVisitor
 
 class SemanticError(Exception):
     """Exceção customizada para erros semânticos."""
     pass
 
-class SemanticAnalyzer:
-    def __init__(self):
-        self.symbol_table = SymbolTable()
+class SemanticAnalyzer(NodeVisitor):
+    """
+    A análise ocorre em duas fases. `declare_globals` registra as assinaturas de
+    todas as funções e as variáveis globais (o que permite chamar uma função
+    declarada mais adiante), e `analyze_function` verifica o corpo de uma função.
+    Depois da primeira fase os corpos são independentes entre si, de modo que a
+    segunda pode ser executada em paralelo (ver `driver.py`) a partir do estado
+    global exportado por `global_state`.
+    """
+    def __init__(self, symbol_table: SymbolTable | None = None, function_params: dict | None = None):
+        self.symbol_table = symbol_table if symbol_table is not None else SymbolTable()
         self.literal_to_type = {
             TokenType.INT_LIT: TokenType.INT,
             TokenType.FLOAT_LIT: TokenType.FLOAT,
@@ -19,58 +28,62 @@ class SemanticAnalyzer:
             TokenType.FALSE: TokenType.BOOL,
         }
         self.loop_depth = 0
-        self.function_params = {}  # Dicionário para armazenar os tipos de parâmetros das funções
+        # Tipos dos parâmetros de cada função, indexados pelo id do nome
+        self.function_params = function_params if function_params is not None else {}
+        self.current_function = None # Função sendo analisada (None no escopo global)
+        self.frame_size = 0 # Variáveis locais alocadas no quadro da função atual
 
     def analyze(self, program_node: NodeProgram):
-        self._visit_NodeProgram(program_node)
-
-    def _visit(self, node: Node) -> TokenType | None:
-        if isinstance(node, Node):
-            method_name = f'_visit_{type(node).__name__}'
-            visitor_method = getattr(self, method_name, self._generic_visit)
-            return visitor_method(node)
-        return None
-
-    def _generic_visit(self, node: Node):
-        for field, value in vars(node).items():
-            if isinstance(value, list):
-                for item in value:
-                    self._visit(item)
-            elif isinstance(value, Node):
-                self._visit(value)
-    
-    # --- Métodos de Visita Específicos ---
+        self.declare_globals(program_node)
+        for decl in program_node.global_declarations:
+            if isinstance(decl, NodeFunctionDecl):
+                self.analyze_function(decl)
+
+    def declare_globals(self, program_node: NodeProgram):
+        """Fase 1: define as funções (com os tipos dos parâmetros) e as variáveis globais."""
+        for decl in program_node.global_declarations:
+            if isinstance(decl, NodeFunctionDecl):
+                func_id = decl.name.name_id
+                self.function_params[func_id] = [p.param_type.type for p in decl.params]
+                self.symbol_table.define(Symbol(name_id=func_id, type=TokenType.FUNC))
+            else:
+                self._visit(decl)
+
+    def global_state(self) -> tuple[SymbolTable, dict]:
+        """Estado produzido pela fase 1, usado para construir analisadores por função."""
+        return self.symbol_table, self.function_params
+
+    def analyze_function(self, node: NodeFunctionDecl):
+        """Fase 2: analisa o corpo de uma função e anota seus nós."""
+        self._visit(node)
 
-    def _visit_NodeProgram(self, node: NodeProgram):
-        for decl in node.global_declarations:
-            self._visit(decl)
+    # --- Métodos de Visita Específicos ---
 
     def _visit_NodeFunctionDecl(self, node: NodeFunctionDecl):
-        func_name = node.name.value
-        param_types = [p.param_type.type for p in node.params]
-        
-        self.function_params[func_name] = param_types
-        
-        func_symbol = Symbol(name=func_name, type=TokenType.FUNC)
-        self.symbol_table.define(func_symbol)
-
+        # Quadro da função: após a chamada e o LINK, os parâmetros ficam em
+        # FBR-(n+1) .. FBR-2 (abaixo do endereço de retorno) e as variáveis
+        # locais em FBR+1 .. FBR+frame_size.
+        self.current_function = node
+        self.frame_size = 0
         self.symbol_table.push_scope()
-        for param in node.params:
-            self._visit_NodeParam(param)
+        first_param_offset = -(len(node.params) + 1)
+        for i, param in enumerate(node.params):
+            self._visit_NodeParam(param, first_param_offset + i)
         
-        self._visit_NodeBlock(node.body)
+        yield node.body
         self.symbol_table.pop_scope()
+        node.frame_size = self.frame_size
+        self.current_function = None
 
-    def _visit_NodeParam(self, node: NodeParam):
-        param_name = node.identifier.value
+    def _visit_NodeParam(self, node: NodeParam, offset: int):
         param_type = node.param_type.type
-        param_symbol = Symbol(name=param_name, type=param_type)
+        param_symbol = Symbol(name_id=node.identifier.name_id, type=param_type, offset=offset)
         self.symbol_table.define(param_symbol)
 
     def _visit_NodeBlock(self, node: NodeBlock):
         self.symbol_table.push_scope()
         for statement in node.statements:
-            self._visit(statement)
+            yield statement
         self.symbol_table.pop_scope()
 
     def _visit_NodeDeclaration(self, node: NodeDeclaration):
@@ -82,58 +95,66 @@ class SemanticAnalyzer:
                 raise SemanticError("Erro: O tamanho do array deve ser um literal inteiro.")
 
         if node.initializer_expr:
-            expr_type = self._visit(node.initializer_expr)
+            expr_type = yield node.initializer_expr
             if var_type != expr_type:
                 raise SemanticError(f"Erro: Incompatibilidade de tipos. Não é possível atribuir tipo '{expr_type.name}' à variável '{var_name}' do tipo '{var_type.name}'.")
 
-        symbol = Symbol(name=var_name, type=var_type)
+        offset = None # Variáveis globais não ocupam o quadro de nenhuma função
+        if self.current_function is not None:
+            self.frame_size += 1
+            offset = self.frame_size
+        symbol = Symbol(name_id=node.identifier.name_id, type=var_type, offset=offset)
         self.symbol_table.define(symbol)
+        node.symbol = symbol
         
     def _visit_NodeAssignment(self, node: NodeAssignment):
         if node.array_index_expr:
             var_name = node.identifier.value
-            symbol = self.symbol_table.lookup(var_name)
+            symbol = self.symbol_table.lookup(node.identifier.name_id)
             if not symbol:
                 raise SemanticError(f"Erro: Array '{var_name}' não foi declarado.")
             
-            index_type = self._visit(node.array_index_expr)
+            index_type = yield node.array_index_expr
             if index_type != TokenType.INT:
                 raise SemanticError(f"Erro: O índice do array '{var_name}' deve ser do tipo 'int', mas obteve '{index_type.name}'.")
 
-            expr_type = self._visit(node.value)
+            expr_type = yield node.value
             if symbol.type != expr_type:
                 raise SemanticError(f"Erro: Incompatibilidade de tipos na atribuição ao elemento do array '{var_name}'. Esperado '{symbol.type.name}', mas obteve '{expr_type.name}'.")
         else:
             # Atribuição a uma variável simples
             var_name = node.identifier.value
-            symbol = self.symbol_table.lookup(var_name)
+            symbol = self.symbol_table.lookup(node.identifier.name_id)
             if not symbol:
                 raise SemanticError(f"Erro: Variável '{var_name}' não foi declarada.")
             
-            expr_type = self._visit(node.value)
+            expr_type = yield node.value
             if symbol.type != expr_type:
                 raise SemanticError(f"Erro: Incompatibilidade de tipos na atribuição à variável '{var_name}'. Esperado '{symbol.type.name}', mas obteve '{expr_type.name}'.")
 
+        node.symbol = symbol
+        node.type = symbol.type # Tipo do destino; a atribuição em si não produz valor
+
     def _visit_NodeIf(self, node: NodeIf):
-        condition_type = self._visit(node.condition)
+        condition_type = yield node.condition
         if condition_type != TokenType.BOOL:
             raise SemanticError(f"Erro: A condição do 'if' deve ser do tipo booleano, mas é do tipo '{condition_type.name}'.")
-        self._visit(node.then_branch)
+        yield node.then_branch
         if node.else_branch:
-            self._visit(node.else_branch)
+            yield node.else_branch
 
     def _visit_NodeWhile(self, node: NodeWhile):
         self.loop_depth += 1
-        condition_type = self._visit(node.condition)
+        condition_type = yield node.condition
         if condition_type != TokenType.BOOL:
             raise SemanticError(f"Erro: A condição do 'while' deve ser do tipo booleano, mas é do tipo '{condition_type.name}'.")
-        self._visit(node.body)
+        yield node.body
         self.loop_depth -= 1
 
     def _visit_NodeDoWhile(self, node: NodeDoWhile):
         self.loop_depth += 1
-        self._visit(node.body)
-        condition_type = self._visit(node.condition)
+        yield node.body
+        condition_type = yield node.condition
         if condition_type != TokenType.BOOL:
             raise SemanticError(f"Erro: A condição do 'do-while' deve ser do tipo booleano, mas é do tipo '{condition_type.name}'.")
         self.loop_depth -= 1
@@ -142,26 +163,26 @@ class SemanticAnalyzer:
         self.loop_depth += 1
         self.symbol_table.push_scope()
         if node.initializer:
-            self._visit(node.initializer)
+            yield node.initializer
         if node.condition:
-            condition_type = self._visit(node.condition)
+            condition_type = yield node.condition
             if condition_type != TokenType.BOOL:
                 raise SemanticError(f"Erro: A condição do 'for' deve ser do tipo booleano, mas é do tipo '{condition_type.name}'.")
         if node.increment:
-            self._visit(node.increment)
-        self._visit(node.body)
+            yield node.increment
+        yield node.body
         self.symbol_table.pop_scope()
         self.loop_depth -= 1
 
     def _visit_NodePrint(self, node: NodePrint):
         for arg in node.args:
-            self._visit(arg)
+            yield arg
 
     def _visit_NodeRead(self, node: NodeRead):
-        var_name = node.identifier.value
-        symbol = self.symbol_table.lookup(var_name)
+        symbol = self.symbol_table.lookup(node.identifier.name_id)
         if not symbol:
-            raise SemanticError(f"Erro: Variável '{var_name}' não foi declarada.")
+            raise SemanticError(f"Erro: Variável '{node.identifier.value}' não foi declarada.")
+        node.symbol = symbol
 
     def _visit_NodeExit(self, node: NodeExit):
         pass
@@ -175,11 +196,11 @@ class SemanticAnalyzer:
             raise SemanticError("Erro: 'continue' statement fora de um loop.")
 
     def _visit_NodeExprStmt(self, node: NodeExprStmt):
-        self._visit(node.expression)
+        yield node.expression
 
     def _visit_NodeBinOp(self, node: NodeBinOp) -> TokenType:
-        left_type = self._visit(node.left)
-        right_type = self._visit(node.right)
+        left_type = yield node.left
+        right_type = yield node.right
 
         op = node.op.type
         numeric_types = [TokenType.INT, TokenType.FLOAT]
@@ -188,40 +209,46 @@ class SemanticAnalyzer:
             if left_type not in numeric_types or right_type not in numeric_types:
                 raise SemanticError(f"Erro: Operação aritmética '{op.name}' requer operandos numéricos, mas obteve '{left_type.name}' e '{right_type.name}'.")
             if left_type == TokenType.FLOAT or right_type == TokenType.FLOAT:
-                return TokenType.FLOAT
-            return TokenType.INT
+                node.type = TokenType.FLOAT
+            else:
+                node.type = TokenType.INT
+            return node.type
         
         if op in [TokenType.GREATER, TokenType.LESS, TokenType.GREATER_EQUAL, TokenType.LESS_EQUAL, TokenType.EQUAL, TokenType.NOT_EQUAL]:
             if left_type not in numeric_types or right_type not in numeric_types:
                  raise SemanticError(f"Erro: Operação de comparação '{op.name}' requer operandos numéricos, mas obteve '{left_type.name}' e '{right_type.name}'.")
-            return TokenType.BOOL
+            node.type = TokenType.BOOL
+            return node.type
         
         if op in [TokenType.AND, TokenType.OR]:
             if left_type != TokenType.BOOL or right_type != TokenType.BOOL:
                 raise SemanticError(f"Erro: Operação lógica '{op.name}' requer operandos booleanos, mas obteve '{left_type.name}' e '{right_type.name}'.")
-            return TokenType.BOOL
+            node.type = TokenType.BOOL
+            return node.type
         
         raise SemanticError(f"Operador binário desconhecido ou não suportado: {op.name}")
 
     def _visit_NodeUnaryOp(self, node: NodeUnaryOp) -> TokenType:
-        operand_type = self._visit(node.operand)
+        operand_type = yield node.operand
         op = node.op.type
 
         if op == TokenType.MINUS:
             if operand_type not in [TokenType.INT, TokenType.FLOAT]:
                 raise SemanticError(f"Erro: O operador unário '-' requer um operando numérico, mas obteve '{operand_type.name}'.")
-            return operand_type
+            node.type = operand_type
+            return node.type
         
         if op == TokenType.NOT:
             if operand_type != TokenType.BOOL:
                 raise SemanticError(f"Erro: O operador 'not' requer um operando booleano, mas obteve '{operand_type.name}'.")
-            return TokenType.BOOL
+            node.type = TokenType.BOOL
+            return node.type
         
         raise SemanticError(f"Operador unário desconhecido ou não suportado: {op.name}")
 
     def _visit_NodeFunctionCall(self, node: NodeFunctionCall) -> TokenType:
         callee_name = node.callee.value
-        func_symbol = self.symbol_table.lookup(callee_name)
+        func_symbol = self.symbol_table.lookup(node.callee.name_id)
         
         if not func_symbol:
             raise SemanticError(f"Erro: Função '{callee_name}' não foi declarada.")
@@ -230,38 +257,46 @@ class SemanticAnalyzer:
             raise SemanticError(f"Erro: '{callee_name}' não é uma função.")
 
         # Obtém os tipos dos parâmetros do dicionário
-        expected_param_types = self.function_params.get(callee_name, [])
+        expected_param_types = self.function_params.get(node.callee.name_id, [])
 
         if len(node.args) != len(expected_param_types):
             raise SemanticError(f"Erro: Número incorreto de argumentos para a função '{callee_name}'. Esperado {len(expected_param_types)}, mas obteve {len(node.args)}.")
 
         for i, arg in enumerate(node.args):
-            arg_type = self._visit(arg)
+            arg_type = yield arg
             expected_type = expected_param_types[i]
             if arg_type != expected_type:
                 raise SemanticError(f"Erro: Tipo de argumento incorreto na chamada de '{callee_name}'. O argumento {i+1} deve ser do tipo '{expected_type.name}', mas é do tipo '{arg_type.name}'.")
         
-        return None 
+        node.symbol = func_symbol
+        return None # Funções não retornam valor: a chamada não tem tipo
 
     def _visit_NodeVariable(self, node: NodeVariable) -> TokenType:
-        var_name = node.token.value
-        symbol = self.symbol_table.lookup(var_name)
+        symbol = self.symbol_table.lookup(node.token.name_id)
         if not symbol:
-            raise SemanticError(f"Erro: Variável '{var_name}' não foi declarada antes de seu uso.")
+            raise SemanticError(f"Erro: Variável '{node.token.value}' não foi declarada antes de seu uso.")
+        node.symbol = symbol
+        node.type = symbol.type
         return symbol.type
     
     def _visit_NodeArrayAccess(self, node: NodeArrayAccess) -> TokenType:
         array_name = node.identifier.value
-        symbol = self.symbol_table.lookup(array_name)
+        symbol = self.symbol_table.lookup(node.identifier.name_id)
         if not symbol:
             raise SemanticError(f"Erro: Array '{array_name}' não foi declarado.")
         
-        index_type = self._visit(node.index_expr)
+        index_type = yield node.index_expr
         if index_type != TokenType.INT:
             raise SemanticError(f"Erro: O índice do array '{array_name}' deve ser do tipo 'int', mas obteve '{index_type.name}'.")
         
+        node.symbol = symbol
+        node.type = symbol.type
         return symbol.type
 
+    def _visit_NodeGrouping(self, node: NodeGrouping) -> TokenType:
+        node.type = yield node.expression
+        return node.type
+
     def _visit_NodeIntLiteral(self, node: NodeIntLiteral) -> TokenType:
         return TokenType.INT
 
@@ -0,0 +1,287 @@
+"""
+Simplificação algébrica e redução de força sobre a AST anotada.
+
+Executada por função depois da movimentação de invariantes (`loop_invariants`),
+quando os multiplicadores invariantes de um laço já estão em temporárias:
+
+- identidades: `x * 1`, `1 * x`, `x + 0`, `0 + x` e `x - 0` viram `x`, e
+  `x * 0` (inteiro, com `x` sem efeitos) vira `0`. Em float só as que preservam
+  o resultado exato (`x * 1.0`, `x - 0.0`, `x / 1.0`): `-0.0 + 0.0` é `0.0`;
+- negação: `a + -b` vira `a - b` e `a - -b` vira `a + b`. `-x` isolado fica
+  como está: na SAMVM `0 - x` (PUSHIMM, PUSHOFF, SUB) custa as mesmas três
+  instruções que `x * -1`;
+- variáveis de indução: em um `for` cujo incremento é `i = i ± c` (ou `i += c`,
+  `i -= c`) e que não escreve `i` em outro lugar, os produtos `i * k` com `k`
+  inteiro invariante viram uma temporária calculada antes do laço e somada de
+  `c * k` ao fim de cada iteração. Cada uso passa de três instruções
+  (PUSHOFF i, PUSHIMM k, TIMES) para uma (PUSHOFF t), mas a soma custa quatro
+  por iteração: os produtos de um mesmo `k` só são reduzidos se aparecem mais
+  de duas vezes no laço (os de laços internos já foram levados para fora deles
+  pela movimentação de invariantes). Multiplicadores potência de dois ficam
+  como estão: o `PeepholeOptimizer` já os troca por `LSHIFT`. Laços com
+  `continue` (que pularia a soma) não são alterados.
+"""
+
+from constant_folder import assigned_symbols, constant_value, make_literal
+from dead_code import is_pure, loop_jumps
+from loop_invariants import declare_temporary, read_temporary
+from nodes import *
+from tokenization import TokenType, make_token
+from visitor import child_fields, replace_statements, walk
+
+_ARITHMETIC_TYPES = (TokenType.INT, TokenType.FLOAT)
+
+_LITERAL_TYPES = {NodeIntLiteral: TokenType.INT, NodeFloatLiteral: TokenType.FLOAT}
+
+# Instruções por iteração: economizadas em cada uso de `i * k` reduzido (3 => 1)
+# e gastas na soma `t = t + c * k` (PUSHOFF, PUSHIMM/PUSHOFF, ADD, STOREOFF)
+_USE_SAVING = 2
+_UPDATE_COST = 4
+
+
+def _type_of(expr: NodeExpr) -> TokenType | None:
+    return _LITERAL_TYPES.get(type(expr)) or getattr(expr, "type", None)
+
+
+def _is_value(expr: NodeExpr, value) -> bool:
+    """True se `expr` é um literal numérico igual a `value` (int ou float, conforme o literal)."""
+    constant = constant_value(expr)
+    return type(expr) in _LITERAL_TYPES and constant == value
+
+
+def _is_power_of_two(value: int) -> bool:
+    return value > 1 and value & (value - 1) == 0
+
+
+def _binary(left: NodeExpr, op: TokenType, right: NodeExpr, result_type: TokenType) -> NodeBinOp:
+    return NodeBinOp(left=left, op=make_token(op), right=right, type=result_type)
+
+
+def simplify(expr: NodeExpr) -> NodeExpr:
+    """Aplica as identidades e as regras de negação a um nó cujos filhos já foram simplificados."""
+    node_type = type(expr)
+    if node_type is not NodeBinOp or expr.type not in _ARITHMETIC_TYPES:
+        return expr
+
+    op = expr.op.type
+    left, right = expr.left, expr.right
+    # Identidades só quando o operando mantido já tem o tipo do resultado (sem ITOF)
+    keep_left = _type_of(left) == expr.type
+    keep_right = _type_of(right) == expr.type
+    if expr.type == TokenType.INT:
+        if op == TokenType.STAR:
+            if _is_value(right, 1) and keep_left:
+                return left
+            if _is_value(left, 1) and keep_right:
+                return right
+            if (_is_value(right, 0) and is_pure(left)) or (_is_value(left, 0) and is_pure(right)):
+                return make_literal(0, TokenType.INT)
+        elif op == TokenType.PLUS:
+            if _is_value(right, 0) and keep_left:
+                return left
+            if _is_value(left, 0) and keep_right:
+                return right
+        elif op == TokenType.MINUS and _is_value(right, 0) and keep_left:
+            return left
+    else:
+        if op in (TokenType.STAR, TokenType.SLASH) and _is_value(right, 1.0) and keep_left:
+            return left
+        if op == TokenType.STAR and _is_value(left, 1.0) and keep_right:
+            return right
+        if op == TokenType.MINUS and _is_value(right, 0.0) and keep_left:
+            return left
+
+    # a + -b => a - b, a - -b => a + b (o mesmo resultado também em float)
+    if op in (TokenType.PLUS, TokenType.MINUS):
+        negated = _negated_operand(right)
+        if negated is not None and _type_of(negated) == _type_of(right):
+            flipped = TokenType.MINUS if op == TokenType.PLUS else TokenType.PLUS
+            return _binary(left, flipped, negated, expr.type)
+    return expr
+
+
+def _negated_operand(expr: NodeExpr) -> NodeExpr | None:
+    """`x` se `expr` é `-x` (ou `0 - x`), senão None."""
+    if type(expr) is NodeUnaryOp and expr.op.type == TokenType.MINUS:
+        return expr.operand
+    if type(expr) is NodeBinOp and expr.op.type == TokenType.MINUS and type(expr.left) is NodeIntLiteral \
+            and constant_value(expr.left) == 0:
+        return expr.right
+    return None
+
+
+def _step(increment, symbol) -> int | None:
+    """Passo `c` de um incremento `i = i + c`, `i = c + i`, `i = i - c`, `i += c` ou `i -= c`, senão None."""
+    if type(increment) is not NodeAssignment or increment.symbol is not symbol \
+            or increment.array_index_expr is not None:
+        return None
+    value = increment.value
+    op = increment.op.type
+    if op in (TokenType.PLUS_ASSIGN, TokenType.MINUS_ASSIGN):
+        if type(value) is not NodeIntLiteral:
+            return None
+        step = constant_value(value)
+        return step if op == TokenType.PLUS_ASSIGN else -step
+    if op != TokenType.ASSIGN or type(value) is not NodeBinOp:
+        return None
+    left, right = value.left, value.right
+    if value.op.type == TokenType.MINUS and _reads(left, symbol) and type(right) is NodeIntLiteral:
+        return -constant_value(right)
+    if value.op.type == TokenType.PLUS:
+        if _reads(left, symbol) and type(right) is NodeIntLiteral:
+            return constant_value(right)
+        if _reads(right, symbol) and type(left) is NodeIntLiteral:
+            return constant_value(left)
+    return None
+
+
+def _reads(expr: NodeExpr, symbol) -> bool:
+    return type(expr) is NodeVariable and expr.symbol is symbol
+
+
+class StrengthReducer:
+    """Simplificação algébrica e redução de força em uma função analisada (ver o docstring do módulo)."""
+
+    def __init__(self):
+        self.simplified = 0  # Expressões simplificadas
+        self.reduced = 0  # Produtos de variáveis de indução trocados por somas
+
+    def reduce_function(self, node: NodeFunctionDecl):
+        self._simplify_tree(node.body)
+        done: set[int] = set()
+        replace_statements(node.body, lambda stmt: self._reduce_loop(node, stmt, done))
+
+    def _simplify_tree(self, root: Node):
+        """Simplifica as expressões sob `root`, dos filhos para os pais (sem recursão)."""
+        pending = [(root, False)]
+        while pending:
+            node, children_done = pending.pop()
+            if not children_done:
+                pending.append((node, True))
+                for name in child_fields(type(node)):
+                    value = getattr(node, name)
+                    if isinstance(value, list):
+                        pending.extend((item, False) for item in value if isinstance(item, Node))
+                    elif isinstance(value, Node):
+                        pending.append((value, False))
+                continue
+            for name in child_fields(type(node)):
+                value = getattr(node, name)
+                if isinstance(value, list):
+                    for i, item in enumerate(value):
+                        if isinstance(item, NodeExpr):
+                            value[i] = self._simplified(item)
+                elif isinstance(value, NodeExpr):
+                    setattr(node, name, self._simplified(value))
+
+    def _simplified(self, expr: NodeExpr) -> NodeExpr:
+        # Uma regra pode produzir um nó ao qual outra se aplica (ex: a - (0 - b) => a + b)
+        while True:
+            result = simplify(expr)
+            if result is expr:
+                return expr
+            self.simplified += 1
+            expr = result
+
+    # --- Variáveis de indução ---
+
+    def _reduce_loop(self, func: NodeFunctionDecl, stmt: NodeStmt, done: set[int]) -> NodeStmt:
+        if type(stmt) is not NodeFor or id(stmt) in done:
+            return stmt
+        done.add(id(stmt))
+        increment = stmt.increment
+        if type(increment) is not NodeAssignment or increment.symbol is None \
+                or increment.symbol.type != TokenType.INT or increment.symbol.offset is None:
+            return stmt
+        induction = increment.symbol
+        step = _step(increment, induction)
+        if not step or loop_jumps(stmt.body, (NodeContinue,)):
+            return stmt
+        roots = [root for root in (stmt.condition, stmt.body) if root is not None]
+        if id(induction) in assigned_symbols(*roots):
+            return stmt
+        variant = assigned_symbols(stmt)
+
+        # Multiplicador -> produtos i * k; os produtos iguais compartilham a temporária
+        groups: dict[object, list] = {}
+        for root in roots:
+            for found in self._products(root, induction, variant):
+                multiplier = found[-1]
+                key = id(multiplier.symbol) if type(multiplier) is NodeVariable else constant_value(multiplier)
+                groups.setdefault(key, []).append(found)
+
+        declarations = []
+        updates = []
+        for products in groups.values():
+            # Só compensa se os usos economizam mais do que a soma custa a cada iteração
+            if _USE_SAVING * len(products) <= _UPDATE_COST:
+                continue
+            _, _, _, product, multiplier = products[0]
+            declaration = self._induction_temporary(func, product, multiplier, step, declarations, updates)
+            for parent, name, index, _, _ in products:
+                replacement = read_temporary(declaration)
+                if index is None:
+                    setattr(parent, name, replacement)
+                else:
+                    getattr(parent, name)[index] = replacement
+                self.reduced += 1
+        if not updates:
+            return stmt
+
+        # O inicializador passa para antes das temporárias, que dependem do valor inicial de i
+        statements = []
+        if isinstance(stmt.initializer, NodeStmt):
+            statements.append(stmt.initializer)
+        elif stmt.initializer is not None:
+            statements.append(NodeExprStmt(expression=stmt.initializer))
+        stmt.initializer = None
+        stmt.body = NodeBlock(statements=[stmt.body] + updates)
+        return NodeBlock(statements=statements + declarations + [stmt])
+
+    @staticmethod
+    def _products(root: Node, induction, variant: set[int]):
+        """(pai, campo, índice na lista ou None, produto, multiplicador) de cada `i * k` a reduzir sob `root`."""
+        found = []
+        for parent in walk(root):
+            for name in child_fields(type(parent)):
+                value = getattr(parent, name)
+                items = enumerate(value) if isinstance(value, list) else [(None, value)]
+                for index, item in items:
+                    if type(item) is not NodeBinOp or item.op.type != TokenType.STAR or item.type != TokenType.INT:
+                        continue
+                    if _reads(item.left, induction):
+                        multiplier = item.right
+                    elif _reads(item.right, induction):
+                        multiplier = item.left
+                    else:
+                        continue
+                    if type(multiplier) is NodeIntLiteral:
+                        if _is_power_of_two(abs(constant_value(multiplier))):
+                            continue  # Vira LSHIFT no peephole
+                    elif type(multiplier) is not NodeVariable or multiplier.symbol is None \
+                            or multiplier.symbol.type != TokenType.INT or multiplier.symbol.offset is None \
+                            or id(multiplier.symbol) in variant:
+                        continue
+                    found.append((parent, name, index, item, multiplier))
+        return found
+
+    def _induction_temporary(self, func: NodeFunctionDecl, product: NodeBinOp, multiplier: NodeExpr,
+                             step: int, declarations: list, updates: list) -> NodeDeclaration:
+        """Declara t = i * k e acrescenta a `updates` a soma t = t + c * k do fim de cada iteração."""
+        declaration = declare_temporary(func, product, "$iv")
+        declarations.append(declaration)
+        if type(multiplier) is NodeIntLiteral:
+            increment = make_literal(step * constant_value(multiplier), TokenType.INT)
+        elif step in (1, -1):
+            increment = multiplier
+        else:
+            step_declaration = declare_temporary(
+                func, _binary(make_literal(step, TokenType.INT), TokenType.STAR, multiplier, TokenType.INT), "$iv")
+            declarations.append(step_declaration)
+            increment = read_temporary(step_declaration)
+        op = TokenType.MINUS if step == -1 and type(multiplier) is NodeVariable else TokenType.PLUS
+        value = _binary(read_temporary(declaration), op, increment, TokenType.INT)
+        updates.append(NodeExprStmt(expression=NodeAssignment(
+            identifier=declaration.identifier, value=value, op=make_token(TokenType.ASSIGN),
+            symbol=declaration.symbol, type=TokenType.INT)))
+        return declaration
@@ -1,28 +1,51 @@
 from dataclasses import dataclass
-from tokenization import TokenType
+from tokenization import NAME_TABLE, TokenType
 
 @dataclass
 class Symbol:
     """Representa um identificador (variável, função, etc.) no código."""
-    name: str
+    name_id: int # Id do nome em NAME_TABLE
     type: TokenType # ex: TokenType.INT, TokenType.STRING
+    offset: int | None = None # Posição relativa ao FBR (usada pelo gerador de código)
+
+    @property
+    def name(self) -> str:
+        """Nome original do símbolo (para mensagens de erro e rótulos)."""
+        return NAME_TABLE.name(self.name_id)
 
 class SymbolTable:
     """
     Gerencia escopos e os símbolos dentro deles.
-    Funciona como uma pilha de escopos, onde o escopo mais interno está no final da lista.
+
+    Símbolos são indexados pelo id do nome (ver `NameTable`). Cada nome tem sua
+    própria pilha de ligações (profundidade do escopo, símbolo), com a ligação
+    visível no topo, e cada escopo guarda um registro dos nomes que definiu.
+    Assim `lookup` e `define` custam O(1), e `pop_scope` desfaz apenas as
+    ligações do escopo removido, independentemente da profundidade do
+    aninhamento.
     """
     def __init__(self):
-        self.scope_stack: list[dict[str, Symbol]] = [{}] # Inicia com o escopo global
+        self._bindings: dict[int, list[tuple[int, Symbol]]] = {}
+        self._undo_log: list[list[int]] = [[]] # Inicia com o escopo global
+
+    @property
+    def depth(self) -> int:
+        """Profundidade do escopo atual (0 = escopo global)."""
+        return len(self._undo_log) - 1
 
     def push_scope(self):
         """Cria um novo escopo aninhado (ex: ao entrar em um bloco ou função)."""
-        self.scope_stack.append({})
+        self._undo_log.append([])
 
     def pop_scope(self):
         """Destrói o escopo mais interno (ex: ao sair de um bloco ou função)."""
-        if len(self.scope_stack) > 1:
-            self.scope_stack.pop()
+        if len(self._undo_log) > 1:
+            bindings = self._bindings
+            for name_id in self._undo_log.pop():
+                stack = bindings[name_id]
+                stack.pop()
+                if not stack:
+                    del bindings[name_id]
         else:
             # Isso não deveria acontecer em um programa bem formado
             raise Exception("Erro: Tentativa de remover o escopo global.")
@@ -32,17 +55,25 @@ class SymbolTable:
         Define um novo símbolo no escopo atual.
         Lança um erro se o símbolo já foi definido no mesmo escopo.
         """
-        current_scope = self.scope_stack[-1]
-        if symbol.name in current_scope:
+        depth = len(self._undo_log) - 1
+        stack = self._bindings.get(symbol.name_id)
+        if stack is None:
+            stack = self._bindings[symbol.name_id] = []
+        elif stack[-1][0] == depth:
             raise Exception(f"Erro Semântico: O símbolo '{symbol.name}' já foi declarado neste escopo.")
-        current_scope[symbol.name] = symbol
+        stack.append((depth, symbol))
+        self._undo_log[-1].append(symbol.name_id)
 
-    def lookup(self, name: str) -> Symbol | None:
+    def lookup(self, name_id: int) -> Symbol | None:
         """
-        Procura por um símbolo pelo nome, do escopo mais interno para o mais externo.
+        Procura por um símbolo pelo id do nome, do escopo mais interno para o mais externo.
         Retorna o objeto Symbol se encontrado, senão retorna None.
         """
-        for scope in reversed(self.scope_stack):
-            if name in scope:
-                return scope[name]
-        return None
\ No newline at end of file
+        stack = self._bindings.get(name_id)
+        if stack:
+            return stack[-1][1]
+        return None
+
+    def scope_size(self, level: int = -1) -> int:
+        """Número de símbolos definidos no escopo indicado (-1 = atual, -2 = o que o contém, ...)."""
+        return len(self._undo_log[level])
@@ -0,0 +1,39 @@
+"""
+Chamadas recursivas em posição de cauda.
+
+Como as funções da linguagem não retornam valor, uma chamada está em posição
+de cauda quando é um comando `f(args);` após o qual a função termina: o último
+comando do corpo, ou o último de um bloco ou ramo de `if` que esteja, ele
+mesmo, em posição de cauda (nunca dentro de um laço, que continuaria).
+
+`mark_tail_calls` anota as chamadas da função a si mesma nessas posições. O
+`CodeGenerator` as emite sem `JSR`: os argumentos sobrescrevem os parâmetros e
+a execução volta ao início do corpo, reaproveitando o quadro. Uma recursão
+profunda passa a usar espaço constante na pilha.
+"""
+
+from nodes import *
+
+
+def mark_tail_calls(node: NodeFunctionDecl) -> int:
+    """Anota (`tail_call`) as chamadas recursivas em posição de cauda da função; retorna quantas."""
+    if node.body is None or node.name.value == "main":
+        return 0
+    marked = 0
+    pending = [node.body]
+    while pending:
+        stmt = pending.pop()
+        stmt_type = type(stmt)
+        if stmt_type is NodeBlock:
+            if stmt.statements:
+                pending.append(stmt.statements[-1])
+        elif stmt_type is NodeIf:
+            pending.append(stmt.then_branch)
+            if stmt.else_branch is not None:
+                pending.append(stmt.else_branch)
+        elif stmt_type is NodeExprStmt and type(stmt.expression) is NodeFunctionCall:
+            call = stmt.expression
+            if call.callee.name_id == node.name.name_id and len(call.args) == len(node.params):
+                call.tail_call = True
+                marked += 1
+    return marked
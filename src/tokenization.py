@@ -1,3 +1,6 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
 from dataclasses import dataclass
 from typing import Optional
@@ -112,10 +115,62 @@ RESERVED_KEYWORDS = {
 }
 
 
-@dataclass
+class NameTable:
+    """
+    Interna identificadores: cada nome distinto recebe um id inteiro compacto
+    (0, 1, 2, ...). As fases seguintes indexam suas tabelas por esse id, e o
+    nome original só é recuperado para mensagens de erro e rótulos.
+    """
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+        self._names: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def intern(self, name: str) -> int:
+        name_id = self._ids.get(name)
+        if name_id is None:
+            name_id = self._ids[name] = len(self._names)
+            self._names.append(name)
+        return name_id
+
+    def name(self, name_id: int) -> str:
+        return self._names[name_id]
+
+    def names(self) -> list[str]:
+        """Todos os nomes, em ordem de id (internar a lista em uma tabela vazia reproduz os ids)."""
+        return list(self._names)
+
+
+# Tabela de nomes compartilhada por todo o pipeline
+NAME_TABLE = NameTable()
+
+
+@dataclass(slots=True)
 class Token:
     type: TokenType
     value: Optional[str] = None
+    name_id: Optional[int] = None # Id do identificador em NAME_TABLE (apenas VARIABLE)
+
+
+_TOKEN_POOL: dict[tuple[TokenType, Optional[str]], Token] = {}
+
+
+def make_token(type: TokenType, value: Optional[str] = None) -> Token:
+    """
+    Retorna o Token compartilhado para o par (tipo, valor). Tokens são tratados
+    como imutáveis, então todas as ocorrências de um mesmo operador, palavra
+    reservada, identificador ou literal apontam para o mesmo objeto, tanto na
+    lista de tokens quanto nos nós da AST que os referenciam. Identificadores
+    são internados em NAME_TABLE na primeira ocorrência.
+    """
+    key = (type, value)
+    token = _TOKEN_POOL.get(key)
+    if token is None:
+        name_id = NAME_TABLE.intern(value) if type is TokenType.VARIABLE else None
+        token = _TOKEN_POOL[key] = Token(type, value, name_id)
+    return token
 
 class Tokenizer:
     def __init__(self, content: str):
@@ -133,10 +188,10 @@ class Tokenizer:
                     self.buffer.append(aux.consume())
                 buf = aux.create_buffer(self.buffer)
                 if buf.lower() in RESERVED_KEYWORDS:
-                    tokens.append(Token(RESERVED_KEYWORDS[buf.lower()]))
+                    tokens.append(make_token(RESERVED_KEYWORDS[buf.lower()]))
                     continue
                 else:
-                    tokens.append(Token(TokenType.VARIABLE, buf.lower()))
+                    tokens.append(make_token(TokenType.VARIABLE, buf.lower()))
                     continue
 
             elif aux.peak().isdigit():
@@ -149,11 +204,11 @@ class Tokenizer:
                         self.buffer.append(aux.consume())
                     self.buffer.append("0")  
                     buf = aux.create_buffer(self.buffer)
-                    tokens.append(Token(TokenType.FLOAT_LIT, buf))
+                    tokens.append(make_token(TokenType.FLOAT_LIT, buf))
                     continue
                 else:
                     buf = aux.create_buffer(self.buffer)
-                    tokens.append(Token(TokenType.INT_LIT, buf))
+                    tokens.append(make_token(TokenType.INT_LIT, buf))
                     continue
             
             elif aux.peak() == '"':
@@ -168,7 +223,7 @@ class Tokenizer:
                 aux.consume() # Consome a aspa de fechamento "
                 
                 buf = aux.create_buffer(self.buffer)
-                tokens.append(Token(TokenType.STRING_LIT, buf))
+                tokens.append(make_token(TokenType.STRING_LIT, buf))
                 continue
                         
             elif aux.peak(1) in OPERATORS or (
@@ -180,11 +235,11 @@ class Tokenizer:
                 if second is not None and (first + second) in OPERATORS:
                     aux.consume()  
                     aux.consume()  
-                    tokens.append(Token(OPERATORS[first + second]))
+                    tokens.append(make_token(OPERATORS[first + second]))
                     continue
 
                 aux.consume()
-                tokens.append(Token(OPERATORS[first]))
+                tokens.append(make_token(OPERATORS[first]))
                 continue
 
             elif aux.peak().isspace():
@@ -200,4 +255,76 @@ class Tokenizer:
         aux.index = 0  # Reset index after tokenization
         return tokens
 
-    
\ No newline at end of file
+
+# --- Tokenização paralela ---
+
+TOKEN_TYPES = list(TokenType)
+_TOKEN_TYPE_INDEX = {t: i for i, t in enumerate(TOKEN_TYPES)}
+
+# Trechos em que uma quebra de linha não é um ponto de corte seguro:
+# literais string (que podem conter '\n') e comentários '$' até o fim da linha.
+_UNSAFE_SPAN = re.compile(r'"[^"]*"?|\$[^\n]*')
+
+PARALLEL_MIN_CHUNK = 1 << 20  # 1 MiB
+
+
+def split_at_safe_boundaries(content: str, num_chunks: int) -> list[int]:
+    """
+    Retorna as posições iniciais dos pedaços em que `content` pode ser dividido.
+    Cada corte fica logo após um '\n' que não está dentro de um literal string
+    nem de um comentário, de modo que nenhum token atravessa dois pedaços.
+    """
+    starts = [0]
+    length = len(content)
+    target_size = max(1, length // num_chunks)
+    scan_pos = 0  # Tudo antes desta posição já foi classificado
+    while len(starts) < num_chunks:
+        cut = content.find("\n", max(starts[-1] + target_size, scan_pos))
+        if cut == -1:
+            break
+        # Avança sobre strings/comentários até passar do candidato; se algum deles
+        # contém o '\n' candidato, procura a próxima quebra de linha depois dele.
+        for m in _UNSAFE_SPAN.finditer(content, scan_pos):
+            if m.start() > cut:
+                break
+            scan_pos = m.end()
+            if scan_pos > cut:
+                cut = content.find("\n", scan_pos)
+                if cut == -1:
+                    break
+        if cut == -1 or cut + 1 >= length:
+            break
+        scan_pos = cut + 1
+        starts.append(cut + 1)
+    return starts
+
+
+def _tokenize_chunk(chunk: str) -> tuple[bytes, list]:
+    """Executado nos processos de trabalho: retorna os tokens de forma compacta."""
+    tokens = Tokenizer(chunk).tokenizer()
+    kinds = bytes(_TOKEN_TYPE_INDEX[tok.type] for tok in tokens)
+    return kinds, [tok.value for tok in tokens]
+
+
+def tokenize_parallel(content: str, workers: Optional[int] = None,
+                      min_chunk_size: int = PARALLEL_MIN_CHUNK) -> list[Token]:
+    """
+    Tokeniza `content` dividindo-o em pedaços em fronteiras seguras e processando
+    os pedaços em um pool de processos. O resultado é idêntico ao de
+    `Tokenizer(content).tokenizer()`. Entradas pequenas (ou workers=1) são
+    tokenizadas serialmente, sem o custo de criar processos.
+    """
+    workers = workers or os.cpu_count() or 1
+    num_chunks = min(workers, len(content) // min_chunk_size)
+    if num_chunks <= 1:
+        return Tokenizer(content).tokenizer()
+
+    starts = split_at_safe_boundaries(content, num_chunks)
+    ends = starts[1:] + [len(content)]
+    chunks = [content[s:e] for s, e in zip(starts, ends)]
+
+    tokens = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        for kinds, values in pool.map(_tokenize_chunk, chunks):
+            tokens.extend(map(make_token, map(TOKEN_TYPES.__getitem__, kinds), values))
+    return tokens
@@ -0,0 +1,140 @@
+from dataclasses import fields
+from inspect import isgeneratorfunction
+from typing import Optional
+
+from nodes import Node, NodeBlock
+from tokenization import Token
+
+_TOKEN_ANNOTATIONS = (Token, Optional[Token])
+_child_fields_cache: dict[type, tuple[str, ...]] = {}
+
+
+def child_fields(node_class: type) -> tuple[str, ...]:
+    """
+    Retorna os nomes dos campos de `node_class` que podem conter nós filhos
+    (nós ou listas de nós), isto é, todos os campos que não são Tokens nem
+    anotações da análise semântica. O resultado é calculado uma vez por classe.
+    """
+    names = _child_fields_cache.get(node_class)
+    if names is None:
+        names = tuple(
+            f.name for f in fields(node_class)
+            if f.type not in _TOKEN_ANNOTATIONS and not f.metadata.get("annotation")
+        )
+        _child_fields_cache[node_class] = names
+    return names
+
+
+def walk(root: Node):
+    """Todos os nós da subárvore de `root` (inclusive), em pré-ordem, sem recursão."""
+    pending = [root]
+    while pending:
+        node = pending.pop()
+        yield node
+        for name in child_fields(type(node)):
+            value = getattr(node, name)
+            if isinstance(value, list):
+                pending.extend(item for item in value if isinstance(item, Node))
+            elif isinstance(value, Node):
+                pending.append(value)
+
+
+def replace_statements(root: Node, replace):
+    """
+    Substitui cada comando sob `root` (itens de blocos, ramos de `if` e corpos
+    de laços) por `replace(comando)`. Como `walk` só visita os filhos de um nó
+    depois de devolvê-lo, os comandos dentro das substituições também são
+    oferecidos a `replace`.
+    """
+    for owner in walk(root):
+        if type(owner) is NodeBlock:
+            statements = owner.statements
+            for i, stmt in enumerate(statements):
+                statements[i] = replace(stmt)
+        else:
+            for name in ("then_branch", "else_branch", "body"):
+                stmt = getattr(owner, name, None)
+                if isinstance(stmt, Node):
+                    setattr(owner, name, replace(stmt))
+
+
+class NodeVisitor:
+    """
+    Base para as passagens sobre a AST.
+
+    Um nó da classe `NodeX` é despachado para o método `_visit_NodeX` da
+    subclasse, ou para `_generic_visit` se ele não existir. A tabela de despacho
+    é construída sob demanda, uma vez por (subclasse, classe de nó), e indexada
+    por `type(node)`, sem montar nomes de métodos a cada visita. Argumentos extras
+    de `_visit` são repassados ao método de visita.
+
+    Métodos de visita podem ser funções comuns ou geradores. Um método gerador
+    não chama `_visit` recursivamente: ele faz `resultado = yield filho` para
+    pedir a visita de um filho, e o código antes e depois de cada `yield` faz o
+    papel das ações de entrada e de saída. Esses métodos são executados sobre uma
+    pilha explícita de geradores (ver `_run`), de modo que a profundidade da AST
+    não é limitada pelo limite de recursão do Python.
+    """
+
+    _dispatch: dict[type, tuple] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = {}
+
+    def _visit(self, node, *args):
+        entry = self._dispatch.get(type(node))
+        if entry is None:
+            entry = self._resolve(type(node))
+        method, is_generator = entry
+        if is_generator:
+            return self._run(method(self, node, *args))
+        return method(self, node, *args)
+
+    def _run(self, root):
+        """Executa um método de visita gerador e todos os que ele pedir, sem recursão."""
+        dispatch = self._dispatch
+        stack = []  # Geradores suspensos (o do topo fica em `send`)
+        send = root.send
+        value = None
+        while True:
+            try:
+                child = send(value)
+            except StopIteration as stop:
+                value = stop.value
+                if not stack:
+                    return value
+                send = stack.pop()
+                continue
+            entry = dispatch.get(type(child))
+            if entry is None:
+                entry = self._resolve(type(child))
+            method, is_generator = entry
+            if is_generator:
+                stack.append(send)
+                send = method(self, child).send
+                value = None
+            else:
+                value = method(self, child)
+
+    @classmethod
+    def _resolve(cls, node_class: type):
+        if issubclass(node_class, Node):
+            method = getattr(cls, f"_visit_{node_class.__name__}", None) or cls._generic_visit
+        else:
+            method = cls._visit_non_node
+        entry = cls._dispatch[node_class] = (method, isgeneratorfunction(method))
+        return entry
+
+    def _visit_non_node(self, node, *args):
+        return None
+
+    def _generic_visit(self, node: Node, *args):
+        for name in child_fields(type(node)):
+            value = getattr(node, name)
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, Node):
+                        yield item
+            elif isinstance(value, Node):
+                yield value
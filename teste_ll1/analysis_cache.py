@@ -0,0 +1,102 @@
+"""
+Cache em disco da análise LL(1), indexado pelo fingerprint da gramática.
+
+Cada entrada é um arquivo `<fingerprint>.ll1` no diretório de cache, contendo um
+cabeçalho fixo seguido das tabelas de `LL1Analysis.to_state()` serializadas com
+`marshal` (formato binário compacto e rápido de carregar). Entradas de outra
+versão do formato ou corrompidas são removidas ao serem lidas, e apenas as
+`MAX_ENTRIES` entradas usadas mais recentemente são mantidas.
+"""
+
+import marshal
+import os
+
+from is_ll1 import LL1Analysis
+
+MAGIC = b"LL1C"
+FORMAT_VERSION = 1
+HEADER = MAGIC + bytes([FORMAT_VERSION])
+EXTENSION = ".ll1"
+MAX_ENTRIES = 16
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "LL1_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".ll1_cache"),
+)
+
+
+def _entry_path(cache_dir, fingerprint):
+    return os.path.join(cache_dir, fingerprint + EXTENSION)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def load(G, cache_dir=DEFAULT_CACHE_DIR):
+    """Retorna a análise de G lida do cache, ou None se não houver entrada válida."""
+    path = _entry_path(cache_dir, G.fingerprint())
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if not data.startswith(HEADER):
+        _remove(path)
+        return None
+    try:
+        state = marshal.loads(data[len(HEADER):])
+        analysis = LL1Analysis.from_state(G, state)
+    except (EOFError, ValueError, TypeError):
+        _remove(path)
+        return None
+    try:
+        os.utime(path)  # Marca a entrada como usada recentemente
+    except OSError:
+        pass  # Entrada somente leitura: a análise lida continua válida
+    return analysis
+
+
+def store(G, analysis, cache_dir=DEFAULT_CACHE_DIR):
+    """Grava a análise de G no cache e remove as entradas menos usadas."""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _entry_path(cache_dir, G.fingerprint())
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER)
+        f.write(marshal.dumps(analysis.to_state()))
+    os.replace(tmp_path, path)
+    evict(cache_dir)
+
+
+def evict(cache_dir=DEFAULT_CACHE_DIR, max_entries=MAX_ENTRIES):
+    """Mantém apenas as `max_entries` entradas usadas mais recentemente."""
+    try:
+        names = [n for n in os.listdir(cache_dir) if n.endswith(EXTENSION)]
+    except OSError:
+        return
+    paths = [os.path.join(cache_dir, n) for n in names]
+    paths.sort(key=lambda p: os.path.getmtime(p), reverse=True)
+    for path in paths[max_entries:]:
+        _remove(path)
+
+
+def cached_analysis(G, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Retorna a análise LL(1) de G, usando (nesta ordem) o cache em memória da
+    gramática, o cache em disco, ou calculando-a e gravando-a no disco.
+    """
+    if G._analysis is not None:
+        return G._analysis
+    analysis = load(G, cache_dir)
+    if analysis is None:
+        analysis = LL1Analysis(G)
+        try:
+            store(G, analysis, cache_dir)
+        except OSError:
+            pass  # Cache indisponível (ex: diretório somente leitura): segue sem ele
+    G._analysis = analysis
+    return analysis
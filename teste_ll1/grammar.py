@@ -1,3 +1,4 @@
+import hashlib
 from collections import defaultdict
 
 class Grammar:
@@ -8,9 +9,13 @@ class Grammar:
         self._occurrences = defaultdict(list)
         self.symbolDerivesEmpty = {}
         self.ruleDerivesEmpty = {}
+        self._analysis = None  # Cache da análise LL(1) (ver is_ll1.analyze)
+        self._fingerprint = None
 
     def add_production(self, lhs, rhs):
         """Adiciona uma produção A → α, onde α é uma lista de símbolos."""
+        self._analysis = None
+        self._fingerprint = None
         p_index = len(self._productions)
         self._productions.append((lhs, rhs))
         self._productions_by_lhs[lhs].append(p_index)
@@ -41,3 +46,21 @@ class Grammar:
     def tail(self, p, i):
         """Retorna α[i+1:] da produção A → α."""
         return self.rhs(p)[i + 1:]
+
+    def fingerprint(self):
+        """
+        Retorna um hash estável (hex SHA-256) do símbolo inicial e das produções,
+        na ordem em que foram adicionadas. Duas gramáticas com o mesmo fingerprint
+        têm exatamente a mesma análise LL(1).
+        """
+        if self._fingerprint is None:
+            h = hashlib.sha256()
+            h.update(self.start_symbol.encode("utf-8"))
+            for lhs, rhs in self._productions:
+                h.update(b"\x1e")
+                h.update(lhs.encode("utf-8"))
+                for sym in rhs:
+                    h.update(b"\x1f")
+                    h.update(sym.encode("utf-8"))
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
@@ -1,11 +1,12 @@
+from collections import deque
+
+
 def derives_empty_string(G):
     """
     Computa G.symbolDerivesEmpty[A] e G.ruleDerivesEmpty[p] para cada não-terminal A
     e cada produção p de G, marcando quais não-terminais e quais regras derivam ε.
     Baseado em Algorithm 3 e 4 em gramaticas.pdf. :contentReference[oaicite:0]{index=0}
     """
-    from collections import deque
-
     # Inicializa
     for A in G.nonterminals():
         G.symbolDerivesEmpty[A] = False
@@ -35,27 +36,184 @@ def derives_empty_string(G):
                     Q.append(A)
 
 
-def first(alpha, G, _visited=None):
+class LL1Analysis:
+    """
+    Resultado da análise LL(1) de uma gramática: conjuntos First, Follow e
+    Predict de todos os símbolos e produções, calculados uma única vez.
+
+    Os conjuntos são representados como bitsets em inteiros do Python, onde o
+    bit i corresponde ao terminal `terminals[i]`. First e Follow são obtidos
+    por iteração de ponto fixo com lista de trabalho: um não-terminal só é
+    reprocessado quando o conjunto de um símbolo do qual ele depende cresce.
+    """
+
+    def __init__(self, G):
+        derives_empty_string(G)
+        self.nonterminals = G.nonterminals()
+        nt_set = set(self.nonterminals)
+        self.terminals = sorted({sym for p in G.productions() for sym in G.rhs(p) if sym not in nt_set})
+        self.terminal_bit = {t: 1 << i for i, t in enumerate(self.terminals)}
+        self.nullable = {A: G.symbolDerivesEmpty[A] for A in self.nonterminals}
+        self.rule_nullable = [G.ruleDerivesEmpty[p] for p in G.productions()]
+        self.first_bits = self._compute_first(G)
+        self.follow_bits = self._compute_follow(G)
+        self.predict_bits = [self._compute_predict(G, p) for p in G.productions()]
+
+    def to_state(self):
+        """Retorna as tabelas da análise como tuplas de tipos primitivos (serializáveis)."""
+        return (
+            tuple(self.terminals),
+            tuple(self.nonterminals),
+            tuple(self.nullable[A] for A in self.nonterminals),
+            tuple(self.rule_nullable),
+            tuple(self.first_bits[A] for A in self.nonterminals),
+            tuple(self.follow_bits[A] for A in self.nonterminals),
+            tuple(self.predict_bits),
+        )
+
+    @classmethod
+    def from_state(cls, G, state):
+        """Reconstrói a análise de G a partir de `to_state()`, sem recalcular nada."""
+        terminals, nonterminals, nullable, rule_nullable, first, follow, predict_bits = state
+        self = cls.__new__(cls)
+        self.nonterminals = list(nonterminals)
+        self.terminals = list(terminals)
+        self.terminal_bit = {t: 1 << i for i, t in enumerate(self.terminals)}
+        self.nullable = dict(zip(nonterminals, nullable))
+        self.rule_nullable = list(rule_nullable)
+        self.first_bits = dict(zip(nonterminals, first))
+        self.follow_bits = dict(zip(nonterminals, follow))
+        self.predict_bits = list(predict_bits)
+        G.symbolDerivesEmpty.update(self.nullable)
+        G.ruleDerivesEmpty.update(enumerate(self.rule_nullable))
+        return self
+
+    def _compute_first(self, G):
+        first = {A: 0 for A in self.nonterminals}
+        # dependents[X] = não-terminais A com produção A → α X β, onde α ⇒* ε
+        dependents = {A: set() for A in self.nonterminals}
+        for p in G.productions():
+            A = G.lhs(p)
+            for X in G.rhs(p):
+                if X in first:
+                    dependents[X].add(A)
+                    if self.nullable[X]:
+                        continue
+                else:
+                    first[A] |= self.terminal_bit[X]
+                break
+
+        work = deque(A for A in self.nonterminals if first[A])
+        queued = set(work)
+        while work:
+            X = work.popleft()
+            queued.discard(X)
+            bits = first[X]
+            for A in dependents[X]:
+                if bits & ~first[A]:
+                    first[A] |= bits
+                    if A not in queued:
+                        queued.add(A)
+                        work.append(A)
+        return first
+
+    def _first_of_sequence(self, alpha):
+        """Retorna (bits de First(α), α ⇒* ε)."""
+        bits = 0
+        for X in alpha:
+            if X in self.first_bits:
+                bits |= self.first_bits[X]
+                if not self.nullable[X]:
+                    return bits, False
+            else:
+                return bits | self.terminal_bit.get(X, 0), False
+        return bits, True
+
+    def _compute_follow(self, G):
+        follow = {A: 0 for A in self.nonterminals}
+        # propagates[A] = não-terminais B com produção A → α B β, onde β ⇒* ε
+        propagates = {A: set() for A in self.nonterminals}
+        for p in G.productions():
+            A = G.lhs(p)
+            rhs = G.rhs(p)
+            for i, B in enumerate(rhs):
+                if B not in follow:
+                    continue
+                bits, tail_nullable = self._first_of_sequence(rhs[i + 1:])
+                follow[B] |= bits
+                if tail_nullable and A != B:
+                    propagates[A].add(B)
+
+        work = deque(A for A in self.nonterminals if follow[A])
+        queued = set(work)
+        while work:
+            A = work.popleft()
+            queued.discard(A)
+            bits = follow[A]
+            for B in propagates[A]:
+                if bits & ~follow[B]:
+                    follow[B] |= bits
+                    if B not in queued:
+                        queued.add(B)
+                        work.append(B)
+        return follow
+
+    def _compute_predict(self, G, p):
+        bits, _ = self._first_of_sequence(G.rhs(p))
+        if self.rule_nullable[p]:
+            bits |= self.follow_bits[G.lhs(p)]
+        return bits
+
+    def to_set(self, bits):
+        """Converte um bitset de terminais em um conjunto de nomes."""
+        result = set()
+        i = 0
+        while bits:
+            if bits & 1:
+                result.add(self.terminals[i])
+            bits >>= 1
+            i += 1
+        return result
+
+    def conflicts(self, G):
+        """
+        Retorna a lista de conflitos LL(1) como tuplas (A, q, p, interseção),
+        onde q e p são produções de A com conjuntos predict não disjuntos.
+        """
+        result = []
+        for A in self.nonterminals:
+            seen = []
+            for p in G.productions_for(A):
+                pbits = self.predict_bits[p]
+                for q in seen:
+                    inter = pbits & self.predict_bits[q]
+                    if inter:
+                        result.append((A, q, p, self.to_set(inter)))
+                seen.append(p)
+        return result
+
+
+def analyze(G):
+    """Retorna a análise LL(1) de G, calculando-a apenas na primeira chamada."""
+    if G._analysis is None:
+        G._analysis = LL1Analysis(G)
+    return G._analysis
+
+
+def first(alpha, G):
     """
     Retorna o conjunto First(α), onde α é uma lista de símbolos.
-    Baseado em Algorithm 5 e 6 em gramaticas.pdf. 
+    Baseado em Algorithm 5 e 6 em gramaticas.pdf.
     """
-    if _visited is None:
-        _visited = {A: False for A in G.nonterminals()}
-    if not alpha:
-        return set()
-    X, *beta = alpha
-    if G.is_terminal(X):
-        return {X}
-    ans = set()
-    if not _visited[X]:
-        _visited[X] = True
-        for p in G.productions_for(X):
-            rhs = list(G.rhs(p))
-            ans |= first(rhs, G, _visited)
-        if G.symbolDerivesEmpty.get(X, False):
-            ans |= first(beta, G, _visited)
-    return ans
+    analysis = analyze(G)
+    bits = 0
+    for X in alpha:
+        if G.is_terminal(X):
+            return analysis.to_set(bits) | {X}
+        bits |= analysis.first_bits[X]
+        if not analysis.nullable[X]:
+            break
+    return analysis.to_set(bits)
 
 
 def all_derive_empty(gamma, G):
@@ -69,23 +227,13 @@ def all_derive_empty(gamma, G):
     return True
 
 
-def follow(A, G, _visited=None):
+def follow(A, G):
     """
     Retorna o conjunto Follow(A).
-    Baseado em Algorithm 7 e 8 em gramaticas.pdf. 
+    Baseado em Algorithm 7 e 8 em gramaticas.pdf.
     """
-    if _visited is None:
-        _visited = {B: False for B in G.nonterminals()}
-    ans = set()
-    if not _visited[A]:
-        _visited[A] = True
-        for (p, i) in G.occurrences(A):
-            tail = list(G.tail(p, i))
-            ans |= first(tail, G)
-            if all_derive_empty(tail, G):
-                lhs = G.lhs(p)
-                ans |= follow(lhs, G, _visited)
-    return ans
+    analysis = analyze(G)
+    return analysis.to_set(analysis.follow_bits[A])
 
 
 def predict(p, G):
@@ -93,11 +241,8 @@ def predict(p, G):
     Retorna o conjunto predict(p) para a produção p.
     Baseado em Algorithm 1 em analise-top-down.pdf. :contentReference[oaicite:2]{index=2}
     """
-    rhs = list(G.rhs(p))
-    ans = first(rhs, G)
-    if G.ruleDerivesEmpty.get(p, False):
-        ans |= follow(G.lhs(p), G)
-    return ans
+    analysis = analyze(G)
+    return analysis.to_set(analysis.predict_bits[p])
 
 
 def is_ll1(G):
@@ -106,34 +251,24 @@ def is_ll1(G):
     os conjuntos predict(p) de suas produções p são mutuamente disjuntos.
     Baseado em Algorithm 2 em analise-top-down.pdf. :contentReference[oaicite:3]{index=3}
     """
-    # Passo 1: computar derivação de string vazia
-    derives_empty_string(G)
-
-    # Passo 2: para cada A, verificar disjunção de predict
-    for A in G.nonterminals():
-        seen = set()
+    analysis = analyze(G)
+    for A in analysis.nonterminals:
+        seen = 0
         for p in G.productions_for(A):
-            pset = predict(p, G)
-            if seen & pset:
+            pbits = analysis.predict_bits[p]
+            if seen & pbits:
                 return False
-            seen |= pset
+            seen |= pbits
     return True
 
 def is_ll1_verbose(G):
-    derives_empty_string(G)
+    analysis = analyze(G)
     result = True
 
-    for A in G.nonterminals():
-        seen = []
-        for p in G.productions_for(A):
-            pset = predict(p, G)
-            for (qset, qidx) in seen:
-                inter = pset & qset
-                if inter:
-                    print(f"\n❌ Conflito em '{A}':")
-                    print(f"  Produção {qidx}: {list(G.rhs(qidx))} ⇒ predict = {qset}")
-                    print(f"  Produção {p}: {list(G.rhs(p))} ⇒ predict = {pset}")
-                    print(f"  ⚠️ Interseção: {inter}")
-                    result = False
-            seen.append((pset, p))
+    for (A, q, p, inter) in analysis.conflicts(G):
+        print(f"\n❌ Conflito em '{A}':")
+        print(f"  Produção {q}: {list(G.rhs(q))} ⇒ predict = {analysis.to_set(analysis.predict_bits[q])}")
+        print(f"  Produção {p}: {list(G.rhs(p))} ⇒ predict = {analysis.to_set(analysis.predict_bits[p])}")
+        print(f"  ⚠️ Interseção: {inter}")
+        result = False
     return result
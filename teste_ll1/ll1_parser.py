@@ -0,0 +1,387 @@
+"""
+Gerador de parser LL(1) dirigido por tabela a partir de uma `Grammar`.
+
+A tabela de predição é construída com os conjuntos predict de `is_ll1.py`
+(lidos do cache em disco de `analysis_cache.py` quando a gramática não mudou) e
+armazenada de forma compacta em vetores de inteiros usando deslocamento de
+linhas (row displacement). O parser resultante não é recursivo: usa uma pilha
+explícita de símbolos e uma pilha de valores, de modo que a profundidade de
+aninhamento do programa é limitada apenas pela memória.
+"""
+
+import os
+import sys
+from array import array
+
+from grammar import Grammar
+from analysis_cache import cached_analysis
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from nodes import *  # noqa: E402
+from tokenization import Token, TokenType  # noqa: E402
+
+END_MARKER = "eof"
+AUGMENTED_START = "__start__"
+
+# Terminais da gramática cujo nome difere do valor do TokenType correspondente.
+TERMINAL_ALIASES = {"id": TokenType.VARIABLE}
+
+
+def terminal_token_type(name):
+    """Converte o nome de um terminal da gramática no TokenType do lexer."""
+    if name in TERMINAL_ALIASES:
+        return TERMINAL_ALIASES[name]
+    return TokenType(name)
+
+
+def augment(G):
+    """Retorna uma cópia de G com a produção __start__ → <início> eof."""
+    A = Grammar(AUGMENTED_START)
+    A.add_production(AUGMENTED_START, [G.start_symbol, END_MARKER])
+    for p in G.productions():
+        A.add_production(G.lhs(p), list(G.rhs(p)))
+    return A
+
+
+class ParseTable:
+    """
+    Tabela LL(1) comprimida.
+
+    Os símbolos são numerados como inteiros: terminais em [0, T) e
+    não-terminais em [T, T + N). A entrada (A, t) da tabela fica em
+    `action[base[A] + t]` quando `check[base[A] + t] == A`; caso contrário a
+    entrada é vazia (erro de sintaxe).
+    """
+
+    def __init__(self, terminals, nonterminals, base, check, action,
+                 prod_lhs, rhs_start, rhs_len, rhs_symbols, start):
+        self.terminals = terminals
+        self.nonterminals = nonterminals
+        self.base = base
+        self.check = check
+        self.action = action
+        self.prod_lhs = prod_lhs
+        self.rhs_start = rhs_start
+        self.rhs_len = rhs_len
+        self.rhs_symbols = rhs_symbols
+        self.start = start
+        self.num_terminals = len(terminals)
+        self.token_index = {terminal_token_type(t): i for i, t in enumerate(terminals) if t != END_MARKER}
+        self.end_index = terminals.index(END_MARKER)
+
+    def lookup(self, nonterminal, terminal):
+        """Retorna o índice da produção para (A, t) ou -1 se a entrada for vazia."""
+        i = self.base[nonterminal] + terminal
+        if 0 <= i < len(self.check) and self.check[i] == nonterminal:
+            return self.action[i]
+        return -1
+
+    def symbol_name(self, symbol):
+        if symbol < self.num_terminals:
+            return self.terminals[symbol]
+        return self.nonterminals[symbol - self.num_terminals]
+
+    def expected_terminals(self, nonterminal):
+        return [t for t in range(self.num_terminals) if self.lookup(nonterminal, t) >= 0]
+
+    def size_in_bytes(self):
+        arrays = (self.base, self.check, self.action, self.prod_lhs,
+                  self.rhs_start, self.rhs_len, self.rhs_symbols)
+        return sum(a.itemsize * len(a) for a in arrays)
+
+
+def build_parse_table(G):
+    """
+    Constrói a tabela LL(1) comprimida para a gramática G.
+    Lança ValueError se G não for LL(1).
+    """
+    A = augment(G)
+    analysis = cached_analysis(A)
+
+    nonterminals = analysis.nonterminals
+    terminals = analysis.terminals
+    t_index = {t: i for i, t in enumerate(terminals)}
+    T = len(terminals)
+    nt_index = {n: T + i for i, n in enumerate(nonterminals)}
+
+    def encode(sym):
+        return t_index[sym] if sym in t_index else nt_index[sym]
+
+    # Linhas esparsas: para cada não-terminal, {terminal: produção}
+    conflicts = analysis.conflicts(A)
+    if conflicts:
+        lhs, _, _, inter = conflicts[0]
+        raise ValueError(f"Gramática não é LL(1): conflito em '{lhs}' com os terminais {sorted(inter)}.")
+    rows = {}
+    for lhs in nonterminals:
+        row = {}
+        for p in A.productions_for(lhs):
+            bits = analysis.predict_bits[p]
+            ti = 0
+            while bits:
+                if bits & 1:
+                    row[ti] = p
+                bits >>= 1
+                ti += 1
+        rows[nt_index[lhs]] = row
+
+    # Deslocamento de linhas: as linhas mais densas são posicionadas primeiro.
+    base = array("i", [0] * (T + len(nonterminals)))
+    check = array("i")
+    action = array("i")
+    for nt in sorted(rows, key=lambda n: -len(rows[n])):
+        cols = rows[nt]
+        if not cols:
+            base[nt] = -T
+            continue
+        offset = -min(cols)
+        while True:
+            if all(offset + c >= len(check) or check[offset + c] == -1 for c in cols):
+                break
+            offset += 1
+        needed = offset + max(cols) + 1
+        if needed > len(check):
+            check.extend([-1] * (needed - len(check)))
+            action.extend([-1] * (needed - len(action)))
+        for c, p in cols.items():
+            check[offset + c] = nt
+            action[offset + c] = p
+        base[nt] = offset
+
+    prod_lhs = array("i")
+    rhs_start = array("i")
+    rhs_len = array("i")
+    rhs_symbols = array("i")
+    for p in A.productions():
+        rhs = A.rhs(p)
+        prod_lhs.append(nt_index[A.lhs(p)])
+        rhs_start.append(len(rhs_symbols))
+        rhs_len.append(len(rhs))
+        rhs_symbols.extend(encode(sym) for sym in rhs)
+
+    return ParseTable(terminals, nonterminals, base, check, action,
+                      prod_lhs, rhs_start, rhs_len, rhs_symbols, nt_index[AUGMENTED_START])
+
+
+# --- Ações semânticas (construção da AST de nodes.py) ---
+#
+# Listas e caudas de operadores são recursivas à direita na gramática, então a
+# cauda mais interna é reduzida primeiro. Para manter a construção em O(n),
+# essas listas são acumuladas em ordem invertida e desinvertidas por quem as
+# consome.
+
+def _fold_left(first, tail_rev):
+    left = first
+    for op, right in reversed(tail_rev):
+        left = NodeBinOp(left=left, op=op, right=right)
+    return left
+
+
+def _push_front(item, rest_rev):
+    rest_rev.append(item)
+    return rest_rev
+
+
+def _id_started(identifier, tail):
+    if tail[0] == "call":
+        return NodeFunctionCall(callee=identifier, args=tail[1][::-1])
+    _, index_expr, op, value = tail
+    return NodeAssignment(identifier=identifier, value=value, op=op, array_index_expr=index_expr)
+
+
+def _var_decl(v):
+    var_type, identifier, tail = v[0], v[1], v[2]
+    array_size = tail[1] if tail and tail[0] == "array" else None
+    initializer = tail[1] if tail and tail[0] == "init" else None
+    return NodeDeclaration(var_type=var_type, identifier=identifier,
+                           array_size=array_size, initializer_expr=initializer)
+
+
+def _primary(v):
+    identifier, tail = v[0], v[1]
+    if tail is None:
+        return NodeVariable(identifier)
+    if tail[0] == "call":
+        return NodeFunctionCall(callee=identifier, args=tail[1][::-1])
+    return NodeArrayAccess(identifier=identifier, index_expr=tail[1])
+
+
+_LITERAL_NODES = {
+    "int_lit": NodeIntLiteral,
+    "float_lit": NodeFloatLiteral,
+    "string_lit": NodeStringLiteral,
+    "true": NodeBoolLiteral,
+    "false": NodeBoolLiteral,
+}
+
+_SIMPLE_STATEMENTS = {
+    "exit": NodeExit,
+    "break": NodeBreak,
+    "continue": NodeContinue,
+}
+
+_REVERSED_LISTS = {"decl_list", "stmt_list", "param_list", "param_list_tail",
+                   "expr_list", "expr_list_tail", "arg_list", "arg_list_tail"}
+
+_OPERATOR_TAILS = {"logic_or_tail", "logic_and_tail", "equality_tail",
+                   "comparison_tail", "term_tail", "factor_tail"}
+
+_FOLDED = {"logic_or", "logic_and", "equality", "comparison", "term", "factor"}
+
+
+def _make_action(lhs, rhs):
+    """
+    Retorna a função que constrói o valor de `lhs → rhs` a partir dos valores do
+    rhs, ou None quando o valor do único símbolo do rhs é repassado sem alteração
+    (nesse caso nenhum marcador de redução é empilhado).
+    """
+    first = rhs[0] if rhs else None
+
+    if lhs == AUGMENTED_START:
+        return None
+    if lhs == "program":
+        return lambda v: NodeProgram(global_declarations=v[0][::-1])
+    if lhs in _REVERSED_LISTS:
+        if not rhs:
+            return lambda v: []
+        if first == "comma":
+            return lambda v: _push_front(v[1], v[2])
+        return lambda v: _push_front(v[0], v[1])
+    if lhs in _OPERATOR_TAILS:
+        if not rhs:
+            return lambda v: []
+        return lambda v: _push_front((v[0], v[1]), v[2])
+    if lhs in _FOLDED:
+        return lambda v: _fold_left(v[0], v[1])
+    if lhs == "var_decl":
+        return _var_decl
+    if lhs == "var_decl_tail":
+        if not rhs:
+            return lambda v: None
+        if first == "lbracket":
+            return lambda v: ("array", NodeIntLiteral(v[1]))
+        return lambda v: ("init", v[1])
+    if lhs == "func_decl":
+        return lambda v: NodeFunctionDecl(name=v[1], params=v[3][::-1], body=v[5])
+    if lhs == "param":
+        return lambda v: NodeParam(param_type=v[0], identifier=v[1])
+    if lhs == "if_stmt":
+        return lambda v: NodeIf(condition=v[2], then_branch=v[4], else_branch=v[5])
+    if lhs == "else_part":
+        return (lambda v: v[1]) if rhs else (lambda v: None)
+    if lhs == "while_stmt":
+        return lambda v: NodeWhile(condition=v[2], body=v[4])
+    if lhs == "for_stmt":
+        return lambda v: NodeFor(initializer=v[2], condition=v[4], increment=v[6], body=v[8])
+    if lhs == "do_while_stmt":
+        return lambda v: NodeDoWhile(body=v[1], condition=v[4])
+    if lhs == "other_stmt" and first == "id":
+        return lambda v: NodeExprStmt(expression=_id_started(v[0], v[1]))
+    if lhs in ("for_init", "for_incr"):
+        return (lambda v: _id_started(v[0], v[1])) if rhs else (lambda v: None)
+    if lhs == "id_started_stmt":
+        if first == "lparen":
+            return lambda v: ("call", v[1])
+        return lambda v: ("assign", v[0], v[1], v[2])
+    if lhs == "block":
+        return lambda v: NodeBlock(statements=v[1][::-1])
+    if lhs in ("assign_stmt_tail", "for_cond"):
+        if not rhs:
+            return lambda v: None
+        return (lambda v: v[1]) if first == "lbracket" else (lambda v: v[0])
+    if lhs == "print_stmt":
+        return lambda v: NodePrint(args=v[2][::-1])
+    if lhs == "read_stmt":
+        return lambda v: NodeRead(identifier=v[2])
+    if lhs in ("exit_stmt", "break_stmt", "continue_stmt"):
+        node_class = _SIMPLE_STATEMENTS[first]
+        return lambda v: node_class()
+    if lhs == "unary":
+        if first in ("not", "minus"):
+            return lambda v: NodeUnaryOp(op=v[0], operand=v[1])
+        return None
+    if lhs == "primary":
+        if first in _LITERAL_NODES:
+            node_class = _LITERAL_NODES[first]
+            return lambda v: node_class(v[0])
+        if first == "id":
+            return _primary
+        return lambda v: NodeGrouping(expression=v[1])
+    if lhs == "primary_tail":
+        if not rhs:
+            return lambda v: None
+        if first == "lparen":
+            return lambda v: ("call", v[1])
+        return lambda v: ("index", v[1])
+    if len(rhs) == 1:
+        # decl, stmt, other_stmt, assign_op, type, expression: repassa o valor
+        return None
+    raise ValueError(f"Sem ação semântica para a produção {lhs} → {rhs}.")
+
+
+class LL1Parser:
+    """
+    Parser LL(1) não recursivo guiado por uma `ParseTable`.
+
+    A pilha de análise contém símbolos (inteiros >= 0) e marcadores de redução
+    (inteiros negativos, -(p + 1) para a produção p). Ao expandir A → α, o
+    marcador de p é empilhado abaixo de α; quando ele volta ao topo, os valores
+    de α já estão na pilha de valores e a ação semântica de p os reduz a um único
+    valor. Produções de repasse (A → B) não empilham marcador algum.
+    """
+
+    def __init__(self, table: ParseTable, grammar: Grammar):
+        self.table = table
+        A = augment(grammar)
+        self.actions = [_make_action(A.lhs(p), list(A.rhs(p))) for p in A.productions()]
+
+    def parse(self, tokens: List[Token]) -> NodeProgram:
+        table = self.table
+        T = table.num_terminals
+        base, check, action = table.base, table.check, table.action
+        rhs_start, rhs_len, rhs_symbols = table.rhs_start, table.rhs_len, table.rhs_symbols
+        actions = self.actions
+        token_index = table.token_index
+        end = table.end_index
+        check_len = len(check)
+
+        try:
+            kinds = [token_index[tok.type] for tok in tokens]
+        except KeyError as e:
+            raise SyntaxError(f"Erro de sintaxe: token '{e.args[0].name}' não pertence à gramática.")
+        kinds.append(end)
+        eof_token = Token(type=TokenType.EOF)
+
+        stack = [table.start]
+        values = []
+        pos = 0
+        while stack:
+            top = stack.pop()
+            if top < 0:
+                p = -top - 1
+                n = rhs_len[p]
+                if n:
+                    args = values[-n:]
+                    del values[-n:]
+                else:
+                    args = ()
+                values.append(actions[p](args))
+            elif top < T:
+                if kinds[pos] != top:
+                    found = table.terminals[kinds[pos]]
+                    raise SyntaxError(f"Erro de sintaxe: Esperado '{table.terminals[top]}', mas encontrou '{found}'.")
+                values.append(tokens[pos] if pos < len(tokens) else eof_token)
+                pos += 1
+            else:
+                i = base[top] + kinds[pos]
+                if i >= check_len or i < 0 or check[i] != top:
+                    expected = ", ".join(table.terminals[t] for t in table.expected_terminals(top))
+                    found = table.terminals[kinds[pos]]
+                    raise SyntaxError(f"Erro de sintaxe em '{table.symbol_name(top)}': esperado um de [{expected}], mas encontrou '{found}'.")
+                p = action[i]
+                if actions[p] is not None:
+                    stack.append(-p - 1)
+                start = rhs_start[p]
+                stack.extend(reversed(rhs_symbols[start:start + rhs_len[p]]))
+        return values[0]
@@ -1,7 +1,9 @@
+from analysis_cache import cached_analysis
 from builder import construir_gramatica_cfg
 from is_ll1 import is_ll1_verbose
 
 G = construir_gramatica_cfg()
+cached_analysis(G)  # Carrega a análise do disco se a gramática não mudou
 resultado = is_ll1_verbose(G)
 if resultado:
     print("\n✅ A gramática É LL(1)")